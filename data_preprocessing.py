@@ -1,21 +1,222 @@
 # data_preprocessing.py
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
 import pandas as pd
 
-def load_data(filepath='dummy_data.csv'):
-    try:
-        df = pd.read_csv(filepath)
-    except FileNotFoundError:
-        print(f"Criando {filepath} para teste...")
-        df = pd.DataFrame({
-            'feature1': [10, 20, 15, 25, 30],
-            'feature2': ['A', 'B', 'A', 'C', 'B'],
-            'target': [0, 1, 0, 1, 0]
-        })
-        df.to_csv(filepath, index=False)
-        print("Dados dummy criados.")
-        df = pd.read_csv(filepath)
+from src.utils.data_cache import DataCache
+from src.utils.schema import DataSchema
+
+# pyarrow é opcional: acelera o parsing do CSV quando instalado.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - depende do ambiente
+    pa = None
+    pa_csv = None
+
+DEFAULT_CHUNKSIZE = 100_000
+SUPPORTED_ENGINES = {"auto", "pyarrow", "c", "python"}
+# Mesmo padrão em load_data, iter_data_chunks e BatchPredictor.predict_file
+DEFAULT_ENGINE = "auto"
+
+Categorical = Union[Sequence[str], Dict[str, Optional[Sequence[str]]]]
+
+
+def _create_dummy_data(filepath: str) -> None:
+    print(f"Criando {filepath} para teste...")
+    df = pd.DataFrame({
+        'feature1': [10, 20, 15, 25, 30],
+        'feature2': ['A', 'B', 'A', 'C', 'B'],
+        'target': [0, 1, 0, 1, 0]
+    })
+    df.to_csv(filepath, index=False)
+    print("Dados dummy criados.")
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine not in SUPPORTED_ENGINES:
+        raise ValueError(
+            f"Invalid engine: {engine}. Choose from {sorted(SUPPORTED_ENGINES)}."
+        )
+    if engine == "auto":
+        return "pyarrow" if pa_csv is not None else "c"
+    if engine == "pyarrow" and pa_csv is None:
+        raise ImportError("engine='pyarrow' requires the 'pyarrow' package.")
+    return engine
+
+
+def build_dtypes(
+    dtype: Optional[Dict[str, object]] = None,
+    categorical: Optional[Categorical] = None,
+) -> Optional[Dict[str, object]]:
+    """
+    Combina o schema explícito (dtype) com as colunas categóricas.
+    Quando as categorias são informadas (dict coluna -> categorias), usa um
+    CategoricalDtype fixo para que todos os chunks tenham o mesmo vocabulário.
+    """
+    dtypes: Dict[str, object] = dict(dtype or {})
+    if categorical is None:
+        return dtypes or None
+
+    if isinstance(categorical, dict):
+        for col, categories in categorical.items():
+            dtypes[col] = (
+                pd.CategoricalDtype(categories=list(categories))
+                if categories is not None
+                else "category"
+            )
+    else:
+        for col in categorical:
+            dtypes[col] = "category"
+    return dtypes or None
+
+
+def _arrow_convert_options(
+    dtypes: Optional[Dict[str, object]],
+    usecols: Optional[List[str]],
+):
+    column_types = {}
+    for col, col_dtype in (dtypes or {}).items():
+        if isinstance(col_dtype, pd.CategoricalDtype) or col_dtype == "category":
+            column_types[col] = pa.dictionary(pa.int32(), pa.string())
+        elif col_dtype in (str, object, "str", "object", "string"):
+            column_types[col] = pa.string()
+        else:
+            column_types[col] = pa.from_numpy_dtype(pd.api.types.pandas_dtype(col_dtype))
+    return pa_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=list(usecols) if usecols else None,
+    )
+
+
+def _arrow_to_pandas(table, dtypes: Optional[Dict[str, object]]) -> pd.DataFrame:
+    df = table.to_pandas()
+    # Categorias fixas precisam ser reaplicadas após a conversão do Arrow
+    for col, col_dtype in (dtypes or {}).items():
+        if isinstance(col_dtype, pd.CategoricalDtype) and col in df.columns:
+            df[col] = df[col].astype(object).astype(col_dtype)
     return df
 
+
+def _iter_arrow_chunks(
+    filepath: str,
+    chunksize: int,
+    dtypes: Optional[Dict[str, object]],
+    usecols: Optional[List[str]],
+) -> Iterator[pd.DataFrame]:
+    reader = pa_csv.open_csv(
+        filepath,
+        convert_options=_arrow_convert_options(dtypes, usecols),
+    )
+    pending = []
+    pending_rows = 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        # Reagrupa os record batches do Arrow em chunks de exatamente `chunksize` linhas
+        while pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield _arrow_to_pandas(table.slice(0, chunksize), dtypes)
+            rest = table.slice(chunksize)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    if pending_rows:
+        yield _arrow_to_pandas(pa.Table.from_batches(pending), dtypes)
+
+
+def _iter_pandas_chunks(
+    filepath: str,
+    chunksize: int,
+    dtypes: Optional[Dict[str, object]],
+    usecols: Optional[List[str]],
+    engine: str,
+) -> Iterator[pd.DataFrame]:
+    with pd.read_csv(
+        filepath,
+        chunksize=chunksize,
+        dtype=dtypes,
+        usecols=usecols,
+        engine=engine,
+    ) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_data_chunks(
+    filepath: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dtype: Optional[Dict[str, object]] = None,
+    usecols: Optional[List[str]] = None,
+    categorical: Optional[Categorical] = None,
+    engine: str = DEFAULT_ENGINE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê o CSV em modo streaming, produzindo DataFrames de até `chunksize` linhas.
+    - dtype/usecols/categorical: schema explícito (evita inferência de tipos)
+    - engine: 'auto' usa o leitor em streaming do pyarrow quando disponível
+    O arquivo precisa existir (não cria dados dummy).
+    """
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+
+    resolved_engine = _resolve_engine(engine)
+    dtypes = build_dtypes(dtype, categorical)
+
+    if resolved_engine == "pyarrow":
+        return _iter_arrow_chunks(filepath, chunksize, dtypes, usecols)
+    return _iter_pandas_chunks(filepath, chunksize, dtypes, usecols, resolved_engine)
+
+
+def load_data(
+    filepath='dummy_data.csv',
+    chunksize: Optional[int] = None,
+    dtype: Optional[Dict[str, object]] = None,
+    usecols: Optional[List[str]] = None,
+    categorical: Optional[Categorical] = None,
+    engine: str = DEFAULT_ENGINE,
+    cache: Optional[DataCache] = None,
+    schema: Optional[DataSchema] = None,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Carrega o CSV (criando dados dummy se o arquivo não existir).
+    - chunksize=None: retorna o DataFrame completo
+    - chunksize=N: retorna um iterador de DataFrames com até N linhas cada
+    - dtype/usecols/categorical: schema explícito para evitar inferência
+    - engine: 'auto' (padrão; pyarrow se instalado, senão 'c'), 'c', 'python' ou 'pyarrow'
+    - cache: DataCache opcional; cargas repetidas do mesmo arquivo pulam o parsing
+    - schema: DataSchema opcional aplicado ao frame (ou a cada chunk); levanta
+      SchemaValidationError com as violações e o número de linhas afetadas
+    """
+    if not os.path.exists(filepath):
+        _create_dummy_data(filepath)
+
+    if chunksize is not None:
+        if cache is not None:
+            raise ValueError("cache is not supported together with chunksize.")
+        chunks = iter_data_chunks(
+            filepath,
+            chunksize=chunksize,
+            dtype=dtype,
+            usecols=usecols,
+            categorical=categorical,
+            engine=engine,
+        )
+        return chunks if schema is None else (schema.enforce(chunk) for chunk in chunks)
+
+    resolved_engine = _resolve_engine(engine)
+    dtypes = build_dtypes(dtype, categorical)
+
+    def _parse(path: str) -> pd.DataFrame:
+        return pd.read_csv(path, dtype=dtypes, usecols=usecols, engine=resolved_engine)
+
+    if cache is None:
+        df = _parse(filepath)
+    else:
+        df = cache.load(filepath, _parse, options={"dtype": dtypes, "usecols": usecols, "engine": resolved_engine})
+        print(f"Cache {cache.last_status} para {filepath} ({cache.last_load_seconds:.4f}s)")
+    return df if schema is None else schema.enforce(df)
+
 def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     print("Pré-processando dados...")
     df['feature1_scaled'] = (df['feature1'] - df['feature1'].mean()) / df['feature1'].std()
@@ -0,0 +1,266 @@
+"""
+batch_predictor.py
+
+Este módulo define a classe BatchPredictor, responsável por:
+- Ler a entrada em chunks (load_data / iter_data_chunks)
+- Validar cada chunk contra o schema de entrada (DataSchema), se houver
+- Aplicar o pré-processamento persistido (FittedPreprocessor) a cada chunk
+- Executar predict/predict_proba por chunk, opcionalmente em um pool
+  de threads ou processos
+- Gravar as predições em streaming no arquivo de saída
+
+A memória fica limitada a alguns chunks em voo, independentemente do
+tamanho da entrada, e o throughput é reportado em linhas/segundo.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_preprocessing import DEFAULT_CHUNKSIZE, DEFAULT_ENGINE, iter_data_chunks
+from src.model_trainer import ModelTrainer, to_estimator_input
+from src.utils.fitted_preprocessor import FittedPreprocessor
+from src.utils.precision import resolve_precision
+from src.utils.schema import DataSchema
+from src.utils.serialization import default_file_mode
+
+EXECUTORS = {"thread", "process"}
+
+# Preditor por processo worker (preenchido pelo initializer do pool)
+_WORKER_PREDICTOR: Optional["BatchPredictor"] = None
+
+
+def _init_worker(predictor: "BatchPredictor") -> None:
+    global _WORKER_PREDICTOR
+    _WORKER_PREDICTOR = predictor
+
+
+def _score_in_worker(chunk: pd.DataFrame, proba: bool, keep_columns: Optional[List[str]]) -> pd.DataFrame:
+    return _WORKER_PREDICTOR.predict_frame(chunk, proba=proba, keep_columns=keep_columns)
+
+
+class BatchPredictor:
+    """
+    Classe responsável por pontuar grandes volumes de dados em chunks
+    com um modelo (e pré-processador) previamente persistidos.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        preprocessor: Optional[FittedPreprocessor] = None,
+        schema: Optional[DataSchema] = None,
+    ) -> None:
+        """
+        Parameters
+        ----
+        model : Any
+            Modelo treinado com método predict.
+        preprocessor : FittedPreprocessor, opcional
+            Estado de pré-processamento aplicado a cada chunk antes do predict.
+        schema : DataSchema, opcional
+            Schema das linhas brutas; cada chunk é validado antes do transform
+            e chunks inválidos levantam SchemaValidationError.
+
+        Raises
+        ----
+        TypeError
+            Se o modelo não possuir predict ou o preprocessor/schema for inválido.
+        """
+        if not hasattr(model, "predict"):
+            raise TypeError("O modelo fornecido deve possuir o método 'predict'.")
+        if preprocessor is not None and not isinstance(preprocessor, FittedPreprocessor):
+            raise TypeError("preprocessor deve ser um FittedPreprocessor.")
+        if schema is not None and not isinstance(schema, DataSchema):
+            raise TypeError("schema deve ser um DataSchema.")
+
+        self.model = model
+        self.preprocessor = preprocessor
+        # Compilado uma vez aqui, e não a cada chunk
+        self.schema = schema.compile() if schema is not None else None
+        self.last_stats: Dict[str, float] = {}
+
+    @classmethod
+    def from_model_path(cls, path: Union[str, os.PathLike]) -> "BatchPredictor":
+        """
+        Carrega o modelo com ModelTrainer.load_model e, se tiverem sido
+        salvos com ele (ver ModelTrainer.saved_sidecars), o pré-processador
+        e o schema.
+        """
+        model = ModelTrainer.load_model(path)
+        sidecars = ModelTrainer.saved_sidecars(path)
+        preprocessor = ModelTrainer.load_preprocessor(path) if sidecars["preprocessor"] else None
+        schema = ModelTrainer.load_schema(path) if sidecars["schema"] else None
+        return cls(model, preprocessor, schema)
+
+    def features(self, chunk: pd.DataFrame) -> Any:
+        """
+        Valida o chunk contra o schema e o transforma na entrada do modelo
+        (colunas do treino, na mesma ordem e precisão).
+
+        Raises
+        ----
+        SchemaValidationError
+            Se o chunk violar o schema.
+        """
+        if self.schema is not None:
+            self.schema.enforce(chunk)
+        features = self.preprocessor.transform(chunk) if self.preprocessor is not None else chunk
+        # Seleciona (e ordena) exatamente as colunas vistas no treino
+        feature_names = getattr(self.model, "feature_names_in_", None)
+        if feature_names is not None:
+            features = features[list(feature_names)]
+        # Mesma precisão usada no treino (float32 quando o preprocessor a define)
+        dtype = resolve_precision(self.preprocessor.precision) if self.preprocessor is not None else None
+        return to_estimator_input(features, dtype=None if dtype is np.float64 else dtype)
+
+    def predict_frame(
+        self,
+        chunk: pd.DataFrame,
+        proba: bool = False,
+        keep_columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Pontua um único chunk.
+
+        Returns
+        ----
+        pd.DataFrame
+            Colunas de keep_columns (ex.: um id), 'prediction' e, com
+            proba=True, uma coluna 'proba_<classe>' por classe.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("chunk deve ser um pandas DataFrame.")
+
+        features = self.features(chunk)
+        output = chunk[keep_columns].copy() if keep_columns else pd.DataFrame(index=chunk.index)
+        output["prediction"] = self.model.predict(features)
+
+        if proba:
+            if not hasattr(self.model, "predict_proba"):
+                raise TypeError("O modelo fornecido não possui o método 'predict_proba'.")
+            probabilities = self.model.predict_proba(features)
+            classes = getattr(self.model, "classes_", range(probabilities.shape[1]))
+            for i, label in enumerate(classes):
+                output[f"proba_{label}"] = probabilities[:, i]
+        return output
+
+    def _make_executor(self, executor: str, max_workers: Optional[int]) -> Executor:
+        if executor == "thread":
+            return ThreadPoolExecutor(max_workers=max_workers)
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,))
+
+    def _score_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        proba: bool,
+        keep_columns: Optional[List[str]],
+        executor: Optional[str],
+        max_workers: Optional[int],
+    ) -> Iterator[pd.DataFrame]:
+        if executor is None:
+            for chunk in chunks:
+                yield self.predict_frame(chunk, proba=proba, keep_columns=keep_columns)
+            return
+
+        workers = max_workers or os.cpu_count() or 1
+        # Janela limitada de chunks em voo: memória constante e ordem preservada
+        max_in_flight = 2 * workers
+        with self._make_executor(executor, workers) as pool:
+            pending: deque = deque()
+            for chunk in chunks:
+                if executor == "thread":
+                    future = pool.submit(self.predict_frame, chunk, proba, keep_columns)
+                else:
+                    future = pool.submit(_score_in_worker, chunk, proba, keep_columns)
+                pending.append(future)
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def predict_file(
+        self,
+        input_path: Union[str, os.PathLike],
+        output_path: Union[str, os.PathLike],
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        proba: bool = False,
+        keep_columns: Optional[List[str]] = None,
+        executor: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        dtype: Optional[Dict[str, object]] = None,
+        engine: str = DEFAULT_ENGINE,
+    ) -> Dict[str, float]:
+        """
+        Pontua um CSV em chunks e grava as predições em streaming (CSV).
+
+        Parameters
+        ----
+        input_path, output_path : str | os.PathLike
+            Arquivo de entrada e de saída. A saída é escrita em um arquivo
+            temporário e renomeada no final (leitores nunca veem um CSV parcial).
+        chunksize : int
+            Linhas por chunk.
+        proba : bool
+            Inclui as probabilidades por classe.
+        keep_columns : list[str], opcional
+            Colunas da entrada copiadas para a saída (ex.: identificadores).
+        executor : {'thread', 'process'} | None
+            Distribui os chunks em um pool; None executa em série.
+        max_workers : int, opcional
+            Tamanho do pool. Padrão: os.cpu_count().
+        dtype, engine :
+            Repassados para iter_data_chunks (schema explícito / leitor CSV).
+
+        Returns
+        ----
+        dict
+            rows, chunks, seconds e rows_per_second (também em `last_stats`).
+        """
+        if executor is not None and executor not in EXECUTORS:
+            raise ValueError(f"executor inválido: {executor}. Use 'thread', 'process' ou None.")
+
+        input_str = os.fspath(input_path)
+        output_str = os.fspath(output_path)
+        if not os.path.exists(input_str):
+            raise FileNotFoundError(f"Arquivo de entrada não encontrado: {input_str}")
+
+        directory = os.path.dirname(output_str)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        start = time.perf_counter()
+        rows = 0
+        n_chunks = 0
+        chunks = iter_data_chunks(input_str, chunksize=chunksize, dtype=dtype, engine=engine)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=directory or None)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+                for scored in self._score_chunks(chunks, proba, keep_columns, executor, max_workers):
+                    scored.to_csv(fh, header=(n_chunks == 0), index=False)
+                    rows += len(scored)
+                    n_chunks += 1
+            default_file_mode(tmp_path)
+            os.replace(tmp_path, output_str)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        seconds = time.perf_counter() - start
+        self.last_stats = {
+            "rows": rows,
+            "chunks": n_chunks,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+        }
+        return self.last_stats
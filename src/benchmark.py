@@ -0,0 +1,371 @@
+"""
+benchmark.py
+
+Suíte de benchmarks escalonados para cada etapa do pipeline:
+load_data -> validate_schema -> handle_missing_values -> normalize_features -> encode_categorical
+-> DataSplitter.split -> ModelTrainer.train/evaluate/save_model/load_model.
+
+- Gera datasets sintéticos (10k/1M/10M linhas ou qualquer tamanho) com
+  largura numérica/categórica configurável
+- Mede tempo de parede e pico de memória (tracemalloc) por etapa
+- Reporta o custo da validação de schema por milhão de linhas
+- Emite os resultados em JSON
+- Compara com um baseline salvo e falha (exit code 1) se alguma etapa
+  regredir além do limiar
+- Com --precisions float64 float32, repete a suíte em float32 e reporta a
+  diferença de acurácia em relação ao float64
+
+Uso:
+    python -m src.benchmark --sizes 10k 1m --output bench.json
+    python -m src.benchmark --sizes 10k --save-baseline benchmarks_baseline.json
+    python -m src.benchmark --sizes 10k --baseline benchmarks_baseline.json --threshold 0.25
+    python -m src.benchmark --sizes 1m --precisions float64 float32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.linear_model import LogisticRegression
+
+from data_preprocessing import load_data
+from src.model_trainer import ModelTrainer
+from src.utils.data_processor import DataProcessor
+from src.utils.data_splitter import DataSplitter
+from src.utils.precision import resolve_precision
+from src.utils.schema import DataSchema
+
+SIZE_ALIASES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+TARGET_COL = "target"
+
+
+def parse_size(size: Union[str, int]) -> int:
+    """Converte '10k'/'1m'/'10m' (ou um inteiro) em número de linhas."""
+    if isinstance(size, int):
+        rows = size
+    elif size.lower() in SIZE_ALIASES:
+        rows = SIZE_ALIASES[size.lower()]
+    else:
+        try:
+            rows = int(size)
+        except ValueError:
+            raise ValueError(f"Tamanho inválido: {size}. Use um inteiro ou um de {sorted(SIZE_ALIASES)}.")
+    if rows < 10:
+        raise ValueError("O tamanho mínimo é de 10 linhas.")
+    return rows
+
+
+def make_synthetic_dataset(
+    n_rows: int,
+    n_numeric: int = 8,
+    n_categorical: int = 2,
+    cardinality: int = 20,
+    missing_rate: float = 0.05,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Dataset sintético de classificação binária:
+    num_0..num_{n-1} (float com NaN), cat_0..cat_{m-1} (strings) e target.
+    """
+    rng = np.random.default_rng(seed)
+    numeric = rng.normal(size=(n_rows, n_numeric))
+    weights = rng.normal(size=n_numeric)
+    logits = numeric @ weights
+
+    data: Dict[str, Any] = {}
+    for j in range(n_numeric):
+        column = numeric[:, j].copy()
+        column[rng.random(n_rows) < missing_rate] = np.nan
+        data[f"num_{j}"] = column
+
+    levels = np.array([f"L{k}" for k in range(cardinality)], dtype=object)
+    for j in range(n_categorical):
+        codes = rng.integers(0, cardinality, size=n_rows)
+        logits = logits + (codes % 2 - 0.5)
+        data[f"cat_{j}"] = levels[codes]
+
+    data[TARGET_COL] = (logits + rng.normal(scale=0.5, size=n_rows) > 0).astype(np.int64)
+    return pd.DataFrame(data)
+
+
+def measure(fn: Callable[[], Any], track_memory: bool = True) -> Tuple[Any, float, Optional[int]]:
+    """
+    Executa fn e retorna (resultado, segundos, pico de memória em bytes).
+    Se o tracemalloc já estiver ativo, reaproveita o tracer (zerando só o pico)
+    e não o desliga ao final; o pico é medido acima da memória já alocada.
+    """
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif track_memory:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0] if track_memory else 0
+    start = time.perf_counter()
+    try:
+        result = fn()
+        seconds = time.perf_counter() - start
+        peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0) if track_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def benchmark_size(
+    n_rows: int,
+    workdir: str,
+    n_numeric: int = 8,
+    n_categorical: int = 2,
+    cardinality: int = 20,
+    track_memory: bool = True,
+    seed: int = 0,
+    precision: str = "float64",
+) -> Dict[str, Dict[str, Any]]:
+    """Executa todas as etapas para um tamanho de dataset e uma precisão."""
+    csv_path = os.path.join(workdir, f"bench_{n_rows}.csv")
+    model_path = os.path.join(workdir, f"bench_{n_rows}_{precision}.joblib")
+    if not os.path.exists(csv_path):
+        make_synthetic_dataset(n_rows, n_numeric, n_categorical, cardinality, seed=seed).to_csv(csv_path, index=False)
+
+    numeric_cols = [f"num_{j}" for j in range(n_numeric)]
+    categorical_cols = [f"cat_{j}" for j in range(n_categorical)]
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(stage: str, fn: Callable[[], Any], rows: int) -> Any:
+        value, seconds, peak = measure(fn, track_memory)
+        results[stage] = {
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "rows": rows,
+            "rows_per_second": rows / seconds if seconds > 0 else None,
+        }
+        return value
+
+    df = record("load_data", lambda: load_data(csv_path), n_rows)
+    # Schema com todas as checagens (tipos, nulos, faixas e categorias), compilado fora da medição
+    schema = DataSchema.infer(df, nullable=None, range_margin=0.0, max_categories=cardinality).compile()
+    report = record("validate_schema", lambda: schema.validate(df), n_rows)
+    results["validate_schema"]["seconds_per_million_rows"] = results["validate_schema"]["seconds"] * 1e6 / n_rows
+    results["validate_schema"]["violations"] = len(report["violations"])
+    df = record(
+        "handle_missing_values",
+        lambda: DataProcessor(df, precision=precision).handle_missing_values(strategy="mean"),
+        n_rows,
+    )
+    if numeric_cols:
+        df = record(
+            "normalize_features",
+            lambda: DataProcessor(df, precision=precision).normalize_features(columns=numeric_cols),
+            n_rows,
+        )
+    if categorical_cols:
+        df = record(
+            "encode_categorical",
+            lambda: DataProcessor(df, precision=precision).encode_categorical(columns=categorical_cols),
+            n_rows,
+        )
+
+    train_df, test_df = record("split", lambda: DataSplitter(df).split(test_size=0.2, random_state=42), n_rows)
+    X_train, y_train = train_df.drop(columns=[TARGET_COL]), train_df[TARGET_COL]
+    X_test, y_test = test_df.drop(columns=[TARGET_COL]), test_df[TARGET_COL]
+
+    trainer = ModelTrainer(LogisticRegression(max_iter=200, random_state=42), precision=precision)
+    record("train", lambda: trainer.train(X_train, y_train), len(X_train))
+    accuracy = record("evaluate", lambda: trainer.evaluate(X_test, y_test), len(X_test))
+    results["evaluate"]["accuracy"] = accuracy
+    record("save_model", lambda: trainer.save_model(model_path), 1)
+    record("load_model", lambda: ModelTrainer.load_model(model_path, use_cache=False), 1)
+    return results
+
+
+def run_benchmarks(
+    sizes: Sequence[Union[str, int]] = ("10k",),
+    n_numeric: int = 8,
+    n_categorical: int = 2,
+    cardinality: int = 20,
+    track_memory: bool = True,
+    workdir: Optional[str] = None,
+    precisions: Sequence[str] = ("float64",),
+) -> Dict[str, Any]:
+    """
+    Executa a suíte para cada tamanho e cada precisão.
+
+    Resultados em float64 ficam em "<tamanho>"; nas demais precisões, em
+    "<tamanho>@<precisão>" (ex.: "10k@float32"). Se float64 estiver entre as
+    precisões, "accuracy_deltas" traz acurácia(precisão) - acurácia(float64).
+
+    Returns
+    ----
+    dict
+        {"meta": {...ambiente/config...}, "results": {tamanho: {etapa: métricas}},
+         "accuracy_deltas": {tamanho: {precisão: delta}}}
+    """
+    for precision in precisions:
+        resolve_precision(precision)
+
+    own_dir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="bench-")
+    os.makedirs(workdir, exist_ok=True)
+    results: Dict[str, Dict[str, Any]] = {}
+    accuracy_deltas: Dict[str, Dict[str, float]] = {}
+    try:
+        for size in sizes:
+            accuracies = {}
+            for precision in precisions:
+                key = str(size) if precision == "float64" else f"{size}@{precision}"
+                results[key] = benchmark_size(
+                    parse_size(size),
+                    workdir,
+                    n_numeric=n_numeric,
+                    n_categorical=n_categorical,
+                    cardinality=cardinality,
+                    track_memory=track_memory,
+                    precision=precision,
+                )
+                accuracies[precision] = results[key]["evaluate"]["accuracy"]
+            if "float64" in accuracies and len(accuracies) > 1:
+                accuracy_deltas[str(size)] = {
+                    precision: accuracy - accuracies["float64"]
+                    for precision, accuracy in accuracies.items()
+                    if precision != "float64"
+                }
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python_version": platform.python_version(),
+            "pandas_version": pd.__version__,
+            "sklearn_version": sklearn.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "n_numeric": n_numeric,
+            "n_categorical": n_categorical,
+            "cardinality": cardinality,
+            "track_memory": track_memory,
+            "precisions": list(precisions),
+        },
+        "results": results,
+        "accuracy_deltas": accuracy_deltas,
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.25,
+    min_seconds: float = 0.01,
+) -> List[str]:
+    """
+    Lista as regressões: etapas cujo tempo (ou pico de memória) excede o
+    baseline em mais de `threshold` (0.25 = 25%). Etapas com baseline abaixo
+    de min_seconds são ignoradas no tempo (ruído de medição).
+    """
+    regressions = []
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {})
+        for stage, metrics in stages.items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            if base["seconds"] >= min_seconds and metrics["seconds"] > base["seconds"] * (1 + threshold):
+                regressions.append(
+                    f"{size}/{stage}: tempo {metrics['seconds']:.4f}s vs baseline {base['seconds']:.4f}s"
+                )
+            if (
+                metrics.get("peak_bytes") is not None
+                and base.get("peak_bytes")
+                and metrics["peak_bytes"] > base["peak_bytes"] * (1 + threshold)
+            ):
+                regressions.append(
+                    f"{size}/{stage}: memória {metrics['peak_bytes']} B vs baseline {base['peak_bytes']} B"
+                )
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for size, stages in report["results"].items():
+        print(f"\n--- Benchmark {size} ---")
+        for stage, metrics in stages.items():
+            peak = metrics.get("peak_bytes")
+            peak_str = f"{peak / 2**20:9.1f} MiB" if peak is not None else "        n/a"
+            print(f"{stage:<24}{metrics['seconds']:10.4f}s {peak_str}")
+        if "validate_schema" in stages:
+            print(f"Validação de schema: {stages['validate_schema']['seconds_per_million_rows']:.4f}s por milhão de linhas")
+    for size, deltas in report.get("accuracy_deltas", {}).items():
+        for precision, delta in deltas.items():
+            print(f"\nAcurácia {size} {precision} vs float64: {delta:+.6f}")
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    parser = parser or argparse.ArgumentParser(description="Benchmarks das etapas do pipeline.")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help="Ex.: 10k 1m 10m ou inteiros.")
+    parser.add_argument("--numeric", type=int, default=8, help="Número de colunas numéricas.")
+    parser.add_argument("--categorical", type=int, default=2, help="Número de colunas categóricas.")
+    parser.add_argument("--cardinality", type=int, default=20, help="Níveis por coluna categórica.")
+    parser.add_argument("--no-memory", action="store_true", help="Desativa o tracemalloc (mais rápido).")
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída.")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON para comparação.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regressão máxima tolerada (0.25 = 25%%).")
+    parser.add_argument("--save-baseline", default=None, help="Salva os resultados como novo baseline.")
+    parser.add_argument(
+        "--precisions",
+        nargs="+",
+        default=["float64"],
+        choices=["float64", "float32"],
+        help="Precisões a medir (ex.: float64 float32 reporta o delta de acurácia).",
+    )
+    return parser
+
+
+def run_from_args(args: argparse.Namespace) -> int:
+    report = run_benchmarks(
+        sizes=args.sizes,
+        n_numeric=args.numeric,
+        n_categorical=args.categorical,
+        cardinality=args.cardinality,
+        track_memory=not args.no_memory,
+        precisions=args.precisions,
+    )
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            print(f"\nResultados gravados em: {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare_to_baseline(report, baseline, threshold=args.threshold)
+        if regressions:
+            print("\nRegressões detectadas:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nNenhuma regressão em relação ao baseline.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return run_from_args(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
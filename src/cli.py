@@ -0,0 +1,242 @@
+"""
+cli.py
+
+Interface de linha de comando do projeto, com os subcomandos:
+- train: carrega, pré-processa, divide, treina, avalia e salva o modelo
+- evaluate: avalia um modelo salvo (com o pré-processador ao lado) em um CSV
+- predict: pontua um CSV em chunks com o BatchPredictor
+- benchmark: repassa os argumentos para src/benchmark.py
+
+Os módulos pesados (pandas, sklearn, ...) só são importados dentro de cada
+comando: `predict` não carrega LogisticRegression nem o código de treino, e
+`--help` não importa nada além da biblioteca padrão. O tempo desde a
+importação deste módulo até o comando estar pronto é reportado no stderr
+(a inicialização do interpretador, antes disso, não entra na conta).
+
+Uso:
+    python -m src.cli train --data dados.csv --model-path models/modelo.joblib
+    python -m src.cli evaluate --data dados.csv --model-path models/modelo.joblib
+    python -m src.cli predict --input dados.csv --output predicoes.csv --proba
+    python -m src.cli benchmark --sizes 10k
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+# Marco zero da medição: importação do módulo da CLI, não o início do processo
+_CLI_START = time.perf_counter()
+
+DEFAULT_MODEL_PATH = os.path.join("models", "logistic_regression_model.joblib")
+DEFAULT_DATA_PATH = "dummy_data.csv"
+TARGET_COL = "target"
+
+
+def _report_cold_start(command: str, imports_start: float) -> None:
+    """Reporta no stderr o tempo desde a importação da CLI até o comando estar pronto."""
+    now = time.perf_counter()
+    print(
+        f"[{command}] cold start: {now - _CLI_START:.3f}s desde a importação da CLI "
+        f"(imports do comando: {now - imports_start:.3f}s)",
+        file=sys.stderr,
+    )
+
+
+def cmd_train(args: argparse.Namespace) -> int:
+    imports_start = time.perf_counter()
+    import numpy as np
+    import pandas as pd
+    import sklearn
+    from sklearn.linear_model import LogisticRegression
+
+    from data_preprocessing import load_data
+    from src.model_trainer import ModelTrainer
+    from src.utils.data_splitter import DataSplitter
+    from src.utils.fitted_preprocessor import FittedPreprocessor
+    from src.utils.schema import DataSchema
+
+    _report_cold_start("train", imports_start)
+
+    print(f"Pandas version: {pd.__version__}")
+    print(f"Scikit-learn version: {sklearn.__version__}")
+
+    print("\n--- Carregando dados ---")
+    df_raw = load_data(args.data)
+    print(f"Dataset carregado com shape: {df_raw.shape}")
+
+    print("\n--- Pré-processando dados com FittedPreprocessor ---")
+    target = args.target
+    if target not in df_raw.columns:
+        raise ValueError(f"A coluna '{target}' não foi encontrada no DataFrame carregado.")
+
+    # Somente features, nunca o target
+    numerical_cols = [c for c in df_raw.select_dtypes(include=[np.number]).columns if c != target]
+    categorical_cols = [c for c in df_raw.select_dtypes(include=["object"]).columns if c != target]
+
+    # Estado de pré-processamento ajustado uma única vez (médias, min/max,
+    # vocabulários). O mesmo objeto é salvo com o modelo e reaplicado na
+    # inferência, sem reajustar nada sobre os dados de scoring.
+    preprocessor = FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=numerical_cols,
+        categorical_columns=categorical_cols,
+        exclude_columns=[target],
+    )
+    df_processed = preprocessor.fit_transform(df_raw)
+    print("Pré-processamento concluído.")
+
+    print("\n--- Dividindo dados com DataSplitter ---")
+    train_df, test_df = DataSplitter(df_processed).split(test_size=args.test_size, random_state=args.random_state)
+    X_train, y_train = train_df.drop(columns=[target]), train_df[target]
+    X_test, y_test = test_df.drop(columns=[target]), test_df[target]
+    print(f"Treino: {X_train.shape[0]} amostras")
+    print(f"Teste: {X_test.shape[0]} amostras")
+
+    print("\n--- Treinando modelo LogisticRegression ---")
+    trainer = ModelTrainer(LogisticRegression(max_iter=args.max_iter, random_state=args.random_state))
+    trainer.train(X_train, y_train)
+
+    print("\n--- Avaliando modelo ---")
+    accuracy = trainer.evaluate(X_test, y_test)
+    print(f"Acurácia do modelo: {accuracy:.4f}")
+
+    print("\n--- Salvando modelo ---")
+    # Schema das linhas brutas (colunas e tipos), validado em cada lote no predict
+    schema = DataSchema.infer(df_raw, exclude=[target])
+    trainer.save_model(args.model_path, preprocessor=preprocessor, schema=schema)
+    print(f"Modelo salvo em: {args.model_path}")
+    print(f"Pré-processador salvo em: {ModelTrainer.preprocessor_path(args.model_path)}")
+    print(f"Schema salvo em: {ModelTrainer.schema_path(args.model_path)}")
+
+    if args.sample_predictions > 0:
+        print("\n--- Fazendo predição com modelo carregado ---")
+        loaded_model = ModelTrainer.load_model(args.model_path)
+        loaded_preprocessor = ModelTrainer.load_preprocessor(args.model_path)
+        # Scoring "online": linhas brutas passam apenas pelo transform já ajustado
+        sample_raw = df_raw.loc[X_test.index[: args.sample_predictions]].drop(columns=[target])
+        predictions = loaded_model.predict(loaded_preprocessor.transform(sample_raw))
+        print("Amostras usadas para predição:")
+        print(sample_raw)
+        print("Predições:")
+        print(predictions)
+    return 0
+
+
+def cmd_evaluate(args: argparse.Namespace) -> int:
+    imports_start = time.perf_counter()
+    from data_preprocessing import load_data
+    from src.model_trainer import ModelTrainer
+
+    _report_cold_start("evaluate", imports_start)
+
+    trainer = ModelTrainer.from_trained_model(ModelTrainer.load_model(args.model_path))
+    df_raw = load_data(args.data)
+    if args.target not in df_raw.columns:
+        raise ValueError(f"A coluna '{args.target}' não foi encontrada no DataFrame carregado.")
+
+    X = df_raw.drop(columns=[args.target])
+    if ModelTrainer.saved_sidecars(args.model_path)["preprocessor"]:
+        X = ModelTrainer.load_preprocessor(args.model_path).transform(X)
+    feature_names = getattr(trainer.model, "feature_names_in_", None)
+    if feature_names is not None:
+        X = X[list(feature_names)]
+
+    accuracy = trainer.evaluate(X, df_raw[args.target])
+    print(f"Acurácia do modelo: {accuracy:.4f} ({len(X)} amostras)")
+    return 0
+
+
+def cmd_predict(args: argparse.Namespace) -> int:
+    imports_start = time.perf_counter()
+    from src.batch_predictor import BatchPredictor
+
+    _report_cold_start("predict", imports_start)
+
+    predictor = BatchPredictor.from_model_path(args.model_path)
+    stats = predictor.predict_file(
+        args.input,
+        args.output,
+        chunksize=args.chunksize,
+        proba=args.proba,
+        keep_columns=args.keep_columns,
+        executor=args.executor,
+        max_workers=args.workers,
+    )
+    print(
+        f"{stats['rows']} linhas pontuadas em {stats['seconds']:.2f}s "
+        f"({stats['rows_per_second']:.0f} linhas/s) -> {args.output}"
+    )
+    return 0
+
+
+def cmd_benchmark(args: argparse.Namespace) -> int:
+    imports_start = time.perf_counter()
+    from src.benchmark import main as benchmark_main
+
+    _report_cold_start("benchmark", imports_start)
+    return benchmark_main(args.benchmark_args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="innovatenow", description="Pipeline de ML da InnovateNow.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="Treina, avalia e salva o modelo.")
+    train.add_argument("--data", default=DEFAULT_DATA_PATH, help="CSV de treino (dados dummy se não existir).")
+    train.add_argument("--target", default=TARGET_COL)
+    train.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    train.add_argument("--test-size", type=float, default=0.25)
+    train.add_argument("--random-state", type=int, default=42)
+    train.add_argument("--max-iter", type=int, default=1000)
+    train.add_argument(
+        "--sample-predictions",
+        type=int,
+        default=0,
+        help="Recarrega o modelo salvo e prediz N amostras de teste.",
+    )
+    train.set_defaults(handler=cmd_train)
+
+    evaluate = subparsers.add_parser("evaluate", help="Avalia um modelo salvo em um CSV rotulado.")
+    evaluate.add_argument("--data", required=True)
+    evaluate.add_argument("--target", default=TARGET_COL)
+    evaluate.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    evaluate.set_defaults(handler=cmd_evaluate)
+
+    predict = subparsers.add_parser("predict", help="Pontua um CSV em chunks.")
+    predict.add_argument("--input", required=True)
+    predict.add_argument("--output", required=True)
+    predict.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    predict.add_argument("--chunksize", type=int, default=100_000)
+    predict.add_argument("--proba", action="store_true")
+    predict.add_argument("--keep-columns", nargs="+", default=None)
+    predict.add_argument("--executor", choices=["thread", "process"], default=None)
+    predict.add_argument("--workers", type=int, default=None)
+    predict.set_defaults(handler=cmd_predict)
+
+    benchmark = subparsers.add_parser(
+        "benchmark",
+        help="Benchmarks do pipeline (argumentos de python -m src.benchmark).",
+        add_help=False,
+    )
+    benchmark.set_defaults(handler=cmd_benchmark)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "benchmark":
+        # Argumentos desconhecidos são do parser de src/benchmark.py
+        args.benchmark_args = extra
+    elif extra:
+        parser.error(f"argumentos não reconhecidos: {' '.join(extra)}")
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    return handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+cross_validation.py
+
+Este módulo define a classe CrossValidator, responsável por:
+- Gerar os folds com DataSplitter.iter_folds (KFold/Stratified/Group)
+- Ajustar um FittedPreprocessor por fold (somente nas linhas de treino
+  do fold, sem vazamento para a validação)
+- Guardar as matrizes transformadas de cada fold em memória e em disco
+  (joblib, recarregadas pelos workers com mmap_mode='r')
+- Treinar/avaliar os folds em paralelo em um pool de processos, com
+  threads de BLAS limitadas por worker (threadpoolctl)
+- Devolver os scores por fold e agregados (média/desvio)
+
+Rodar outro estimador sobre os mesmos dados e folds reaproveita as
+matrizes em cache: o pré-processamento não é refeito.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+
+from src.model_trainer import ModelTrainer
+from src.utils.data_splitter import DataSplitter
+from src.utils.fitted_preprocessor import FittedPreprocessor
+from src.utils.precision import resolve_precision
+from src.utils.shared_frames import pack_frame, pack_series, unpack_frame, unpack_series
+
+FOLD_METRICS = ("accuracy", "precision", "recall", "f1", "roc_auc")
+
+# Estado por processo worker (preenchido pelo initializer do pool)
+_WORKER_LIMITS: Any = None
+_WORKER_FOLDS: Dict[str, Dict[str, Any]] = {}
+
+
+def _init_worker(blas_threads: Optional[int]) -> None:
+    global _WORKER_LIMITS
+    if blas_threads is not None:
+        # Mantém a referência para que o limite valha durante toda a vida do worker
+        _WORKER_LIMITS = threadpool_limits(limits=blas_threads)
+
+
+def _unpack_fold(packed: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "X_train": unpack_frame(packed["X_train"]),
+        "y_train": unpack_series(packed["y_train"]),
+        "X_test": unpack_frame(packed["X_test"]),
+        "y_test": unpack_series(packed["y_test"]),
+    }
+
+
+def _score_fold(fold: int, data: Dict[str, Any], estimator: Any, precision: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    trainer = ModelTrainer(estimator, precision=precision)
+    trainer.train(data["X_train"], data["y_train"])
+    fit_seconds = time.perf_counter() - start
+    report = trainer.evaluate_detailed(data["X_test"], data["y_test"])
+    result: Dict[str, Any] = {
+        "fold": fold,
+        "train_rows": len(data["X_train"]),
+        "test_rows": len(data["X_test"]),
+        "fit_seconds": fit_seconds,
+    }
+    result.update({name: report[name] for name in FOLD_METRICS})
+    return result
+
+
+def _score_fold_from_path(fold: int, path: str, estimator: Any, precision: str) -> Dict[str, Any]:
+    # Cada worker mapeia o arquivo do fold uma única vez e reaproveita o memmap
+    if path not in _WORKER_FOLDS:
+        _WORKER_FOLDS[path] = _unpack_fold(joblib.load(path, mmap_mode="r"))
+    return _score_fold(fold, _WORKER_FOLDS[path], estimator, precision)
+
+
+def frame_fingerprint(dataframe: pd.DataFrame) -> str:
+    """Hash do conteúdo (valores, índice, colunas e dtypes) de um DataFrame."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(dataframe, index=True).to_numpy().tobytes())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in dataframe.dtypes.items()]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CrossValidator:
+    """
+    Classe responsável por validação cruzada com pré-processamento por
+    fold em cache e treino/avaliação dos folds em paralelo.
+    """
+
+    def __init__(
+        self,
+        preprocessor: FittedPreprocessor,
+        target_col: str = "target",
+        n_splits: int = 5,
+        shuffle: bool = True,
+        random_state: Optional[int] = 42,
+        stratify: bool = True,
+        group_col: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        blas_threads: Optional[int] = 1,
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+    ) -> None:
+        """
+        Inicializa o validador.
+
+        Parameters
+        ----
+        preprocessor : FittedPreprocessor
+            Modelo de configuração; uma cópia é ajustada em cada fold.
+            Não deve referenciar target_col nem group_col. Sua precisão
+            (float32/float64) vale também para as matrizes dos folds e o treino.
+        target_col : str
+            Coluna alvo (nunca passa pelo pré-processador).
+        n_splits, shuffle, random_state :
+            Configuração dos folds (DataSplitter.iter_folds).
+        stratify : bool
+            Estratifica os folds pela coluna alvo.
+        group_col : str, opcional
+            Coluna de grupos (um grupo nunca aparece em treino e validação).
+        max_workers : int, opcional
+            Número máximo de processos. Padrão: os.cpu_count().
+            Com max_workers=1 os folds rodam no próprio processo.
+        blas_threads : int | None
+            Limite de threads de BLAS/OpenMP por worker (None = sem limite).
+        cache_dir : str | os.PathLike, opcional
+            Diretório base dos arquivos de fold (padrão: diretório temporário).
+
+        Raises
+        ----
+        TypeError
+            Se preprocessor não for um FittedPreprocessor.
+        ValueError
+            Se max_workers/blas_threads forem inválidos.
+        """
+        if not isinstance(preprocessor, FittedPreprocessor):
+            raise TypeError("preprocessor deve ser um FittedPreprocessor.")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers deve ser >= 1.")
+        if blas_threads is not None and blas_threads < 1:
+            raise ValueError("blas_threads deve ser >= 1.")
+
+        self.preprocessor = preprocessor
+        self.target_col = target_col
+        self.n_splits = n_splits
+        self.shuffle = shuffle
+        self.random_state = random_state
+        self.stratify = stratify
+        self.group_col = group_col
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.blas_threads = blas_threads
+        self.cache_dir: Optional[str] = os.fspath(cache_dir) if cache_dir is not None else None
+
+        self.fold_preprocessors_: List[FittedPreprocessor] = []
+        self.preprocess_seconds_: Optional[float] = None
+        self._cache_key: Optional[str] = None
+        self._folds: List[Dict[str, Any]] = []
+        self._fold_dir: Optional[str] = None
+        self._fold_paths: List[str] = []
+
+    def prepare(self, dataframe: pd.DataFrame) -> bool:
+        """
+        Gera os folds e as matrizes pré-processadas de cada um.
+
+        Returns
+        ----
+        bool
+            True se as matrizes em cache foram reaproveitadas (mesmos dados).
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("dataframe deve ser um pandas DataFrame.")
+        if dataframe.empty:
+            raise ValueError("dataframe não pode estar vazio.")
+        if self.target_col not in dataframe.columns:
+            raise ValueError(f"A coluna '{self.target_col}' não foi encontrada no DataFrame.")
+
+        key = self._fold_key(dataframe)
+        if key == self._cache_key and self._folds:
+            return True
+
+        self.clear_cache()
+        start = time.perf_counter()
+        # Alvo e grupos não são features
+        dropped = [self.target_col] + ([self.group_col] if self.group_col is not None else [])
+        features = dataframe.drop(columns=dropped)
+        target = dataframe[self.target_col]
+        splitter = DataSplitter(dataframe, copy=False)
+        folds = splitter.iter_folds(
+            n_splits=self.n_splits,
+            shuffle=self.shuffle,
+            random_state=self.random_state,
+            stratify_col=self.target_col if self.stratify else None,
+            group_col=self.group_col,
+        )
+
+        float_dtype = resolve_precision(self.preprocessor.precision)
+        for train_idx, test_idx in folds:
+            # Estatísticas aprendidas apenas nas linhas de treino do fold
+            preprocessor = copy.deepcopy(self.preprocessor)
+            X_train = preprocessor.fit_transform(features.iloc[train_idx])
+            X_test = preprocessor.transform(features.iloc[test_idx])
+            self.fold_preprocessors_.append(preprocessor)
+            self._folds.append(
+                {
+                    "X_train": pack_frame(X_train, float_dtype),
+                    "y_train": pack_series(target.iloc[train_idx]),
+                    "X_test": pack_frame(X_test, float_dtype),
+                    "y_test": pack_series(target.iloc[test_idx]),
+                }
+            )
+
+        self.preprocess_seconds_ = time.perf_counter() - start
+        self._cache_key = key
+        return False
+
+    def _fold_key(self, dataframe: pd.DataFrame) -> str:
+        # Dados + tudo que muda os folds ou as matrizes: mudar a configuração
+        # na mesma instância invalida o cache
+        config = {
+            "target_col": self.target_col,
+            "n_splits": self.n_splits,
+            "shuffle": self.shuffle,
+            "random_state": self.random_state,
+            "stratify": self.stratify,
+            "group_col": self.group_col,
+            "preprocessor": self.preprocessor.get_params(),
+        }
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(frame_fingerprint(dataframe).encode("utf-8"))
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _ensure_fold_files(self) -> List[str]:
+        # Escritos uma única vez e reaproveitados por todas as execuções paralelas
+        if not self._fold_paths:
+            self._fold_dir = tempfile.mkdtemp(prefix="cross_validation-", dir=self.cache_dir)
+            for i, packed in enumerate(self._folds):
+                path = os.path.join(self._fold_dir, f"fold_{i}.joblib")
+                joblib.dump(packed, path)
+                self._fold_paths.append(path)
+        return self._fold_paths
+
+    def run(self, estimator: Any, dataframe: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Treina e avalia o estimador em todos os folds.
+
+        Parameters
+        ----
+        estimator : Any
+            Estimador do scikit-learn (clonado em cada fold).
+        dataframe : pd.DataFrame, opcional
+            Dados completos (features + target). Se omitido, usa os folds
+            preparados anteriormente.
+
+        Returns
+        ----
+        dict
+            'folds' (scores por fold), 'aggregate' (média/desvio por métrica),
+            'estimator', 'reused_folds' e 'preprocess_seconds'.
+
+        Raises
+        ----
+        TypeError
+            Se o estimador não possuir fit e predict.
+        RuntimeError
+            Se não houver dados nem folds preparados.
+        """
+        if not hasattr(estimator, "fit") or not hasattr(estimator, "predict"):
+            raise TypeError("O estimador deve possuir os métodos 'fit' e 'predict'.")
+        if dataframe is not None:
+            reused = self.prepare(dataframe)
+        elif self._folds:
+            reused = True
+        else:
+            raise RuntimeError("Nenhum fold preparado. Informe o dataframe ou chame prepare() primeiro.")
+
+        folds = self._execute(estimator)
+        folds.sort(key=lambda result: result["fold"])
+        return {
+            "estimator": type(estimator).__name__,
+            "folds": folds,
+            "aggregate": self._aggregate(folds),
+            "reused_folds": reused,
+            "preprocess_seconds": self.preprocess_seconds_,
+        }
+
+    def _execute(self, estimator: Any) -> List[Dict[str, Any]]:
+        workers = min(self.max_workers, len(self._folds))
+
+        if workers == 1:
+            limits = threadpool_limits(limits=self.blas_threads) if self.blas_threads else None
+            try:
+                return [
+                    _score_fold(i, _unpack_fold(packed), clone(estimator), self.preprocessor.precision)
+                    for i, packed in enumerate(self._folds)
+                ]
+            finally:
+                if limits is not None:
+                    limits.restore_original_limits()
+
+        paths = self._ensure_fold_files()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.blas_threads,),
+        ) as executor:
+            futures = [
+                executor.submit(_score_fold_from_path, i, path, clone(estimator), self.preprocessor.precision)
+                for i, path in enumerate(paths)
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _aggregate(folds: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        aggregate = {}
+        for name in FOLD_METRICS:
+            values = np.array([fold[name] for fold in folds if fold[name] is not None], dtype=np.float64)
+            if values.size:
+                aggregate[name] = {"mean": float(values.mean()), "std": float(values.std(ddof=0))}
+        return aggregate
+
+    def clear_cache(self) -> None:
+        """Descarta as matrizes de fold em memória e os arquivos em disco."""
+        if self._fold_dir is not None:
+            shutil.rmtree(self._fold_dir, ignore_errors=True)
+        self._fold_dir = None
+        self._fold_paths = []
+        self._folds = []
+        self.fold_preprocessors_ = []
+        self._cache_key = None
+
+    def __enter__(self) -> "CrossValidator":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.clear_cache()
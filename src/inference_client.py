@@ -0,0 +1,176 @@
+"""
+inference_client.py
+
+Cliente assíncrono (HTTP/1.1 keep-alive) e gerador de carga local para
+o servidor de src/inference_server.py.
+
+Uso:
+    python -m src.inference_client --csv dados.csv --requests 2000 --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class InferenceClient:
+    """
+    Conexão persistente com o servidor de inferência (TCP ou Unix socket).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, unix_path: Optional[str] = None) -> None:
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        if self.unix_path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def request(self, method: str, target: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if self._writer is None:
+            await self.connect()
+
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self._writer.write(
+            (
+                f"{method} {target} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = json.loads(await self._reader.readexactly(int(headers.get("content-length", "0"))))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        if status != 200:
+            raise RuntimeError(f"Erro {status} do servidor: {data.get('error')}")
+        return data
+
+    async def predict(self, instances: List[Dict[str, Any]]) -> List[Any]:
+        return (await self.request("POST", "/predict", {"instances": instances}))["predictions"]
+
+    async def metrics(self) -> Dict[str, Any]:
+        return await self.request("GET", "/metrics")
+
+
+async def run_load_test(
+    instances: List[Dict[str, Any]],
+    n_requests: int = 1000,
+    concurrency: int = 32,
+    rows_per_request: int = 1,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Dispara n_requests requisições com `concurrency` conexões simultâneas,
+    cada uma enviando rows_per_request linhas (em rodízio sobre instances).
+
+    Returns
+    ----
+    dict
+        requests, seconds, requests_per_second, rows_per_second e latências
+        p50/p99 observadas pelo cliente (ms), além das métricas do servidor.
+    """
+    if not instances:
+        raise ValueError("instances não pode estar vazio.")
+    if n_requests < 1 or concurrency < 1 or rows_per_request < 1:
+        raise ValueError("n_requests, concurrency e rows_per_request devem ser >= 1.")
+
+    latencies: List[float] = []
+    counter = iter(range(n_requests))
+
+    async def worker() -> None:
+        client = InferenceClient(host, port, unix_path)
+        try:
+            for i in counter:
+                start = i * rows_per_request
+                batch = [instances[(start + j) % len(instances)] for j in range(rows_per_request)]
+                t0 = time.perf_counter()
+                await client.predict(batch)
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, n_requests))))
+    seconds = time.perf_counter() - start
+
+    metrics_client = InferenceClient(host, port, unix_path)
+    try:
+        server_metrics = await metrics_client.metrics()
+    finally:
+        await metrics_client.close()
+
+    p50, p99 = np.percentile(latencies, [50, 99]).tolist()
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "requests_per_second": n_requests / seconds,
+        "rows_per_second": n_requests * rows_per_request / seconds,
+        "client_latency_p50_ms": p50,
+        "client_latency_p99_ms": p99,
+        "server": server_metrics,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor de inferência.")
+    parser.add_argument("--csv", required=True, help="CSV com as linhas a enviar (sem o target).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows-per-request", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    instances = pd.read_csv(args.csv).to_dict(orient="records")
+    report = asyncio.run(
+        run_load_test(
+            instances,
+            n_requests=args.requests,
+            concurrency=args.concurrency,
+            rows_per_request=args.rows_per_request,
+            host=args.host,
+            port=args.port,
+            unix_path=args.unix_socket,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
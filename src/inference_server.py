@@ -0,0 +1,459 @@
+"""
+inference_server.py
+
+Servidor HTTP local (asyncio) para inferência com micro-batching dinâmico.
+
+- Carrega o modelo uma única vez via ModelTrainer.load_model (e o
+  pré-processador salvo ao lado, se existir) através do BatchPredictor
+- Agrupa requisições concorrentes em micro-lotes limitados por
+  max_batch_size (linhas) e max_wait_ms (espera máxima do primeiro item)
+- Valida e transforma cada requisição isoladamente; payloads inválidos
+  recebem 400 sem afetar as demais requisições do lote
+- Executa o predict vetorizado fora do event loop (ThreadPoolExecutor),
+  com até predict_workers lotes em voo
+- Expõe latência p50/p99 e histograma de tamanhos de lote em GET /metrics
+
+Endpoints:
+- POST /predict  {"instances": [{"col": valor, ...}, ...]} -> {"predictions": [...]}
+- GET  /metrics
+- GET  /health
+
+Uso:
+    python -m src.inference_server --model models/logistic_regression_model.joblib --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.batch_predictor import BatchPredictor
+from src.utils.schema import SchemaValidationError
+
+# (features já transformadas, número de linhas, future da requisição)
+_Item = Tuple[Any, int, asyncio.Future]
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# Limite padrão do corpo de uma requisição (1 MiB)
+DEFAULT_MAX_BODY_BYTES = 1 << 20
+
+
+class LatencyStats:
+    """
+    Janela deslizante de latências + histograma de tamanhos de lote.
+    """
+
+    def __init__(self, window: int = 10_000) -> None:
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+        self.batch_sizes: Counter = Counter()
+        self.requests: int = 0
+        self.rows: int = 0
+        self.batches: int = 0
+        self.errors: int = 0
+
+    def record_request(self, latency_ms: float, rows: int) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.requests += 1
+        self.rows += rows
+
+    def record_batch(self, size: int) -> None:
+        self.batch_sizes[size] += 1
+        self.batches += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = np.fromiter(self.latencies_ms, dtype=np.float64)
+        p50, p99 = (np.percentile(latencies, [50, 99]).tolist() if latencies.size else (None, None))
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "latency_p50_ms": p50,
+            "latency_p99_ms": p99,
+            "mean_batch_size": self.rows / self.batches if self.batches else None,
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+        }
+
+
+class MicroBatcher:
+    """
+    Fila assíncrona que agrupa requisições em micro-lotes e executa o
+    predict vetorizado em um executor, devolvendo a fatia de cada requisição.
+
+    Cada requisição é validada e transformada isoladamente antes de entrar
+    na fila (um payload inválido falha só a própria requisição); o lote
+    junta apenas as features já alinhadas às colunas do treino. Se o predict
+    do lote falhar, cada requisição é pontuada separadamente. Até
+    `predict_workers` lotes ficam em voo ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        predictor: BatchPredictor,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        predict_workers: int = 1,
+        stats: Optional[LatencyStats] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size deve ser >= 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms deve ser >= 0.")
+        if predict_workers < 1:
+            raise ValueError("predict_workers deve ser >= 1.")
+
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.predict_workers = predict_workers
+        self.stats = stats or LatencyStats()
+        self._executor = ThreadPoolExecutor(max_workers=predict_workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        # Itens já retirados da fila pelo lote em formação (falhados se stop() o interromper)
+        self._collecting: List[_Item] = []
+        self._closed = False
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.predict_workers)
+        self._closed = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Lotes já em voo terminam; o que ainda não foi agrupado falha
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        pending = self._collecting
+        self._collecting = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Servidor de inferência encerrado."))
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, frame: pd.DataFrame) -> List[Any]:
+        """
+        Valida e transforma as linhas de uma requisição, enfileira as
+        features e aguarda suas predições.
+
+        Raises
+        ----
+        SchemaValidationError, ValueError
+            Se a requisição não puder ser transformada (payload inválido).
+        RuntimeError
+            Se o batcher não estiver rodando.
+        """
+        if self._queue is None or self._closed:
+            raise RuntimeError("Servidor de inferência não está aceitando requisições.")
+        loop = asyncio.get_running_loop()
+        features = await loop.run_in_executor(self._executor, self.predictor.features, frame)
+        future = loop.create_future()
+        await self._queue.put((features, len(frame), future))
+        return await future
+
+    async def _collect(self) -> List[_Item]:
+        loop = asyncio.get_running_loop()
+        items = self._collecting = [await self._queue.get()]
+        rows = items[0][1]
+        deadline = loop.time() + self.max_wait
+
+        while rows < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            rows += item[1]
+        self._collecting = []
+        return items
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Espera um slot antes de formar o lote: com todos os workers
+            # ocupados, as requisições seguem se acumulando na fila
+            await self._slots.acquire()
+            try:
+                items = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = loop.create_task(self._score(items))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    def _predict(self, features: Any) -> List[Any]:
+        return self.predictor.model.predict(features).tolist()
+
+    async def _score(self, items: List[_Item]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            batch = _stack([features for features, _, _ in items]) if len(items) > 1 else items[0][0]
+            if batch is not None:
+                try:
+                    predictions = await loop.run_in_executor(self._executor, self._predict, batch)
+                except Exception as exc:
+                    if len(items) == 1:
+                        _resolve(items[0][2], exc=exc)
+                        return
+                else:
+                    # Só lotes pontuados entram no histograma (as linhas contam uma vez)
+                    self.stats.record_batch(sum(size for _, size, _ in items))
+                    offset = 0
+                    for _, size, future in items:
+                        _resolve(future, predictions[offset:offset + size])
+                        offset += size
+                    return
+
+            # Lote incompatível ou com falha: cada requisição isoladamente,
+            # para que só a responsável pelo erro o receba
+            for features, size, future in items:
+                try:
+                    predictions = await loop.run_in_executor(self._executor, self._predict, features)
+                except Exception as exc:
+                    _resolve(future, exc=exc)
+                else:
+                    self.stats.record_batch(size)
+                    _resolve(future, predictions)
+        finally:
+            self._slots.release()
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exc: Optional[BaseException] = None) -> None:
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+def _stack(features: List[Any]) -> Any:
+    """Empilha as features das requisições; None se não forem compatíveis."""
+    first = features[0]
+    if isinstance(first, pd.DataFrame):
+        if all(isinstance(f, pd.DataFrame) and f.columns.equals(first.columns) for f in features):
+            return pd.concat(features, ignore_index=True)
+        return None
+    if sp.issparse(first):
+        if all(sp.issparse(f) and f.shape[1] == first.shape[1] for f in features):
+            return sp.vstack(features, format="csr")
+        return None
+    return None
+
+
+class InferenceServer:
+    """
+    Servidor HTTP/1.1 mínimo (keep-alive) sobre asyncio, em TCP ou Unix socket.
+    """
+
+    def __init__(
+        self,
+        model_path: Union[str, os.PathLike],
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        unix_path: Optional[str] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        predict_workers: int = 1,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ) -> None:
+        if max_body_bytes < 0:
+            raise ValueError("max_body_bytes deve ser >= 0.")
+        self.predictor = BatchPredictor.from_model_path(model_path)
+        self.max_body_bytes = max_body_bytes
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(
+            self.predictor,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            predict_workers=predict_workers,
+            stats=self.stats,
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self.batcher.start()
+        if self.unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            # port=0 -> porta efêmera escolhida pelo SO
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if target == "/health":
+            return 200, {"status": "ok"}
+        if target == "/metrics":
+            return 200, self.stats.snapshot()
+        if target != "/predict":
+            return 404, {"error": f"rota desconhecida: {target}"}
+        if method != "POST":
+            return 405, {"error": "use POST em /predict"}
+
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body or b"{}")
+            instances = payload["instances"]
+            if not isinstance(instances, list) or not instances:
+                raise ValueError
+            frame = pd.DataFrame.from_records(instances)
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "corpo deve ser JSON no formato {\"instances\": [{...}, ...]}"}
+
+        try:
+            predictions = await self.batcher.submit(frame)
+        except (SchemaValidationError, ValueError, KeyError) as exc:
+            # Payload que não passa no schema/pré-processamento é erro do cliente
+            self.stats.errors += 1
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            self.stats.errors += 1
+            return 500, {"error": str(exc)}
+
+        self.stats.record_request((time.perf_counter() - start) * 1000.0, len(frame))
+        return 200, {"predictions": predictions}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    # Sem tamanho válido não há como achar o fim do corpo: responde e fecha
+                    status, payload = 400, {"error": "Content-Length inválido"}
+                    keep_alive = False
+                else:
+                    if length < 0 or length > self.max_body_bytes:
+                        # Não lê o corpo: evita alocar memória arbitrária; responde e fecha
+                        status = 413
+                        payload = {"error": f"Corpo deve ter entre 0 e {self.max_body_bytes} bytes"}
+                        keep_alive = False
+                    else:
+                        body = await reader.readexactly(length)
+                        status, payload = await self._route(method, target, body)
+                        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload, default=_json_default).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de inferência com micro-batching.")
+    parser.add_argument("--model", default=os.path.join("models", "logistic_regression_model.joblib"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--predict-workers", type=int, default=1)
+    parser.add_argument("--max-body-bytes", type=int, default=DEFAULT_MAX_BODY_BYTES)
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(
+        args.model,
+        host=args.host,
+        port=args.port,
+        unix_path=args.unix_socket,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        predict_workers=args.predict_workers,
+        max_body_bytes=args.max_body_bytes,
+    )
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"Servidor de inferência ouvindo em {where}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
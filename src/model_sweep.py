@@ -0,0 +1,238 @@
+"""
+model_sweep.py
+
+Este módulo define a classe ModelSweep, responsável por:
+- Expandir uma grade de estimadores/hiperparâmetros
+- Treinar os candidatos em paralelo em um pool de processos
+- Compartilhar a matriz de treino uma única vez via memmap (joblib),
+  em vez de serializá-la para cada worker
+- Limitar as threads de BLAS por worker (threadpoolctl) para evitar
+  oversubscription de núcleos
+- Ranquear os candidatos pelo score de ModelTrainer.evaluate()
+
+O melhor candidato é devolvido como um ModelTrainer já treinado,
+pronto para save_model().
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import joblib
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid
+from threadpoolctl import threadpool_limits
+
+from src.model_trainer import ModelTrainer
+from src.utils.precision import resolve_precision
+from src.utils.shared_frames import pack_frame, pack_series, unpack_frame, unpack_series
+
+ParamGrid = Union[Dict[str, Sequence[Any]], List[Dict[str, Sequence[Any]]]]
+Candidate = Union[Any, Tuple[Any, ParamGrid]]
+
+# Estado por processo worker (preenchido pelo initializer do pool)
+_WORKER_DATA: Optional[Dict[str, Any]] = None
+_WORKER_LIMITS: Any = None
+
+
+def _load_shared_data(data_path: str) -> Dict[str, Any]:
+    shared = joblib.load(data_path, mmap_mode="r")
+    return {
+        "X_train": unpack_frame(shared["X_train"]),
+        "y_train": unpack_series(shared["y_train"]),
+        "X_test": unpack_frame(shared["X_test"]),
+        "y_test": unpack_series(shared["y_test"]),
+    }
+
+
+def _init_worker(data_path: str, blas_threads: Optional[int], precision: str) -> None:
+    global _WORKER_DATA, _WORKER_LIMITS
+    _WORKER_DATA = _load_shared_data(data_path)
+    _WORKER_DATA["precision"] = precision
+    if blas_threads is not None:
+        # Mantém a referência para que o limite valha durante toda a vida do worker
+        _WORKER_LIMITS = threadpool_limits(limits=blas_threads)
+
+
+def _fit_candidate(position: int, estimator: Any) -> Tuple[int, Any, float, float]:
+    data = _WORKER_DATA
+    start = time.perf_counter()
+    trainer = ModelTrainer(estimator, precision=data["precision"])
+    trainer.train(data["X_train"], data["y_train"])
+    fit_seconds = time.perf_counter() - start
+    score = trainer.evaluate(data["X_test"], data["y_test"])
+    return position, trainer.model, score, fit_seconds
+
+
+class ModelSweep:
+    """
+    Classe responsável por treinar uma grade de modelos em paralelo e
+    ranqueá-los pelo score de avaliação.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[Candidate],
+        max_workers: Optional[int] = None,
+        blas_threads: Optional[int] = 1,
+        temp_dir: Optional[Union[str, os.PathLike]] = None,
+        precision: str = "float64",
+    ) -> None:
+        """
+        Inicializa o sweep.
+
+        Parameters
+        ----
+        candidates : Sequence
+            Estimadores ou pares (estimador, param_grid). Cada param_grid é
+            expandido com ParameterGrid e cada combinação vira um candidato.
+        max_workers : int, opcional
+            Número máximo de processos. Padrão: os.cpu_count().
+            Com max_workers=1 os candidatos rodam no próprio processo.
+        blas_threads : int | None
+            Limite de threads de BLAS/OpenMP por worker (None = sem limite).
+        temp_dir : str | os.PathLike, opcional
+            Diretório base para os arquivos memmap compartilhados.
+        precision : {'float64', 'float32'}
+            Precisão das matrizes compartilhadas e do treino dos candidatos
+            (float32 reduz pela metade o memmap e a banda).
+
+        Raises
+        ----
+        ValueError
+            Se não houver candidatos ou max_workers/blas_threads/precision
+            forem inválidos.
+        TypeError
+            Se algum candidato não implementar fit e predict.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers deve ser >= 1.")
+        if blas_threads is not None and blas_threads < 1:
+            raise ValueError("blas_threads deve ser >= 1.")
+        self.float_dtype = resolve_precision(precision)
+
+        self.candidates: List[Tuple[str, Dict[str, Any], Any]] = self._expand(candidates)
+        if not self.candidates:
+            raise ValueError("Nenhum candidato informado para o sweep.")
+
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.blas_threads: Optional[int] = blas_threads
+        self.temp_dir: Optional[str] = os.fspath(temp_dir) if temp_dir is not None else None
+        self.precision: str = precision
+        self.results: List[Dict[str, Any]] = []
+        self.best_trainer: Optional[ModelTrainer] = None
+
+    @staticmethod
+    def _expand(candidates: Sequence[Candidate]) -> List[Tuple[str, Dict[str, Any], Any]]:
+        expanded = []
+        for candidate in candidates:
+            estimator, grid = candidate if isinstance(candidate, tuple) else (candidate, {})
+            if not hasattr(estimator, "fit") or not hasattr(estimator, "predict"):
+                raise TypeError("Todo candidato deve possuir os métodos 'fit' e 'predict'.")
+            for params in ParameterGrid(grid):
+                model = clone(estimator).set_params(**params)
+                expanded.append((type(estimator).__name__, params, model))
+        return expanded
+
+    def run(
+        self,
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_test: pd.DataFrame,
+        y_test: pd.Series,
+    ) -> List[Dict[str, Any]]:
+        """
+        Treina e avalia todos os candidatos.
+
+        Returns
+        ----
+        list[dict]
+            Resultados ordenados do melhor para o pior, com name, params,
+            score, fit_seconds e rank. O melhor modelo fica em `best_trainer`.
+        """
+        for name, value, expected in (
+            ("X_train", X_train, pd.DataFrame),
+            ("y_train", y_train, pd.Series),
+            ("X_test", X_test, pd.DataFrame),
+            ("y_test", y_test, pd.Series),
+        ):
+            if not isinstance(value, expected):
+                raise TypeError(f"{name} deve ser um pandas {expected.__name__}.")
+        if X_train.empty or y_train.empty or X_test.empty or y_test.empty:
+            raise ValueError("Dados de treino e teste não podem estar vazios.")
+
+        shared_dir = tempfile.mkdtemp(prefix="model_sweep-", dir=self.temp_dir)
+        try:
+            # Escrito uma única vez; cada worker abre o mesmo arquivo com mmap_mode='r'
+            data_path = os.path.join(shared_dir, "data.joblib")
+            joblib.dump(
+                {
+                    "X_train": pack_frame(X_train, self.float_dtype),
+                    "y_train": pack_series(y_train),
+                    "X_test": pack_frame(X_test, self.float_dtype),
+                    "y_test": pack_series(y_test),
+                },
+                data_path,
+            )
+            outcomes = self._execute(data_path)
+        finally:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+        results = []
+        fitted_models = {}
+        for position, model, score, fit_seconds in outcomes:
+            name, params, _ = self.candidates[position]
+            fitted_models[position] = model
+            results.append(
+                {
+                    "position": position,
+                    "name": name,
+                    "params": params,
+                    "score": float(score),
+                    "fit_seconds": fit_seconds,
+                }
+            )
+
+        # Ordenação estável: empates mantêm a ordem de declaração
+        results.sort(key=lambda r: (-r["score"], r["position"]))
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+
+        self.best_trainer = ModelTrainer.from_trained_model(
+            fitted_models[results[0]["position"]], precision=self.precision
+        )
+        self.results = results
+        return results
+
+    def _execute(self, data_path: str) -> List[Tuple[int, Any, float, float]]:
+        jobs = [(position, model) for position, (_, _, model) in enumerate(self.candidates)]
+        workers = min(self.max_workers, len(jobs))
+
+        if workers == 1:
+            global _WORKER_DATA
+            previous = _WORKER_DATA
+            try:
+                _WORKER_DATA = _load_shared_data(data_path)
+                _WORKER_DATA["precision"] = self.precision
+                limits = threadpool_limits(limits=self.blas_threads) if self.blas_threads else None
+                try:
+                    return [_fit_candidate(position, model) for position, model in jobs]
+                finally:
+                    if limits is not None:
+                        limits.restore_original_limits()
+            finally:
+                _WORKER_DATA = previous
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(data_path, self.blas_threads, self.precision),
+        ) as executor:
+            futures = [executor.submit(_fit_candidate, position, model) for position, model in jobs]
+            return [future.result() for future in futures]
@@ -3,10 +3,14 @@ model_trainer.py
 
 Este módulo define a classe ModelTrainer, responsável por:
 - Receber um modelo do scikit-learn
-- Treinar o modelo
-- Avaliar o desempenho utilizando acurácia
-- Persistir o modelo treinado em disco
-- Carregar modelos previamente salvos
+- Treinar o modelo (em memória ou incrementalmente, via partial_fit)
+- Avaliar o desempenho utilizando acurácia (ou, em evaluate_detailed /
+  evaluate_chunks, precision/recall/F1, matriz de confusão, ROC-AUC e
+  intervalos de confiança por bootstrap a partir de uma única predição)
+- Persistir o modelo treinado em disco (escrita atômica, compressão
+  configurável e metadados legíveis sem desserializar o modelo)
+- Carregar modelos previamente salvos (com cache LRU em processo
+  e carregamento via memory mapping)
 
 O objetivo é encapsular o ciclo de vida básico de modelos de ML
 de forma segura, tipada e bem documentada.
@@ -14,12 +18,186 @@ de forma segura, tipada e bem documentada.
 
 from __future__ import annotations
 
+import json
 import os
-from typing import Any, Protocol, Union
+import platform
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, Union
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score
+import scipy.sparse as sp
+import sklearn
+from sklearn.base import is_classifier
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from src.utils.fitted_preprocessor import FittedPreprocessor
+from src.utils.instrumentation import instrumented
+from src.utils.metrics import (
+    DEFAULT_SCORE_BINS,
+    bootstrap_binary_auc,
+    bootstrap_confusions,
+    confidence_interval,
+    confusion_from_codes,
+    encode_labels,
+    macro_auc_from_histograms,
+    score_histograms,
+    scores_from_confusion,
+)
+from src.utils.precision import resolve_precision
+from src.utils.schema import DataSchema
+from src.utils.serialization import (
+    atomic_joblib_dump,
+    atomic_write_json,
+    compression_arg,
+    file_sha256,
+)
+
+PREPROCESSOR_SUFFIX = ".preprocessor.joblib"
+METADATA_SUFFIX = ".meta.json"
+SCHEMA_SUFFIX = ".schema.json"
+
+# Opções medidas por compare_compression (lz4 é incluído só se instalado)
+DEFAULT_COMPRESSION_OPTIONS: Tuple[Tuple[Optional[str], int], ...] = (
+    (None, 0),
+    ("lz4", 3),
+    ("zlib", 1),
+    ("zlib", 3),
+    ("zlib", 9),
+)
+
+
+def to_estimator_input(X: pd.DataFrame, dtype: Optional[Any] = None) -> Any:
+    """
+    Converte X para o formato entregue ao estimador.
+
+    DataFrames com colunas esparsas (ex.: saída de encode_categorical(sparse=True))
+    viram uma matriz CSR na mesma ordem de colunas, em vez de serem
+    densificados pelo scikit-learn. Frames densos são repassados sem alteração,
+    exceto pelo cast das colunas float para `dtype` (ex.: np.float32), se
+    informado; colunas inteiras, booleanas ou não numéricas (ex.: strings
+    tratadas por um Pipeline do sklearn) nunca são convertidas.
+    """
+    sparse_mask = np.array([isinstance(col_dtype, pd.SparseDtype) for col_dtype in X.dtypes])
+    if not sparse_mask.any():
+        if dtype is None:
+            return X
+        # Cast só das colunas float que diferem (float64 -> float32); as demais não são copiadas
+        differing = {
+            col: dtype
+            for col, col_dtype in X.dtypes.items()
+            if pd.api.types.is_float_dtype(col_dtype) and col_dtype != dtype
+        }
+        return X.astype(differing) if differing else X
+
+    sparse_idx = np.flatnonzero(sparse_mask)
+    dense_idx = np.flatnonzero(~sparse_mask)
+    sparse_part = X.iloc[:, sparse_idx]
+    if any(dtype.fill_value != 0 for dtype in sparse_part.dtypes):
+        # to_coo exige fill_value 0 (ex.: SparseArray de float usa NaN por padrão);
+        # astype(SparseDtype) preserva o fill_value, então recria as colunas afetadas
+        sparse_part = pd.DataFrame(
+            {
+                col: (
+                    values
+                    if values.dtype.fill_value == 0
+                    else pd.arrays.SparseArray(values.sparse.to_dense(), fill_value=0.0)
+                )
+                for col, values in sparse_part.items()
+            },
+            index=sparse_part.index,
+        )
+    matrix_dtype = dtype or np.float64
+    blocks = [sparse_part.sparse.to_coo().tocsr().astype(matrix_dtype, copy=False)]
+    if len(dense_idx):
+        dense_block = X.iloc[:, dense_idx].to_numpy(dtype=matrix_dtype)
+        blocks.insert(0, sp.csr_matrix(dense_block))
+
+    stacked = sp.hstack(blocks, format="csr", dtype=matrix_dtype)
+    # Restaura a ordem original das colunas
+    order = np.argsort(np.concatenate([dense_idx, sparse_idx]))
+    return stacked[:, order]
+
+
+class ModelCache:
+    """
+    Cache LRU em processo para modelos carregados do disco.
+
+    A chave é (path absoluto, mtime, tamanho, mmap_mode): se o arquivo for
+    sobrescrito, a entrada antiga deixa de ser usada e é descartada.
+    O orçamento é limitado por número de entradas e, opcionalmente, pelo
+    total de bytes (tamanho dos arquivos em disco).
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: Optional[int] = None) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries deve ser >= 0.")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes deve ser >= 0.")
+        self.max_entries: int = max_entries
+        self.max_bytes: Optional[int] = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, int]]" = OrderedDict()
+        self._bytes: int = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[Any, ...], model: Any, nbytes: int) -> None:
+        with self._lock:
+            # Versões antigas do mesmo arquivo (mtime/tamanho diferentes) saem do cache;
+            # as outras variantes de mmap_mode do arquivo atual continuam válidas
+            for stale in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+                self._remove(stale)
+            if key in self._entries:
+                self._remove(key)
+            if self.max_entries == 0 or (self.max_bytes is not None and nbytes > self.max_bytes):
+                return
+            self._entries[key] = (model, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Tuple[Any, ...]) -> None:
+        _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
 
 
 class SklearnModelProtocol(Protocol):
@@ -42,7 +220,9 @@ class ModelTrainer:
     modelos de machine learning do scikit-learn.
     """
 
-    def __init__(self, model: SklearnModelProtocol) -> None:
+    _model_cache: ModelCache = ModelCache()
+
+    def __init__(self, model: SklearnModelProtocol, precision: str = "float64") -> None:
         """
         Inicializa o ModelTrainer com um modelo sklearn.
 
@@ -50,18 +230,73 @@ class ModelTrainer:
         ----
         model : SklearnModelProtocol
             Instância de um modelo do scikit-learn (ex: LogisticRegression).
+        precision : {'float64', 'float32'}
+            Tipo das features entregues ao fit/predict. 'float32' reduz pela
+            metade a memória e a banda (alguns solvers, como o lbfgs da
+            LogisticRegression, ainda convertem internamente para float64).
 
         Raises
         ----
         TypeError
             Se o modelo não implementar os métodos fit e predict.
+        ValueError
+            Se a precisão for inválida.
         """
         if not hasattr(model, "fit") or not hasattr(model, "predict"):
             raise TypeError("O modelo fornecido deve possuir os métodos 'fit' e 'predict'.")
 
+        self.precision: str = precision
+        self.float_dtype = resolve_precision(precision)
         self.model: SklearnModelProtocol = model
+        self.training_stats: Dict[str, float] = {}
+        self.training_metadata: Dict[str, Any] = {}
         self._is_trained: bool = False
 
+    @classmethod
+    def from_trained_model(cls, model: SklearnModelProtocol, precision: str = "float64") -> "ModelTrainer":
+        """
+        Cria um ModelTrainer a partir de um modelo já treinado
+        (ex.: treinado em outro processo), pronto para evaluate/save_model.
+
+        Parameters
+        ----
+        model : SklearnModelProtocol
+            Modelo sklearn já ajustado.
+        precision : {'float64', 'float32'}
+            Precisão usada no treino (aplicada também na avaliação).
+
+        Returns
+        ----
+        ModelTrainer
+            Instância marcada como treinada.
+        """
+        trainer = cls(model, precision=precision)
+        feature_names = getattr(model, "feature_names_in_", None)
+        trainer.training_metadata = {
+            "feature_names": [str(c) for c in feature_names] if feature_names is not None else None,
+            "feature_dtypes": None,
+            "n_rows": None,
+            "trained_at": None,
+            "precision": precision,
+        }
+        trainer._is_trained = True
+        return trainer
+
+    def _record_training(self, X: pd.DataFrame, n_rows: int) -> None:
+        self.training_metadata = {
+            "feature_names": [str(c) for c in X.columns],
+            "feature_dtypes": {str(c): str(dtype) for c, dtype in X.dtypes.items()},
+            "n_rows": int(n_rows),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "precision": self.precision,
+        }
+
+    def _estimator_input(self, X: pd.DataFrame) -> Any:
+        # float64 é o padrão do sklearn: nenhum cast (nem cópia) é necessário
+        dtype = None if self.float_dtype is np.float64 else self.float_dtype
+        return to_estimator_input(X, dtype=dtype)
+
+    @instrumented
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
         """
         Treina o modelo com os dados fornecidos.
@@ -87,9 +322,89 @@ class ModelTrainer:
         if X.empty or y.empty:
             raise ValueError("X e y não podem estar vazios.")
 
-        self.model.fit(X, y)
+        self.model.fit(self._estimator_input(X), y)
+        self._record_training(X, len(X))
+        self._is_trained = True
+
+    @instrumented
+    def train_incremental(
+        self,
+        batches: Iterable[Tuple[pd.DataFrame, pd.Series]],
+        classes: Optional[Sequence[Any]] = None,
+    ) -> Dict[str, float]:
+        """
+        Treina o modelo incrementalmente com partial_fit, lote a lote.
+
+        Permite treinar em dados que não cabem em memória (ex.: chunks de
+        load_data(chunksize=...)), com custo de memória limitado ao lote.
+
+        Parameters
+        ----
+        batches : Iterable[tuple[pd.DataFrame, pd.Series]]
+            Iterador de lotes (X_chunk, y_chunk).
+        classes : Sequence, opcional
+            Todas as classes possíveis do target. Obrigatório para
+            classificadores, pois o primeiro lote pode não conter todas.
+
+        Returns
+        ----
+        dict
+            Estatísticas do treino: rows, batches, seconds e rows_per_second
+            (também disponíveis em `training_stats`).
+
+        Raises
+        ----
+        TypeError
+            Se o modelo não implementar partial_fit ou se algum lote tiver
+            tipos inválidos.
+        ValueError
+            Se classes não for informado para um classificador, se algum
+            lote estiver vazio ou se não houver nenhum lote.
+        """
+        if not hasattr(self.model, "partial_fit"):
+            raise TypeError("O modelo fornecido não possui o método 'partial_fit'.")
+        if classes is None and is_classifier(self.model):
+            raise ValueError("classes deve ser informado para treinar classificadores incrementalmente.")
+
+        rows = 0
+        n_batches = 0
+        first_batch: Optional[pd.DataFrame] = None
+        start = time.perf_counter()
+
+        for X_chunk, y_chunk in batches:
+            if not isinstance(X_chunk, pd.DataFrame):
+                raise TypeError("X deve ser um pandas DataFrame.")
+            if not isinstance(y_chunk, pd.Series):
+                raise TypeError("y deve ser um pandas Series.")
+            if X_chunk.empty or y_chunk.empty:
+                raise ValueError("X e y não podem estar vazios.")
+
+            fit_kwargs: Dict[str, Any] = {}
+            if n_batches == 0:
+                first_batch = X_chunk.iloc[:0]
+            if n_batches == 0 and classes is not None:
+                # classes só é necessário (e verificado) na primeira chamada
+                fit_kwargs["classes"] = np.asarray(classes)
+            self.model.partial_fit(self._estimator_input(X_chunk), y_chunk, **fit_kwargs)
+
+            rows += len(X_chunk)
+            n_batches += 1
+
+        if n_batches == 0:
+            raise ValueError("batches não pode estar vazio.")
+
+        seconds = time.perf_counter() - start
+        self.training_stats = {
+            "rows": rows,
+            "batches": n_batches,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+        }
+        self._record_training(first_batch, rows)
         self._is_trained = True
+        return self.training_stats
 
+    @instrumented
     def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> float:
         """
         Avalia o modelo treinado utilizando acurácia.
@@ -115,6 +430,13 @@ class ModelTrainer:
         ValueError
             Se os dados de teste estiverem vazios.
         """
+        self._validate_test_data(X_test, y_test)
+
+        predictions = self.model.predict(self._estimator_input(X_test))
+        accuracy: float = accuracy_score(y_test, predictions)
+        return accuracy
+
+    def _validate_test_data(self, X_test: pd.DataFrame, y_test: pd.Series) -> None:
         if not self._is_trained:
             raise RuntimeError("O modelo ainda não foi treinado. Execute o método train() primeiro.")
 
@@ -125,27 +447,262 @@ class ModelTrainer:
         if X_test.empty or y_test.empty:
             raise ValueError("X_test e y_test não podem estar vazios.")
 
-        predictions = self.model.predict(X_test)
-        accuracy: float = accuracy_score(y_test, predictions)
-        return accuracy
+    def _model_classes(self, *label_arrays: Any) -> np.ndarray:
+        classes = getattr(self.model, "classes_", None)
+        if classes is not None:
+            return np.asarray(classes)
+        return np.unique(np.concatenate([np.asarray(values) for values in label_arrays]))
+
+    @staticmethod
+    def _detailed_report(
+        classes: np.ndarray,
+        confusion: np.ndarray,
+        roc_auc: Optional[float],
+        histograms: Optional[np.ndarray],
+        n_bootstrap: int,
+        confidence: float,
+        random_state: Optional[int],
+    ) -> Dict[str, Any]:
+        scores = scores_from_confusion(confusion)
+        support = confusion.sum(axis=1)
+        report: Dict[str, Any] = {
+            "n_samples": int(confusion.sum()),
+            "labels": classes.tolist(),
+            "average": "binary" if len(classes) == 2 else "macro",
+            "accuracy": float(scores["accuracy"]),
+            "precision": float(scores["precision"]),
+            "recall": float(scores["recall"]),
+            "f1": float(scores["f1"]),
+            "roc_auc": roc_auc,
+            "confusion_matrix": confusion.tolist(),
+            "per_class": {
+                str(label): {
+                    "precision": float(scores["per_class_precision"][i]),
+                    "recall": float(scores["per_class_recall"][i]),
+                    "f1": float(scores["per_class_f1"][i]),
+                    "support": int(support[i]),
+                }
+                for i, label in enumerate(classes.tolist())
+            },
+        }
+
+        if n_bootstrap > 0:
+            # Réplicas sobre as contagens já calculadas: nenhum predict extra
+            replicas = scores_from_confusion(bootstrap_confusions(confusion, n_bootstrap, random_state))
+            intervals = {
+                name: confidence_interval(replicas[name], confidence)
+                for name in ("accuracy", "precision", "recall", "f1")
+            }
+            if histograms is not None and len(classes) == 2:
+                auc_replicas = bootstrap_binary_auc(histograms[1], n_bootstrap, random_state)
+                auc_replicas = auc_replicas[~np.isnan(auc_replicas)]
+                if auc_replicas.size:
+                    intervals["roc_auc"] = confidence_interval(auc_replicas, confidence)
+            report["confidence_intervals"] = intervals
+            report["confidence"] = confidence
+            report["n_bootstrap"] = n_bootstrap
+        return report
+
+    @instrumented
+    def evaluate_detailed(
+        self,
+        X_test: pd.DataFrame,
+        y_test: pd.Series,
+        n_bootstrap: int = 0,
+        confidence: float = 0.95,
+        random_state: Optional[int] = 42,
+    ) -> Dict[str, Any]:
+        """
+        Avaliação completa com uma única passada de predict (e de
+        predict_proba, se o modelo tiver): acurácia, precision/recall/F1
+        (classe positiva no caso binário, média macro no multiclasse),
+        matriz de confusão, ROC-AUC e métricas por classe.
+
+        Parameters
+        ----
+        X_test : pd.DataFrame
+            Features de teste.
+        y_test : pd.Series
+            Target de teste.
+        n_bootstrap : int
+            Número de réplicas de bootstrap para os intervalos de confiança
+            (0 desliga). As réplicas reamostram a matriz de confusão já
+            calculada, sem repetir o predict.
+        confidence : float
+            Nível do intervalo percentil (ex.: 0.95).
+        random_state : int, opcional
+            Semente do bootstrap.
+
+        Returns
+        ----
+        dict
+            Métricas; com n_bootstrap > 0 inclui 'confidence_intervals'.
+
+        Raises
+        ----
+        RuntimeError
+            Se o modelo ainda não foi treinado.
+        TypeError
+            Se X_test ou y_test não forem do tipo esperado.
+        ValueError
+            Se os dados de teste estiverem vazios ou n_bootstrap < 0.
+        """
+        self._validate_test_data(X_test, y_test)
+        if n_bootstrap < 0:
+            raise ValueError("n_bootstrap deve ser >= 0.")
+
+        features = self._estimator_input(X_test)
+        predictions = self.model.predict(features)
+        probabilities = self.model.predict_proba(features) if hasattr(self.model, "predict_proba") else None
+
+        classes = self._model_classes(y_test, predictions)
+        true_codes = encode_labels(y_test, classes)
+        confusion = confusion_from_codes(true_codes, encode_labels(predictions, classes), len(classes))
+
+        roc_auc = None
+        histograms = None
+        if probabilities is not None and probabilities.shape[1] == len(classes):
+            try:
+                if len(classes) == 2:
+                    roc_auc = float(roc_auc_score(true_codes, probabilities[:, 1]))
+                else:
+                    roc_auc = float(
+                        roc_auc_score(true_codes, probabilities, multi_class="ovr", labels=np.arange(len(classes)))
+                    )
+            except ValueError:  # só uma classe presente em y_test
+                roc_auc = None
+            if n_bootstrap > 0:
+                histograms = score_histograms(true_codes, probabilities)
+
+        return self._detailed_report(classes, confusion, roc_auc, histograms, n_bootstrap, confidence, random_state)
+
+    @instrumented
+    def evaluate_chunks(
+        self,
+        chunks: Iterable[Tuple[pd.DataFrame, pd.Series]],
+        n_bins: int = DEFAULT_SCORE_BINS,
+        n_bootstrap: int = 0,
+        confidence: float = 0.95,
+        random_state: Optional[int] = 42,
+    ) -> Dict[str, Any]:
+        """
+        Mesmas métricas de evaluate_detailed sobre um conjunto de teste em
+        chunks (ex.: iter_data_chunks + transform), com memória constante:
+        acumula apenas a matriz de confusão e histogramas de score.
+
+        Parameters
+        ----
+        chunks : Iterable[tuple[pd.DataFrame, pd.Series]]
+            Pares (X_chunk, y_chunk).
+        n_bins : int
+            Bins dos histogramas de score; a ROC-AUC é aproximada
+            (erro da ordem de 1/n_bins).
+        n_bootstrap, confidence, random_state :
+            Como em evaluate_detailed.
+
+        Returns
+        ----
+        dict
+            Métricas + 'chunks' e 'roc_auc_approximate'=True.
 
-    def save_model(self, path: Union[str, os.PathLike]) -> None:
+        Raises
+        ----
+        RuntimeError
+            Se o modelo não foi treinado ou não expõe classes_.
+        ValueError
+            Se não houver chunks ou um rótulo for desconhecido.
+        """
+        if not self._is_trained:
+            raise RuntimeError("O modelo ainda não foi treinado. Execute o método train() primeiro.")
+        classes = getattr(self.model, "classes_", None)
+        if classes is None:
+            raise RuntimeError("evaluate_chunks requer um classificador com o atributo 'classes_'.")
+        if n_bins < 2:
+            raise ValueError("n_bins deve ser >= 2.")
+        if n_bootstrap < 0:
+            raise ValueError("n_bootstrap deve ser >= 0.")
+
+        classes = np.asarray(classes)
+        n_classes = len(classes)
+        has_proba = hasattr(self.model, "predict_proba")
+        confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        histograms = np.zeros((n_classes, 2, n_bins), dtype=np.int64) if has_proba else None
+        n_chunks = 0
+
+        for X_chunk, y_chunk in chunks:
+            self._validate_test_data(X_chunk, y_chunk)
+            features = self._estimator_input(X_chunk)
+            true_codes = encode_labels(y_chunk, classes)
+            confusion += confusion_from_codes(true_codes, encode_labels(self.model.predict(features), classes), n_classes)
+            if histograms is not None:
+                histograms += score_histograms(true_codes, self.model.predict_proba(features), n_bins)
+            n_chunks += 1
+
+        if n_chunks == 0:
+            raise ValueError("chunks não pode estar vazio.")
+
+        roc_auc = macro_auc_from_histograms(histograms) if histograms is not None else None
+        report = self._detailed_report(classes, confusion, roc_auc, histograms, n_bootstrap, confidence, random_state)
+        report["chunks"] = n_chunks
+        report["roc_auc_approximate"] = True
+        return report
+
+    @instrumented
+    def save_model(
+        self,
+        path: Union[str, os.PathLike],
+        preprocessor: Optional[FittedPreprocessor] = None,
+        compression: Optional[str] = None,
+        compression_level: int = 3,
+        schema: Optional[DataSchema] = None,
+    ) -> Dict[str, Any]:
         """
         Salva o modelo treinado em disco usando joblib.
 
+        A escrita é atômica (arquivo temporário + rename): leitores nunca
+        veem um modelo pela metade. Um sidecar JSON (ver metadata_path) é
+        gravado com nomes/dtypes das features, versão do sklearn, data do
+        treino e checksum, legível sem desserializar o modelo.
+
+        Trade-off de compressão (ver compare_compression para medir no seu modelo):
+        - None: maior arquivo, load mais rápido, único que aceita mmap_mode
+        - 'lz4': arquivo menor com load quase tão rápido quanto None (requer lz4)
+        - 'zlib' 1-9: menor arquivo conforme o nível, load e save mais lentos
+
         Parameters
         ----
         path : str | os.PathLike
             Caminho onde o modelo será salvo.
+        preprocessor : FittedPreprocessor, opcional
+            Estado de pré-processamento ajustado. Quando informado, é salvo
+            ao lado do modelo (ver preprocessor_path) para que a inferência
+            reaplique o mesmo transform sem reajustar nada. Quando omitido,
+            um sidecar de um save anterior no mesmo caminho é removido.
+        compression : {None, 'zlib', 'lz4'}
+            Método de compressão do joblib. Padrão: sem compressão.
+        compression_level : int
+            Nível de compressão (1-9), ignorado quando compression=None.
+        schema : DataSchema, opcional
+            Schema das linhas brutas de entrada, salvo em JSON ao lado do
+            modelo (ver schema_path) e aplicado a cada lote no scoring.
+            Quando omitido, um schema antigo no mesmo caminho é removido.
+
+        Returns
+        ----
+        dict
+            Metadados gravados no sidecar.
 
         Raises
         ----
         RuntimeError
             Se o modelo ainda não foi treinado.
         TypeError
-            Se o caminho não for str/path-like.
+            Se o caminho não for str/path-like, o preprocessor não for
+            um FittedPreprocessor ou o schema não for um DataSchema.
         ValueError
-            Se o caminho for vazio ou inválido.
+            Se o caminho for vazio ou inválido, ou a compressão for inválida.
+        ImportError
+            Se compression='lz4' e o pacote lz4 não estiver instalado.
         """
         if not self._is_trained:
             raise RuntimeError("O modelo ainda não foi treinado e não pode ser salvo.")
@@ -158,21 +715,245 @@ class ModelTrainer:
         if not path_str:
             raise ValueError("O path não pode ser vazio.")
 
-        directory = os.path.dirname(path_str)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+        if preprocessor is not None and not isinstance(preprocessor, FittedPreprocessor):
+            raise TypeError("preprocessor deve ser um FittedPreprocessor.")
+        if schema is not None and not isinstance(schema, DataSchema):
+            raise TypeError("schema deve ser um DataSchema.")
+
+        compress = compression_arg(compression, compression_level)
+
+        # atomic_joblib_dump cria os diretórios necessários
+        atomic_joblib_dump(self.model, path_str, compress=compress)
+        # Sidecars de um save anterior não podem sobreviver a um modelo salvo sem eles
+        for sidecar, sidecar_path in (
+            (preprocessor, self.preprocessor_path(path_str)),
+            (schema, self.schema_path(path_str)),
+        ):
+            if sidecar is not None:
+                sidecar.save(sidecar_path)
+            else:
+                try:
+                    os.remove(sidecar_path)
+                except FileNotFoundError:
+                    pass
+
+        metadata = {
+            **self.training_metadata,
+            "model_class": f"{type(self.model).__module__}.{type(self.model).__name__}",
+            "sklearn_version": sklearn.__version__,
+            "python_version": platform.python_version(),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "compression": compression,
+            "compression_level": compression_level if compression is not None else None,
+            "file_size": os.path.getsize(path_str),
+            "sha256": file_sha256(path_str),
+            "has_preprocessor": preprocessor is not None,
+            "has_schema": schema is not None,
+        }
+        atomic_write_json(metadata, self.metadata_path(path_str))
+        return metadata
+
+    @staticmethod
+    def metadata_path(path: Union[str, os.PathLike]) -> str:
+        """
+        Caminho do sidecar de metadados do modelo.
 
-        joblib.dump(self.model, path_str)
+        Ex.: models/model.joblib -> models/model.meta.json
+        """
+        root, _ = os.path.splitext(os.fspath(path))
+        return root + METADATA_SUFFIX
+
+    @classmethod
+    @instrumented
+    def read_metadata(cls, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """
+        Lê os metadados de um modelo salvo, sem desserializar o modelo.
+
+        Parameters
+        ----
+        path : str | os.PathLike
+            Caminho do arquivo do modelo.
+
+        Returns
+        ----
+        dict
+            Metadados gravados por save_model.
+
+        Raises
+        ----
+        FileNotFoundError
+            Se o sidecar de metadados não existir.
+        """
+        meta_path = cls.metadata_path(path)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Metadados do modelo não encontrados: {meta_path}")
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    @instrumented
+    def compare_compression(
+        self,
+        directory: Union[str, os.PathLike],
+        options: Sequence[Tuple[Optional[str], int]] = DEFAULT_COMPRESSION_OPTIONS,
+        repeats: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mede o trade-off tamanho x tempo de save/load para este modelo.
+
+        Parameters
+        ----
+        directory : str | os.PathLike
+            Diretório onde os arquivos de teste são gravados.
+        options : Sequence[tuple]
+            Pares (compression, compression_level). Opções cujo pacote não
+            está instalado (ex.: lz4) são ignoradas.
+        repeats : int
+            Repetições do load; é reportado o melhor tempo.
+
+        Returns
+        ----
+        list[dict]
+            Uma linha por opção: compression, level, size_bytes,
+            save_seconds e load_seconds.
+        """
+        if not self._is_trained:
+            raise RuntimeError("O modelo ainda não foi treinado e não pode ser salvo.")
+
+        table = []
+        for compression, level in options:
+            try:
+                compress = compression_arg(compression, level)
+            except ImportError:
+                continue
+            suffix = f"{compression or 'none'}_{level}"
+            path = os.path.join(os.fspath(directory), f"compression_{suffix}.joblib")
+
+            start = time.perf_counter()
+            atomic_joblib_dump(self.model, path, compress=compress)
+            save_seconds = time.perf_counter() - start
+
+            load_seconds = float("inf")
+            for _ in range(max(repeats, 1)):
+                start = time.perf_counter()
+                joblib.load(path)
+                load_seconds = min(load_seconds, time.perf_counter() - start)
+
+            table.append(
+                {
+                    "compression": compression,
+                    "level": level if compression else None,
+                    "size_bytes": os.path.getsize(path),
+                    "save_seconds": save_seconds,
+                    "load_seconds": load_seconds,
+                }
+            )
+        return table
+
+    @staticmethod
+    def preprocessor_path(path: Union[str, os.PathLike]) -> str:
+        """
+        Caminho do pré-processador salvo junto ao modelo.
+
+        Ex.: models/model.joblib -> models/model.preprocessor.joblib
+        """
+        root, _ = os.path.splitext(os.fspath(path))
+        return root + PREPROCESSOR_SUFFIX
 
     @classmethod
-    def load_model(cls, path: Union[str, os.PathLike]) -> Any:
+    @instrumented
+    def load_preprocessor(cls, path: Union[str, os.PathLike]) -> FittedPreprocessor:
+        """
+        Carrega o FittedPreprocessor salvo ao lado do modelo em `path`.
+
+        Parameters
+        ----
+        path : str | os.PathLike
+            Caminho do arquivo do modelo (não do pré-processador).
+
+        Returns
+        ----
+        FittedPreprocessor
+            Estado de pré-processamento pronto para transform().
+
+        Raises
+        ----
+        FileNotFoundError
+            Se não houver pré-processador salvo para o modelo.
+        """
+        return FittedPreprocessor.load(cls.preprocessor_path(path))
+
+    @staticmethod
+    def schema_path(path: Union[str, os.PathLike]) -> str:
+        """
+        Caminho do schema de entrada salvo junto ao modelo.
+
+        Ex.: models/model.joblib -> models/model.schema.json
+        """
+        root, _ = os.path.splitext(os.fspath(path))
+        return root + SCHEMA_SUFFIX
+
+    @classmethod
+    def saved_sidecars(cls, path: Union[str, os.PathLike]) -> Dict[str, bool]:
+        """
+        Indica quais sidecars pertencem ao modelo salvo em `path`.
+
+        Usa has_preprocessor/has_schema dos metadados (um arquivo que sobrou
+        de um save anterior não conta); sem metadados, como em modelos
+        antigos, considera apenas a existência dos arquivos.
+
+        Returns
+        ----
+        dict
+            {'preprocessor': bool, 'schema': bool}
+        """
+        try:
+            metadata = cls.read_metadata(path)
+        except FileNotFoundError:
+            metadata = {}
+        return {
+            "preprocessor": bool(
+                metadata.get("has_preprocessor", os.path.exists(cls.preprocessor_path(path)))
+            ),
+            "schema": bool(metadata.get("has_schema", os.path.exists(cls.schema_path(path)))),
+        }
+
+    @classmethod
+    def load_schema(cls, path: Union[str, os.PathLike]) -> DataSchema:
+        """
+        Carrega o DataSchema salvo ao lado do modelo em `path`.
+
+        Raises
+        ----
+        FileNotFoundError
+            Se não houver schema salvo para o modelo.
+        """
+        return DataSchema.load(cls.schema_path(path))
+
+    @classmethod
+    @instrumented
+    def load_model(
+        cls,
+        path: Union[str, os.PathLike],
+        mmap_mode: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Any:
         """
         Carrega um modelo previamente salvo em disco.
 
+        Cargas repetidas do mesmo arquivo (mesmo mtime/tamanho) são servidas
+        pelo cache LRU em processo, sem nova desserialização. Atenção: com
+        cache, chamadas repetidas devolvem o mesmo objeto.
+
         Parameters
         ----
         path : str | os.PathLike
             Caminho do arquivo do modelo.
+        mmap_mode : {'r', 'c', 'r+'} | None
+            Repassado para joblib.load: os arrays do modelo são mapeados em
+            memória e vários processos compartilham a mesma cópia do page
+            cache. Só tem efeito em arquivos salvos sem compressão.
+        use_cache : bool
+            Usa (e alimenta) o cache LRU. Padrão: True.
 
         Returns
         ----
@@ -188,4 +969,37 @@ class ModelTrainer:
         if not os.path.exists(path_str):
             raise FileNotFoundError(f"Arquivo de modelo não encontrado: {path_str}")
 
-        return joblib.load(path_str)
\ No newline at end of file
+        if not use_cache:
+            return joblib.load(path_str, mmap_mode=mmap_mode)
+
+        stat = os.stat(path_str)
+        key = (os.path.abspath(path_str), stat.st_mtime_ns, stat.st_size, mmap_mode)
+        model = cls._model_cache.get(key)
+        if model is None:
+            model = joblib.load(path_str, mmap_mode=mmap_mode)
+            cls._model_cache.put(key, model, stat.st_size)
+        return model
+
+    @classmethod
+    def configure_cache(cls, max_entries: int = 8, max_bytes: Optional[int] = None) -> None:
+        """
+        Redefine o orçamento do cache de modelos (descarta o cache atual).
+
+        Parameters
+        ----
+        max_entries : int
+            Número máximo de modelos em cache (0 desativa o cache).
+        max_bytes : int, opcional
+            Soma máxima dos tamanhos dos arquivos em cache.
+        """
+        cls._model_cache = ModelCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    @classmethod
+    def cache_info(cls) -> Dict[str, Any]:
+        """Contadores de hits/misses/evictions e ocupação do cache de modelos."""
+        return cls._model_cache.info()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Esvazia o cache de modelos e zera os contadores."""
+        cls._model_cache.clear()
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""
+pipeline_runner.py
+
+Este módulo define a classe PipelineRunner, que executa o pipeline
+load -> handle_missing_values -> normalize_features -> encode_categorical
+-> split -> train com memoização por etapa:
+
+- a chave de cada etapa é o hash de (nome, parâmetros, chave da etapa
+  anterior); a chave do load usa o hash do conteúdo do CSV. Mudar um
+  parâmetro invalida apenas a etapa e as seguintes
+- as saídas ficam em disco em StageCache: DataFrames no formato colunar
+  de data_cache (um .npy por coluna, recarregados via memmap) e modelos
+  via joblib (escrita atômica)
+- na execução, o runner procura a última etapa com saída em cache,
+  carrega só ela e executa o restante. Trocar apenas o estimador
+  carrega o split do cache e vai direto para o treino
+- o cache tem limite de tamanho (max_bytes), com remoção das entradas
+  menos usadas recentemente
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from data_preprocessing import load_data
+from src.model_trainer import ModelTrainer
+from src.utils.data_cache import file_content_hash, load_frame, read_frame_meta, save_frame
+from src.utils.data_processor import DataProcessor
+from src.utils.data_splitter import DataSplitter
+from src.utils.serialization import atomic_joblib_dump, atomic_write_json
+
+STAGES = ("load", "handle_missing_values", "normalize_features", "encode_categorical", "split", "train")
+ENTRY_META = "entry.json"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def stage_key(stage: str, params: Dict[str, Any], upstream: Optional[str]) -> str:
+    """Hash de (etapa, parâmetros, chave da etapa anterior)."""
+    payload = json.dumps({"stage": stage, "params": params, "upstream": upstream}, sort_keys=True, default=repr)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class StageCache:
+    """
+    Cache em disco das saídas das etapas, com remoção LRU por tamanho.
+    Cada entrada é um diretório <cache_dir>/<chave>/ com os artefatos e um
+    entry.json (etapa, tamanho); o mtime do entry.json marca o último uso.
+    """
+
+    def __init__(self, cache_dir: Union[str, os.PathLike] = ".pipeline_cache", max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes deve ser >= 1.")
+        self.cache_dir: str = os.fspath(cache_dir)
+        self.max_bytes: Optional[int] = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def contains(self, key: str) -> bool:
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, ENTRY_META), "r", encoding="utf-8") as fh:
+                kind = json.load(fh)["kind"]
+        except (OSError, ValueError, KeyError):
+            return False
+        frames = {"frame": ["frame"], "split": ["train", "test"]}.get(kind, [])
+        if any(read_frame_meta(os.path.join(entry, name)) is None for name in frames):
+            # Entrada ilegível (ex.: formato antigo do cache de frames): descarta e recalcula
+            shutil.rmtree(entry, ignore_errors=True)
+            return False
+        return True
+
+    def _touch(self, key: str) -> None:
+        # Relógio de alta resolução: o mtime do sistema de arquivos pode ser grosseiro
+        now = time.time_ns()
+        os.utime(os.path.join(self._entry(key), ENTRY_META), ns=(now, now))
+
+    def load(self, key: str) -> Any:
+        """Carrega a saída da etapa (DataFrame, par de DataFrames ou modelo)."""
+        entry = self._entry(key)
+        with open(os.path.join(entry, ENTRY_META), "r", encoding="utf-8") as fh:
+            kind = json.load(fh)["kind"]
+        if kind == "frame":
+            value: Any = load_frame(os.path.join(entry, "frame"))
+        elif kind == "split":
+            value = (load_frame(os.path.join(entry, "train")), load_frame(os.path.join(entry, "test")))
+        else:
+            value = joblib.load(os.path.join(entry, "model.joblib"))
+        self._touch(key)
+        self.hits += 1
+        return value
+
+    def store(self, key: str, stage: str, value: Any) -> None:
+        """Grava a saída da etapa e aplica o limite de tamanho."""
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+        if isinstance(value, pd.DataFrame):
+            kind = "frame"
+            save_frame(value, os.path.join(entry, "frame"))
+        elif isinstance(value, tuple):
+            kind = "split"
+            save_frame(value[0], os.path.join(entry, "train"))
+            save_frame(value[1], os.path.join(entry, "test"))
+        else:
+            kind = "model"
+            atomic_joblib_dump(value, os.path.join(entry, "model.joblib"))
+        # entry.json por último: só então a entrada passa a existir para contains()
+        atomic_write_json(
+            {"stage": stage, "kind": kind, "size_bytes": _directory_size(entry)},
+            os.path.join(entry, ENTRY_META),
+        )
+        self._touch(key)
+        self.misses += 1
+        self.evict(keep={key})
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Entradas válidas, da menos para a mais recentemente usada."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        found = []
+        for key in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self._entry(key), ENTRY_META)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as fh:
+                    meta = json.load(fh)
+                meta.update({"key": key, "last_used": os.stat(meta_path).st_mtime_ns})
+            except (OSError, ValueError):
+                continue
+            found.append(meta)
+        found.sort(key=lambda meta: meta["last_used"])
+        return found
+
+    def size_bytes(self) -> int:
+        return sum(meta["size_bytes"] for meta in self.entries())
+
+    def evict(self, keep: Optional[set] = None) -> List[str]:
+        """Remove entradas LRU até o total caber em max_bytes."""
+        if self.max_bytes is None:
+            return []
+        entries = self.entries()
+        total = sum(meta["size_bytes"] for meta in entries)
+        removed = []
+        for meta in entries:
+            if total <= self.max_bytes:
+                break
+            if keep and meta["key"] in keep:
+                continue
+            shutil.rmtree(self._entry(meta["key"]), ignore_errors=True)
+            total -= meta["size_bytes"]
+            removed.append(meta["key"])
+        return removed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class PipelineRunner:
+    """
+    Classe responsável por executar o pipeline completo pulando as etapas
+    cujas entradas e parâmetros não mudaram.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, os.PathLike] = ".pipeline_cache",
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        target_col: str = "target",
+    ) -> None:
+        """
+        Parameters
+        ----
+        cache_dir : str | os.PathLike
+            Diretório do cache de etapas.
+        max_bytes : int | None
+            Tamanho máximo do cache (None = sem limite).
+        target_col : str
+            Coluna alvo (nunca normalizada/codificada).
+        """
+        self.cache = StageCache(cache_dir, max_bytes=max_bytes)
+        self.target_col = target_col
+        self.last_run: List[Dict[str, Any]] = []
+
+    def _plan(
+        self,
+        data_path: str,
+        estimator: Any,
+        missing_strategy: str,
+        normalize_columns: Optional[List[str]],
+        categorical_columns: Optional[List[str]],
+        encode_options: Dict[str, Any],
+        test_size: float,
+        random_state: int,
+    ) -> List[Tuple[str, Dict[str, Any], str]]:
+        # None em colunas = "auto": resolvido a partir dos dados, que já
+        # estão cobertos pela chave da etapa anterior
+        params: List[Tuple[str, Dict[str, Any]]] = [
+            ("load", {"path": os.path.abspath(data_path), "content_hash": file_content_hash(data_path)}),
+            ("handle_missing_values", {"strategy": missing_strategy}),
+            ("normalize_features", {"columns": normalize_columns, "target": self.target_col}),
+            ("encode_categorical", {"columns": categorical_columns, "target": self.target_col, **encode_options}),
+            ("split", {"test_size": test_size, "random_state": random_state}),
+            (
+                "train",
+                {
+                    "estimator": type(estimator).__module__ + "." + type(estimator).__name__,
+                    "params": estimator.get_params() if hasattr(estimator, "get_params") else repr(estimator),
+                    "target": self.target_col,
+                },
+            ),
+        ]
+        plan = []
+        upstream = None
+        for stage, stage_params in params:
+            upstream = stage_key(stage, stage_params, upstream)
+            plan.append((stage, stage_params, upstream))
+        return plan
+
+    def _feature_columns(self, df: pd.DataFrame, columns: Optional[List[str]], include: List[Any]) -> List[str]:
+        if columns is not None:
+            return columns
+        return [c for c in df.select_dtypes(include=include).columns if c != self.target_col]
+
+    def _execute_stage(self, stage: str, value: Any, run_args: Dict[str, Any]) -> Any:
+        if stage == "load":
+            return load_data(run_args["data_path"])
+        if stage == "handle_missing_values":
+            return DataProcessor(value).handle_missing_values(strategy=run_args["missing_strategy"])
+        if stage == "normalize_features":
+            columns = self._feature_columns(value, run_args["normalize_columns"], [np.number])
+            return DataProcessor(value).normalize_features(columns=columns) if columns else value
+        if stage == "encode_categorical":
+            columns = self._feature_columns(value, run_args["categorical_columns"], ["object", "category"])
+            if not columns:
+                return value
+            return DataProcessor(value).encode_categorical(columns=columns, **run_args["encode_options"])
+        if stage == "split":
+            train_df, test_df = DataSplitter(value, copy=False).split(
+                test_size=run_args["test_size"], random_state=run_args["random_state"]
+            )
+            return train_df, test_df
+        # train
+        train_df, _ = value
+        trainer = ModelTrainer(clone(run_args["estimator"]))
+        trainer.train(train_df.drop(columns=[self.target_col]), train_df[self.target_col])
+        return trainer.model
+
+    def _load_or_execute(
+        self,
+        stage: str,
+        key: str,
+        value: Any,
+        run_args: Dict[str, Any],
+        hit: bool,
+    ) -> Tuple[Any, str, float]:
+        start = time.perf_counter()
+        if hit:
+            output = self.cache.load(key)
+        else:
+            output = self._execute_stage(stage, value, run_args)
+            self.cache.store(key, stage, output)
+        return output, "hit" if hit else "miss", time.perf_counter() - start
+
+    def run(
+        self,
+        data_path: Union[str, os.PathLike],
+        estimator: Any,
+        missing_strategy: str = "mean",
+        normalize_columns: Optional[List[str]] = None,
+        categorical_columns: Optional[List[str]] = None,
+        encode_options: Optional[Dict[str, Any]] = None,
+        test_size: float = 0.25,
+        random_state: int = 42,
+    ) -> Dict[str, Any]:
+        """
+        Executa o pipeline reaproveitando as etapas em cache.
+
+        Parameters
+        ----
+        data_path : str | os.PathLike
+            CSV de entrada.
+        estimator : Any
+            Estimador do scikit-learn (não é modificado; o modelo treinado
+            é devolvido em 'trainer').
+        missing_strategy : str
+            Estratégia de handle_missing_values.
+        normalize_columns, categorical_columns : list[str], opcional
+            Colunas de cada etapa; None = todas as numéricas/categóricas
+            (exceto o target).
+        encode_options : dict, opcional
+            kwargs extras de encode_categorical (ex.: max_categories).
+        test_size, random_state :
+            Parâmetros do split.
+
+        Returns
+        ----
+        dict
+            'trainer' (ModelTrainer treinado), 'train_df', 'test_df' e
+            'stages' (status hit/miss/skipped e tempo de cada etapa, também
+            em `last_run`).
+        """
+        data_path = os.fspath(data_path)
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Arquivo de dados não encontrado: {data_path}")
+        if not hasattr(estimator, "fit") or not hasattr(estimator, "predict"):
+            raise TypeError("O estimador deve possuir os métodos 'fit' e 'predict'.")
+
+        encode_options = dict(encode_options or {})
+        run_args = {
+            "data_path": data_path,
+            "estimator": estimator,
+            "missing_strategy": missing_strategy,
+            "normalize_columns": normalize_columns,
+            "categorical_columns": categorical_columns,
+            "encode_options": encode_options,
+            "test_size": test_size,
+            "random_state": random_state,
+        }
+        plan = self._plan(
+            data_path, estimator, missing_strategy, normalize_columns,
+            categorical_columns, encode_options, test_size, random_state,
+        )
+
+        # O split é sempre necessário (para devolver os dados): retoma a partir
+        # da última etapa até o split com saída em cache
+        split_position = STAGES.index("split")
+        resume = -1
+        for position in range(split_position, -1, -1):
+            if self.cache.contains(plan[position][2]):
+                resume = position
+                break
+
+        stages: List[Dict[str, Any]] = []
+        value: Any = None
+        for position, (stage, _, key) in enumerate(plan[: split_position + 1]):
+            if position < resume:
+                stages.append({"stage": stage, "key": key, "status": "skipped", "seconds": 0.0})
+                continue
+            value, status, seconds = self._load_or_execute(stage, key, value, run_args, hit=position == resume)
+            stages.append({"stage": stage, "key": key, "status": status, "seconds": seconds})
+        split_value = value
+
+        stage, _, key = plan[-1]
+        model, status, seconds = self._load_or_execute(stage, key, split_value, run_args, hit=self.cache.contains(key))
+        stages.append({"stage": stage, "key": key, "status": status, "seconds": seconds})
+
+        train_df, test_df = split_value
+        self.last_run = stages
+        return {
+            "trainer": ModelTrainer.from_trained_model(model),
+            "train_df": train_df,
+            "test_df": test_df,
+            "stages": stages,
+        }
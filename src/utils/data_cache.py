@@ -0,0 +1,298 @@
+"""
+data_cache.py
+
+Cache binário colunar para DataFrames carregados de CSV.
+
+Cada DataFrame é salvo como um diretório com um arquivo `.npy` por coluna
+(colunas numéricas são recarregadas com memory mapping) e um `meta.json`
+com a impressão digital do arquivo de origem (path, tamanho, mtime e hash
+do conteúdo). Se a origem mudar, a entrada é invalidada e reconstruída.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas._libs.sparse import IntIndex
+
+# v2: dtypes reversíveis e colunas esparsas guardadas como valores + posições
+# v3: nomes do índice (index.names) gravados no meta.json
+CACHE_FORMAT_VERSION = 3
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_content_hash(path: Union[str, os.PathLike]) -> str:
+    """Calcula o hash (blake2b) do conteúdo do arquivo, lendo em blocos."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dtype_spec(dtype: Any) -> Dict[str, Any]:
+    """Representação reversível de um dtype para o meta.json."""
+    if isinstance(dtype, np.dtype):
+        return {"numpy": dtype.str}
+    name = str(dtype)
+    try:
+        if pd.api.types.pandas_dtype(name) == dtype:
+            return {"pandas": name}
+    except TypeError:
+        pass
+    raise TypeError(f"Unsupported dtype for the frame cache: {dtype!r}")
+
+
+def _dtype_from_spec(spec: Dict[str, Any]) -> Any:
+    if "numpy" in spec:
+        return np.dtype(spec["numpy"])
+    return pd.api.types.pandas_dtype(spec["pandas"])
+
+
+def save_frame(df: pd.DataFrame, directory: Union[str, os.PathLike], extra: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Salva o DataFrame como um .npy por coluna + meta.json.
+    A escrita é feita em um diretório temporário e renomeada no final,
+    para que leitores nunca vejam uma entrada incompleta.
+    """
+    directory = os.fspath(directory)
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            entry: Dict[str, Any] = {"name": col, "file": f"col_{i}.npy"}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry["kind"] = "category"
+                entry["categories_file"] = f"col_{i}_categories.npy"
+                entry["ordered"] = bool(series.cat.ordered)
+                np.save(os.path.join(tmp_dir, entry["file"]), series.cat.codes.to_numpy())
+                np.save(
+                    os.path.join(tmp_dir, entry["categories_file"]),
+                    series.cat.categories.to_numpy(),
+                    allow_pickle=True,
+                )
+            elif isinstance(series.dtype, pd.SparseDtype):
+                # Só os valores armazenados e suas posições (nada é densificado)
+                values = series.array
+                entry["kind"] = "sparse"
+                entry["subtype"] = _dtype_spec(values.dtype.subtype)
+                entry["fill_file"] = f"col_{i}_fill.npy"
+                entry["index_file"] = f"col_{i}_index.npy"
+                np.save(os.path.join(tmp_dir, entry["file"]), values.sp_values)
+                np.save(os.path.join(tmp_dir, entry["index_file"]), values.sp_index.indices)
+                np.save(
+                    os.path.join(tmp_dir, entry["fill_file"]),
+                    np.array([values.fill_value], dtype=values.dtype.subtype),
+                )
+            elif series.dtype == object or not isinstance(series.dtype, np.dtype):
+                # strings / extension dtypes: não podem ser mapeadas em memória
+                entry["kind"] = "object"
+                entry["dtype"] = _dtype_spec(series.dtype)
+                np.save(os.path.join(tmp_dir, entry["file"]), series.to_numpy(dtype=object), allow_pickle=True)
+            else:
+                entry["kind"] = "numpy"
+                np.save(os.path.join(tmp_dir, entry["file"]), series.to_numpy())
+            columns.append(entry)
+
+        if isinstance(df.index, pd.RangeIndex):
+            index_meta: Dict[str, Any] = {
+                "kind": "range",
+                "start": int(df.index.start),
+                "stop": int(df.index.stop),
+                "step": int(df.index.step),
+            }
+        else:
+            index_meta = {"kind": "array", "file": "index.npy"}
+            np.save(os.path.join(tmp_dir, "index.npy"), df.index.to_numpy(), allow_pickle=True)
+        index_meta["names"] = list(df.index.names)
+
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "columns": columns,
+            "n_rows": len(df),
+            "index": index_meta,
+            "extra": extra or {},
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def read_frame_meta(directory: Union[str, os.PathLike]) -> Optional[Dict[str, Any]]:
+    """Lê o meta.json de uma entrada salva por save_frame (None se ausente/inválido)."""
+    meta_path = os.path.join(os.fspath(directory), "meta.json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_FORMAT_VERSION:
+        return None
+    return meta
+
+
+def load_frame(directory: Union[str, os.PathLike], mmap_mode: Optional[str] = "c") -> pd.DataFrame:
+    """
+    Recarrega um DataFrame salvo por save_frame.
+    Colunas numéricas são abertas com np.load(mmap_mode=...) — o padrão 'c'
+    (copy-on-write) evita leitura antecipada e permite modificações locais.
+    """
+    directory = os.fspath(directory)
+    meta = read_frame_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"Cache entry not found or invalid: {directory}")
+
+    data: Dict[Any, Any] = {}
+    for entry in meta["columns"]:
+        path = os.path.join(directory, entry["file"])
+        if entry["kind"] == "category":
+            codes = np.asarray(np.load(path, mmap_mode=mmap_mode))
+            categories = np.load(os.path.join(directory, entry["categories_file"]), allow_pickle=True)
+            data[entry["name"]] = pd.Categorical.from_codes(
+                codes, categories=categories, ordered=entry["ordered"]
+            )
+        elif entry["kind"] == "sparse":
+            subtype = _dtype_from_spec(entry["subtype"])
+            fill_value = np.load(os.path.join(directory, entry["fill_file"]))[0]
+            indices = np.load(os.path.join(directory, entry["index_file"]))
+            data[entry["name"]] = pd.arrays.SparseArray(
+                np.load(path),
+                sparse_index=IntIndex(meta["n_rows"], indices),
+                dtype=pd.SparseDtype(subtype, fill_value),
+            )
+        elif entry["kind"] == "object":
+            values = np.load(path, allow_pickle=True)
+            dtype = _dtype_from_spec(entry["dtype"])
+            data[entry["name"]] = values if dtype == object else pd.array(values, dtype=dtype)
+        else:
+            # np.asarray devolve uma view ndarray do memmap (sem cópia)
+            data[entry["name"]] = np.asarray(np.load(path, mmap_mode=mmap_mode))
+
+    index_meta = meta["index"]
+    if index_meta["kind"] == "range":
+        index = pd.RangeIndex(index_meta["start"], index_meta["stop"], index_meta["step"])
+    else:
+        values = np.load(os.path.join(directory, index_meta["file"]), allow_pickle=True)
+        n_levels = len(index_meta["names"])
+        if n_levels > 1:
+            # MultiIndex é gravado como um array de tuplas (vazio: níveis sem valores)
+            index = pd.MultiIndex.from_tuples(values) if len(values) else pd.MultiIndex.from_arrays([[]] * n_levels)
+        else:
+            index = pd.Index(values)
+    index.names = index_meta["names"]
+
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+class DataCache:
+    """
+    Cache em disco de DataFrames parseados, indexado pela impressão digital
+    do arquivo de origem.
+
+    - hit rápido: path + tamanho + mtime iguais aos registrados
+    - se só o mtime mudou, o hash do conteúdo decide (ex.: arquivo "tocado")
+    - qualquer outra mudança invalida a entrada e o CSV é parseado novamente
+
+    Os contadores `hits`/`misses` e os atributos `last_status`/`last_load_seconds`
+    permitem reportar o comportamento do cache.
+    """
+
+    def __init__(self, cache_dir: Union[str, os.PathLike] = ".data_cache", mmap_mode: Optional[str] = "c") -> None:
+        if not isinstance(cache_dir, (str, os.PathLike)):
+            raise TypeError("cache_dir must be a string or path-like.")
+        self.cache_dir: str = os.fspath(cache_dir)
+        self.mmap_mode: Optional[str] = mmap_mode
+        self.hits: int = 0
+        self.misses: int = 0
+        self.last_status: Optional[str] = None
+        self.last_load_seconds: Optional[float] = None
+
+    def entry_dir(self, source: Union[str, os.PathLike], options: Optional[Dict[str, Any]] = None) -> str:
+        """Diretório da entrada para (path absoluto, opções de leitura)."""
+        key_payload = json.dumps(
+            {"path": os.path.abspath(os.fspath(source)), "options": options or {}},
+            sort_keys=True,
+            default=repr,
+        )
+        key = hashlib.blake2b(key_payload.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _fingerprint_matches(self, source: str, stat: os.stat_result, meta: Dict[str, Any]) -> bool:
+        fingerprint = meta.get("extra", {}).get("fingerprint")
+        if not fingerprint or fingerprint["size"] != stat.st_size:
+            return False
+        if fingerprint["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        return fingerprint["content_hash"] == file_content_hash(source)
+
+    def load(
+        self,
+        source: Union[str, os.PathLike],
+        parser: Callable[[str], pd.DataFrame],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """
+        Retorna o DataFrame do cache (hit) ou chama `parser(source)` e
+        grava o resultado (miss).
+        """
+        start = time.perf_counter()
+        source_str = os.fspath(source)
+        stat = os.stat(source_str)
+        entry = self.entry_dir(source_str, options)
+        meta = read_frame_meta(entry)
+
+        if meta is not None and self._fingerprint_matches(source_str, stat, meta):
+            if meta["extra"]["fingerprint"]["mtime_ns"] != stat.st_mtime_ns:
+                # conteúdo idêntico: registra o novo mtime para evitar rehash
+                meta["extra"]["fingerprint"]["mtime_ns"] = stat.st_mtime_ns
+                with open(os.path.join(entry, "meta.json"), "w", encoding="utf-8") as fh:
+                    json.dump(meta, fh)
+            df = load_frame(entry, mmap_mode=self.mmap_mode)
+            self.hits += 1
+            self.last_status = "hit"
+        else:
+            df = parser(source_str)
+            fingerprint = {
+                "path": os.path.abspath(source_str),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": file_content_hash(source_str),
+            }
+            save_frame(df, entry, extra={"fingerprint": fingerprint})
+            self.misses += 1
+            self.last_status = "miss"
+
+        self.last_load_seconds = time.perf_counter() - start
+        return df
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumo de hits/misses e tempo da última carga."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "last_status": self.last_status,
+            "last_load_seconds": self.last_load_seconds,
+        }
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
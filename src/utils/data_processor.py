@@ -1,57 +1,224 @@
+import os
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.utils.feature_hashing import hash_encode_frame
+from src.utils.instrumentation import instrumented
+from src.utils.precision import indicator_dtype, resolve_precision
+from src.utils.quantile_sketch import DEFAULT_SKETCH_ERROR, QuantileSketch
+
+PIPELINE_STEPS = {"optimize_memory", "handle_missing_values", "normalize_features", "encode_categorical"}
+MISSING_STRATEGIES = ("mean", "median", "approx_median", "approx_quantile", "drop")
+SKETCH_STRATEGIES = {"approx_median", "approx_quantile"}
+
+# Abaixo deste número de células (linhas x colunas) o modo paralelo não compensa
+PARALLEL_MIN_CELLS = 2_000_000
+
+
+def _column_shards(columns: List[str], n_shards: int) -> List[Tuple[int, int]]:
+    """Fatias contíguas [início, fim) de colunas, uma por worker."""
+    bounds = np.linspace(0, len(columns), min(n_shards, len(columns)) + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _min_max_scale(values: np.ndarray) -> None:
+    """Escala uma coluna para [0, 1] no lugar, com a aritmética do MinMaxScaler."""
+    data_min = np.nanmin(values)
+    data_range = np.nanmax(values) - data_min
+    # MinMaxScaler: range (quase) zero -> escala 1; coluna só com NaN segue NaN
+    if data_range < 10 * np.finfo(values.dtype).eps:
+        data_range = values.dtype.type(1.0)
+    scale = 1.0 / data_range
+    values *= scale
+    values += 0.0 - data_min * scale
+
+
+def _sketch_fill_value(values: np.ndarray, quantile: float, sketch_error: float) -> float:
+    # Semente fixa: a mesma coluna gera sempre o mesmo valor de imputação
+    return QuantileSketch(error=sketch_error, random_state=0).update(values).quantile(quantile)
+
+
+def _map_shards(fn: Callable[[int, int], Any], shards: List[Tuple[int, int]], max_workers: int) -> List[Any]:
+    # As reduções/operações do NumPy liberam o GIL, então threads bastam e
+    # todos os workers escrevem no mesmo buffer de saída (sem pickling)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda bounds: fn(*bounds), shards))
 
 
 class DataProcessor:
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        copy: bool = True,
+        precision: str = "float64",
+        max_workers: Optional[int] = 1,
+        parallel_min_cells: int = PARALLEL_MIN_CELLS,
+    ) -> None:
         if not isinstance(dataframe, pd.DataFrame):
             raise TypeError("Input must be a pandas DataFrame.")
         if dataframe.empty:
             raise ValueError("DataFrame cannot be empty.")
-        # Sempre trabalhar em cópia para evitar side effects
-        self.dataframe: pd.DataFrame = dataframe.copy()
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
+        # Por padrão trabalha em cópia para evitar side effects.
+        # copy=False reaproveita o buffer do chamador (útil com inplace=True).
+        self.dataframe: pd.DataFrame = dataframe.copy() if copy else dataframe
+        # precision='float32': normalize_features emite float32 e o one-hot usa uint8
+        self.float_dtype = resolve_precision(precision)
+        self.precision: str = precision
+        # max_workers > 1 (None = os.cpu_count()): handle_missing_values e
+        # normalize_features dividem as colunas entre threads em frames com
+        # pelo menos parallel_min_cells células; abaixo disso, modo serial
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.parallel_min_cells: int = parallel_min_cells
+        self.peak_memory_bytes: Optional[int] = None
+        self.memory_report: Optional[Dict[str, Any]] = None
+
+    def _working_frame(self, inplace: bool) -> pd.DataFrame:
+        # inplace=True opera direto no buffer interno, sem cópia por etapa
+        return self.dataframe if inplace else self.dataframe.copy()
+
+    def _parallel_shards(self, frame: pd.DataFrame, columns: List[str]) -> Optional[List[Tuple[int, int]]]:
+        # None = executar em série
+        if self.max_workers < 2 or len(columns) < 2 or len(frame) * len(columns) < self.parallel_min_cells:
+            return None
+        return _column_shards(columns, self.max_workers)
 
-    def handle_missing_values(self, strategy: str = "mean") -> pd.DataFrame:
+    def _finish(self, processed_df: pd.DataFrame, inplace: bool) -> pd.DataFrame:
+        if inplace:
+            self.dataframe = processed_df
+        return processed_df
+
+    @instrumented
+    def optimize_memory(
+        self,
+        inplace: bool = False,
+        downcast_floats: bool = True,
+        category_threshold: float = 0.5,
+    ) -> pd.DataFrame:
+        """
+        Reduz o uso de memória sem alterar valores:
+        - inteiros: menor largura que comporta min/max (int8, uint16, ...)
+        - floats: float32 apenas se todos os valores forem representáveis sem perda
+        - object: category quando n_únicos / n_linhas <= category_threshold
+        O antes/depois (bytes, deep=True) fica em memory_report.
+        Retorna um novo DataFrame (não altera o original), ou, com inplace=True,
+        atualiza e retorna o buffer interno do processor.
+        """
+        if not (0.0 <= category_threshold <= 1.0):
+            raise ValueError("category_threshold must be between 0.0 and 1.0.")
+
+        processed_df = self._working_frame(inplace)
+        before = int(processed_df.memory_usage(deep=True).sum())
+        changes: Dict[str, Tuple[str, str]] = {}
+
+        for col in processed_df.columns:
+            series = processed_df[col]
+            converted = None
+            if pd.api.types.is_integer_dtype(series.dtype):
+                kind = "unsigned" if len(series) and series.min() >= 0 else "integer"
+                converted = pd.to_numeric(series, downcast=kind)
+            elif downcast_floats and pd.api.types.is_float_dtype(series.dtype) and series.dtype != np.float32:
+                values = series.to_numpy()
+                as_float32 = values.astype(np.float32)
+                # Só converte se a volta para float64 for exata (NaN inclusive)
+                if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+                    converted = pd.Series(as_float32, index=series.index, name=col)
+            elif series.dtype == object and len(series):
+                if series.nunique(dropna=True) / len(series) <= category_threshold:
+                    converted = series.astype("category")
+
+            if converted is not None and converted.dtype != series.dtype:
+                changes[col] = (str(series.dtype), str(converted.dtype))
+                processed_df[col] = converted
+
+        after = int(processed_df.memory_usage(deep=True).sum())
+        self.memory_report = {
+            "before_bytes": before,
+            "after_bytes": after,
+            "reduction_ratio": before / after if after else None,
+            "converted_columns": changes,
+        }
+        return self._finish(processed_df, inplace)
+
+    @instrumented
+    def handle_missing_values(
+        self,
+        strategy: str = "mean",
+        inplace: bool = False,
+        quantile: float = 0.5,
+        sketch_error: float = DEFAULT_SKETCH_ERROR,
+    ) -> pd.DataFrame:
         """
         Trata valores ausentes em colunas numéricas.
         - mean: preenche NaN numéricos com média da coluna
         - median: preenche NaN numéricos com mediana da coluna
+        - approx_median / approx_quantile: mediana (ou o quantil `quantile`)
+          estimada por um QuantileSketch, sem ordenar a coluna inteira;
+          sketch_error é o erro de rank tolerado
         - drop: remove linhas com qualquer NaN
-        Retorna um novo DataFrame (não altera o original).
+        Retorna um novo DataFrame (não altera o original), ou, com inplace=True,
+        atualiza e retorna o buffer interno do processor.
         """
-        if strategy not in {"mean", "median", "drop"}:
+        if strategy not in MISSING_STRATEGIES:
             raise ValueError(
-                f"Invalid strategy: {strategy}. Choose from 'mean', 'median', or 'drop'."
+                f"Invalid strategy: {strategy}. Choose from {', '.join(MISSING_STRATEGIES)}."
             )
-
-        processed_df = self.dataframe.copy()
+        if not (0.0 <= quantile <= 1.0):
+            raise ValueError("quantile must be between 0.0 and 1.0.")
+        if strategy == "approx_median":
+            quantile = 0.5
 
         if strategy == "drop":
-            return processed_df.dropna()
+            return self._finish(self.dataframe.dropna(), inplace)
+
+        processed_df = self._working_frame(inplace)
 
         numeric_cols = processed_df.select_dtypes(include=[np.number]).columns.tolist()
         if len(numeric_cols) == 0:
             raise ValueError("No numeric columns available to fill missing values.")
 
-        if strategy == "mean":
+        shards = self._parallel_shards(processed_df, numeric_cols)
+        if shards is not None:
+            self._fill_missing_parallel(processed_df, numeric_cols, strategy, shards, quantile, sketch_error)
+            return self._finish(processed_df, inplace)
+
+        has_nan = processed_df[numeric_cols].isna().any()
+        if strategy in SKETCH_STRATEGIES:
+            # O sketch só é construído para as colunas que têm NaN
+            fill_values = pd.Series(
+                {
+                    col: _sketch_fill_value(processed_df[col].to_numpy(), quantile, sketch_error)
+                    for col in has_nan.index[has_nan]
+                },
+                dtype=np.float64,
+            )
+        elif strategy == "mean":
             fill_values = processed_df[numeric_cols].mean()
         else:  # strategy == "median"
             fill_values = processed_df[numeric_cols].median()
 
-        processed_df[numeric_cols] = processed_df[numeric_cols].fillna(fill_values)
-        return processed_df
+        # Preenche apenas as colunas que realmente têm NaN
+        missing = fill_values[fill_values.index.isin(has_nan.index[has_nan])].dropna()
+        if not missing.empty:
+            processed_df.fillna(value=missing.to_dict(), inplace=True)
+        return self._finish(processed_df, inplace)
 
-    def normalize_features(self, columns: List[str]) -> pd.DataFrame:
+    @instrumented
+    def normalize_features(self, columns: List[str], inplace: bool = False) -> pd.DataFrame:
         """
         Aplica MinMaxScaler nas colunas numéricas especificadas.
-        Retorna um novo DataFrame (não altera o original).
+        Retorna um novo DataFrame (não altera o original), ou, com inplace=True,
+        atualiza e retorna o buffer interno do processor.
         """
         if not isinstance(columns, list) or len(columns) == 0:
             raise ValueError("columns must be a non-empty list of column names.")
 
-        processed_df = self.dataframe.copy()
+        processed_df = self.dataframe
 
         for col in columns:
             if col not in processed_df.columns:
@@ -59,42 +226,206 @@ class DataProcessor:
             if not pd.api.types.is_numeric_dtype(processed_df[col]):
                 raise TypeError(f"Column '{col}' is not numeric and cannot be normalized.")
 
+        processed_df = self._working_frame(inplace)
+        shards = self._parallel_shards(processed_df, columns)
+        if shards is not None:
+            self._normalize_parallel(processed_df, columns, shards)
+            return self._finish(processed_df, inplace)
+
         scaler = MinMaxScaler()
-        processed_df[columns] = scaler.fit_transform(processed_df[columns])
-        return processed_df
+        # MinMaxScaler preserva float32, então a saída segue a precisão configurada
+        processed_df[columns] = scaler.fit_transform(processed_df[columns].to_numpy(dtype=self.float_dtype))
+        return self._finish(processed_df, inplace)
+
+    def _fill_missing_parallel(
+        self,
+        processed_df: pd.DataFrame,
+        numeric_cols: List[str],
+        strategy: str,
+        shards: List[Tuple[int, int]],
+        quantile: float = 0.5,
+        sketch_error: float = DEFAULT_SKETCH_ERROR,
+    ) -> None:
+        """Imputação por média/mediana/quantil com as colunas divididas entre threads."""
+        if strategy in SKETCH_STRATEGIES:
+            reduce = lambda values: _sketch_fill_value(values, quantile, sketch_error)  # noqa: E731
+        else:
+            reduce = np.nanmean if strategy == "mean" else np.nanmedian
+
+        def fill_shard(start: int, stop: int) -> Dict[str, np.ndarray]:
+            filled = {}
+            for col in numeric_cols[start:stop]:
+                values = processed_df[col].to_numpy()
+                if not pd.api.types.is_float_dtype(values.dtype):
+                    continue  # inteiros não têm NaN
+                mask = np.isnan(values)
+                if mask.any() and not mask.all():
+                    # Só as colunas com NaN ganham um novo array; as demais não são copiadas
+                    column = values.copy()
+                    column[mask] = reduce(values)
+                    filled[col] = column
+            return filled
+
+        filled: Dict[str, np.ndarray] = {}
+        for shard_result in _map_shards(fill_shard, shards, self.max_workers):
+            filled.update(shard_result)
+        if filled:
+            # Costura: substitui as colunas imputadas, sem copiar o frame inteiro
+            processed_df.loc[:, list(filled)] = pd.DataFrame(filled, index=processed_df.index)
+
+    def _normalize_parallel(
+        self,
+        processed_df: pd.DataFrame,
+        columns: List[str],
+        shards: List[Tuple[int, int]],
+    ) -> None:
+        """
+        Min-max com as colunas divididas entre threads (mesma fórmula do MinMaxScaler).
+        Colunas que já estão em float_dtype são escaladas no próprio buffer do frame;
+        só as demais (ex.: inteiros) ganham um array novo, atribuído coluna a coluna.
+        """
+        # Views extraídas na thread principal: os workers só fazem aritmética do NumPy
+        arrays = {col: processed_df[col].to_numpy() for col in columns}
+
+        def scale_shard(start: int, stop: int) -> Dict[str, np.ndarray]:
+            converted = {}
+            for col in columns[start:stop]:
+                values = arrays[col]
+                if values.dtype != self.float_dtype or not values.flags.writeable:
+                    values = values.astype(self.float_dtype)
+                    converted[col] = values
+                _min_max_scale(values)
+            return converted
+
+        converted: Dict[str, np.ndarray] = {}
+        for shard_result in _map_shards(scale_shard, shards, self.max_workers):
+            converted.update(shard_result)
+        for col, values in converted.items():
+            processed_df[col] = values
 
-    def encode_categorical(self, columns: List[str]) -> pd.DataFrame:
+    @instrumented
+    def encode_categorical(
+        self,
+        columns: List[str],
+        inplace: bool = False,
+        sparse: bool = False,
+        max_categories: Optional[int] = None,
+        min_frequency: Optional[Union[int, float]] = None,
+        dtype: Any = None,
+        hash_features: Optional[int] = None,
+    ) -> pd.DataFrame:
         """
         Aplica OneHotEncoder nas colunas especificadas (categóricas),
         com handle_unknown='ignore'. Remove as colunas originais e adiciona as one-hot.
-        Retorna um novo DataFrame (não altera o original).
+        - sparse: one-hot em colunas pandas esparsas (Sparse[float64, 0]), sem densificar;
+          o ModelTrainer repassa esse frame ao estimador como matriz CSR
+        - max_categories/min_frequency: categorias raras vão para um bucket
+          '<coluna>_other', limitando a largura da saída
+        - dtype: tipo das colunas one-hot (np.uint8 ocupa 1/8 do float64);
+          None segue a precisão do processor (float64, ou uint8 em float32)
+        - hash_features: em vez do one-hot, aplica o hashing trick com largura fixa
+          (colunas esparsas hash_0..hash_{n-1}, tokens "coluna=valor"); sem
+          vocabulário, então serve para colunas de altíssima cardinalidade e chunks
+        Retorna um novo DataFrame (não altera o original), ou, com inplace=True,
+        atualiza e retorna o buffer interno do processor.
         """
         if not isinstance(columns, list) or len(columns) == 0:
             raise ValueError("columns must be a non-empty list of column names.")
 
-        processed_df = self.dataframe.copy()
+        processed_df = self.dataframe
 
         for col in columns:
             if col not in processed_df.columns:
                 raise ValueError(f"Column '{col}' not found in DataFrame.")
 
+        if dtype is None:
+            dtype = indicator_dtype(self.precision)
+
+        if hash_features is not None:
+            if max_categories is not None or min_frequency is not None:
+                raise ValueError("max_categories/min_frequency cannot be combined with hash_features.")
+            encoded_df = hash_encode_frame(processed_df, columns, n_features=hash_features, dtype=dtype)
+            processed_df = processed_df.drop(columns=columns)
+            processed_df = pd.concat([processed_df, encoded_df], axis=1, copy=False)
+            return self._finish(processed_df, inplace)
+
+        encoder_kwargs: Dict[str, Any] = {"handle_unknown": "ignore", "dtype": dtype}
+        if max_categories is not None:
+            encoder_kwargs["max_categories"] = max_categories
+        if min_frequency is not None:
+            encoder_kwargs["min_frequency"] = min_frequency
+
         # Compatibilidade entre versões do sklearn:
         # - versões mais novas: sparse_output
         # - versões antigas: sparse
         try:
-            encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False)
+            encoder = OneHotEncoder(sparse_output=sparse, **encoder_kwargs)
         except TypeError:
-            encoder = OneHotEncoder(handle_unknown="ignore", sparse=False)
+            encoder = OneHotEncoder(sparse=sparse, **encoder_kwargs)
 
         encoded_data = encoder.fit_transform(processed_df[columns])
-        feature_names = encoder.get_feature_names_out(columns)
+        feature_names = [
+            name.replace("_infrequent_sklearn", "_other")
+            for name in encoder.get_feature_names_out(columns)
+        ]
 
-        encoded_df = pd.DataFrame(
-            encoded_data,
-            columns=feature_names,
-            index=processed_df.index,
-        )
+        if sparse:
+            encoded_df = pd.DataFrame.sparse.from_spmatrix(
+                encoded_data,
+                index=processed_df.index,
+                columns=feature_names,
+            )
+        else:
+            encoded_df = pd.DataFrame(
+                encoded_data,
+                columns=feature_names,
+                index=processed_df.index,
+            )
 
+        # drop + concat já geram um novo frame; copy=False evita duplicar
+        # os blocos das colunas restantes
         processed_df = processed_df.drop(columns=columns)
-        processed_df = pd.concat([processed_df, encoded_df], axis=1)
-        return processed_df
\ No newline at end of file
+        processed_df = pd.concat([processed_df, encoded_df], axis=1, copy=False)
+        return self._finish(processed_df, inplace)
+
+    @instrumented
+    def run_pipeline(
+        self,
+        steps: List[Tuple[str, Dict[str, Any]]],
+        track_memory: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Executa as etapas em sequência sobre um único buffer (inplace=True),
+        sem cópias intermediárias. A única cópia defensiva é a do construtor
+        (use copy=False para dispensá-la).
+        - steps: lista de (nome_do_método, kwargs), ex.:
+          [("handle_missing_values", {"strategy": "mean"}),
+           ("normalize_features", {"columns": ["num_a"]})]
+        - track_memory: mede o pico de memória (tracemalloc) em peak_memory_bytes.
+          Desligado por padrão (o tracemalloc deixa as alocações bem mais lentas);
+          se o tracemalloc já estiver ativo, iniciado por outro código, o pico
+          dele não é zerado e peak_memory_bytes fica None
+        """
+        for name, _ in steps:
+            if name not in PIPELINE_STEPS:
+                raise ValueError(
+                    f"Invalid pipeline step: {name}. Choose from {sorted(PIPELINE_STEPS)}."
+                )
+
+        self.peak_memory_bytes = None
+        # Só mede com um tracer próprio: reset_peak() apagaria o pico de quem já o usa
+        started_tracing = track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+            baseline, _ = tracemalloc.get_traced_memory()
+
+        try:
+            for name, kwargs in steps:
+                getattr(self, name)(inplace=True, **kwargs)
+        finally:
+            if started_tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak_memory_bytes = max(peak - baseline, 0)
+                tracemalloc.stop()
+
+        return self.dataframe
\ No newline at end of file
@@ -1,27 +1,104 @@
 # src/utils/data_splitter.py
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from typing import Tuple
+from sklearn.model_selection import (
+    GroupKFold,
+    KFold,
+    StratifiedGroupKFold,
+    StratifiedKFold,
+    train_test_split,
+)
+from typing import Iterator, Optional, Tuple
+
+from src.utils.instrumentation import instrumented
+
+IndexPair = Tuple[np.ndarray, np.ndarray]
 
 class DataSplitter:
-    def __init__(self, dataframe: pd.DataFrame):
+    def __init__(self, dataframe: pd.DataFrame, copy: bool = True):
         if not isinstance(dataframe, pd.DataFrame):
             raise TypeError("Input must be a pandas DataFrame.")
         if dataframe.empty:
             raise ValueError("DataFrame cannot be empty.")
-        self.dataframe = dataframe.copy() # Garante que o original não seja modificado
+        # Garante que o original não seja modificado.
+        # copy=False: os métodos *_indices/iter_folds nunca alteram o frame,
+        # então a cópia pode ser dispensada quando só índices são usados.
+        self.dataframe = dataframe.copy() if copy else dataframe
 
-    def split(self, test_size: float = 0.2, random_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    @instrumented
+    def split_indices(self, test_size: float = 0.2, random_state: int = 42) -> IndexPair:
+        """
+        Retorna apenas os índices posicionais (train_idx, test_idx), sem copiar dados.
+        Mesma partição de split() para o mesmo random_state.
+        """
         if not (0.0 < test_size < 1.0):
             raise ValueError("test_size must be between 0.0 and 1.0 (exclusive).")
-        
-        train_df, test_df = train_test_split(
-            self.dataframe,
+
+        train_idx, test_idx = train_test_split(
+            np.arange(len(self.dataframe)),
             test_size=test_size,
             random_state=random_state,
             shuffle=True # Boas práticas de ML
         )
-        return train_df, test_df
+        return train_idx, test_idx
+
+    @instrumented
+    def split(self, test_size: float = 0.2, random_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        train_idx, test_idx = self.split_indices(test_size=test_size, random_state=random_state)
+        return self.take(train_idx), self.take(test_idx)
+
+    @instrumented
+    def take(self, indices: np.ndarray) -> pd.DataFrame:
+        """Materializa as linhas de um conjunto de índices posicionais."""
+        return self.dataframe.iloc[indices]
+
+    def _column_values(self, column: str) -> np.ndarray:
+        if column not in self.dataframe.columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame.")
+        return self.dataframe[column].to_numpy()
+
+    @instrumented
+    def iter_folds(
+        self,
+        n_splits: int = 5,
+        shuffle: bool = True,
+        random_state: Optional[int] = 42,
+        stratify_col: Optional[str] = None,
+        group_col: Optional[str] = None,
+    ) -> Iterator[IndexPair]:
+        """
+        Gera (train_idx, test_idx) posicionais para cada fold:
+        - padrão: KFold
+        - stratify_col: StratifiedKFold (mantém a proporção das classes)
+        - group_col: GroupKFold (um grupo nunca aparece em treino e teste)
+        - ambos: StratifiedGroupKFold
+        Determinístico para o mesmo random_state.
+        """
+        if not isinstance(n_splits, int) or not (2 <= n_splits <= len(self.dataframe)):
+            raise ValueError("n_splits must be an integer between 2 and the number of rows.")
+
+        y = self._column_values(stratify_col) if stratify_col is not None else None
+        groups = self._column_values(group_col) if group_col is not None else None
+        seed = random_state if shuffle else None
+
+        if y is not None and groups is not None:
+            splitter = StratifiedGroupKFold(n_splits=n_splits, shuffle=shuffle, random_state=seed)
+        elif y is not None:
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=shuffle, random_state=seed)
+        elif groups is not None:
+            # Compatibilidade entre versões do sklearn:
+            # - versões >= 1.6: GroupKFold aceita shuffle/random_state
+            # - versões antigas: sem embaralhamento de grupos
+            try:
+                splitter = GroupKFold(n_splits=n_splits, shuffle=shuffle, random_state=seed)
+            except TypeError:
+                splitter = GroupKFold(n_splits=n_splits)
+        else:
+            splitter = KFold(n_splits=n_splits, shuffle=shuffle, random_state=seed)
+
+        positions = np.arange(len(self.dataframe))
+        for train_idx, test_idx in splitter.split(positions, y, groups):
+            yield train_idx, test_idx
 
 if __name__ == "__main__":
     print("Executando módulo DataSplitter standalone para teste...")
@@ -0,0 +1,54 @@
+from typing import Any, Iterator, List
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction import FeatureHasher
+
+# Largura padrão do espaço de hash (colunas de saída)
+DEFAULT_HASH_FEATURES = 1024
+HASH_PREFIX = "hash"
+
+
+def hashed_feature_names(n_features: int) -> List[str]:
+    """Nomes fixos das colunas de hash: hash_0 .. hash_{n-1}."""
+    return [f"{HASH_PREFIX}_{i}" for i in range(n_features)]
+
+
+def _row_tokens(dataframe: pd.DataFrame, columns: List[str]) -> Iterator[List[str]]:
+    # Um token "coluna=valor" por coluna: o mesmo valor em colunas diferentes
+    # cai em buckets diferentes. NaN vira o token "coluna=nan".
+    token_columns = [(col + "=" + dataframe[col].astype(str)).tolist() for col in columns]
+    return (list(tokens) for tokens in zip(*token_columns))
+
+
+def hash_encode(
+    dataframe: pd.DataFrame,
+    columns: List[str],
+    n_features: int = DEFAULT_HASH_FEATURES,
+    dtype: Any = np.float64,
+) -> sp.csr_matrix:
+    """
+    Codifica as colunas categóricas com o hashing trick (FeatureHasher).
+    Sem estado: não há vocabulário a aprender, então cada chunk é codificado
+    de forma independente e a largura da saída não depende da cardinalidade.
+    Colisões somam (alternate_sign=False mantém os valores não negativos).
+    """
+    if not isinstance(n_features, (int, np.integer)) or n_features < 1:
+        raise ValueError("n_features must be a positive integer.")
+    hasher = FeatureHasher(n_features=n_features, input_type="string", alternate_sign=False, dtype=dtype)
+    return hasher.transform(_row_tokens(dataframe, columns)).tocsr()
+
+
+def hash_encode_frame(
+    dataframe: pd.DataFrame,
+    columns: List[str],
+    n_features: int = DEFAULT_HASH_FEATURES,
+    dtype: Any = np.float64,
+) -> pd.DataFrame:
+    """hash_encode como DataFrame de colunas esparsas (hash_0 .. hash_{n-1})."""
+    return pd.DataFrame.sparse.from_spmatrix(
+        hash_encode(dataframe, columns, n_features, dtype),
+        index=dataframe.index,
+        columns=hashed_feature_names(n_features),
+    )
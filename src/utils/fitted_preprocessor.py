@@ -0,0 +1,461 @@
+import copy
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.utils.feature_hashing import DEFAULT_HASH_FEATURES, hash_encode_frame, hashed_feature_names
+from src.utils.precision import indicator_dtype, resolve_precision
+from src.utils.quantile_sketch import DEFAULT_SKETCH_ERROR, QuantileSketch
+from src.utils.serialization import atomic_joblib_dump
+
+FIT_STRATEGIES = {"mean", "median", "approx_median", "approx_quantile"}
+SKETCH_STRATEGIES = {"approx_median", "approx_quantile"}
+# Atributos derivados do estado parcial: após partial_fit/merge são recalculados
+# sob demanda (no primeiro acesso, ex.: transform), e não a cada chunk
+_FITTED_ATTRIBUTES = ("fill_values_", "min_", "max_", "categories_", "feature_names_out_", "n_samples_seen_")
+
+
+def _sorted_categories(uniques: Iterable[Any], has_nan: bool) -> List[Any]:
+    """
+    Vocabulário ordenado como no OneHotEncoder: valores ordenados e NaN por último.
+    """
+    try:
+        categories = sorted(uniques)
+    except TypeError:
+        categories = sorted(uniques, key=str)
+    if has_nan:
+        categories.append(np.nan)
+    return categories
+
+
+class FittedPreprocessor:
+    """
+    Estado de pré-processamento aprendido uma única vez (fit) e aplicado a
+    qualquer lote com um transform vetorizado, sem reajustar nada.
+
+    Aprende:
+    - fill_values_: média/mediana por coluna numérica (imputação)
+    - min_/max_: limites para normalização min-max das colunas em normalize_columns
+    - categories_: vocabulário de cada coluna em categorical_columns (one-hot)
+
+    O resultado é equivalente ao pipeline do DataProcessor
+    (handle_missing_values -> normalize_features -> encode_categorical),
+    mas pode ser serializado junto do modelo e reaplicado na inferência.
+
+    Para dados maiores que a memória, partial_fit/fit_chunks acumulam as
+    estatísticas chunk a chunk (soma/contagem, min/max, vocabulários) e
+    transform_chunks aplica o transform em uma segunda passada.
+
+    precision='float32' emite as colunas float em float32 e o one-hot em
+    uint8 (metade da memória/banda), e a configuração é salva junto do estado.
+
+    missing_strategy='approx_median'/'approx_quantile' estima a mediana (ou
+    o quantil fill_quantile) com um QuantileSketch por coluna: funciona em
+    partial_fit, e os estados parciais de vários workers são combinados com
+    merge(), então a imputação por mediana vira uma única passada streaming.
+
+    hash_columns são codificadas com o hashing trick em hash_features colunas
+    esparsas fixas: nenhum estado é aprendido para elas, então IDs com milhões
+    de níveis não aumentam o fit nem a largura da saída.
+    """
+
+    def __init__(
+        self,
+        missing_strategy: Optional[str] = "mean",
+        normalize_columns: Optional[List[str]] = None,
+        categorical_columns: Optional[List[str]] = None,
+        exclude_columns: Optional[List[str]] = None,
+        precision: str = "float64",
+        hash_columns: Optional[List[str]] = None,
+        hash_features: int = DEFAULT_HASH_FEATURES,
+        fill_quantile: float = 0.5,
+        sketch_error: float = DEFAULT_SKETCH_ERROR,
+    ) -> None:
+        resolve_precision(precision)
+        if missing_strategy is not None and missing_strategy not in FIT_STRATEGIES:
+            raise ValueError(
+                f"Invalid strategy: {missing_strategy}. "
+                "Choose from 'mean', 'median', 'approx_median', 'approx_quantile' or None."
+            )
+        if not (0.0 <= fill_quantile <= 1.0):
+            raise ValueError("fill_quantile must be between 0.0 and 1.0.")
+        if not (0.0 < sketch_error < 1.0):
+            raise ValueError("sketch_error must be between 0.0 and 1.0 (exclusive).")
+        for name, value in (
+            ("normalize_columns", normalize_columns),
+            ("categorical_columns", categorical_columns),
+            ("exclude_columns", exclude_columns),
+            ("hash_columns", hash_columns),
+        ):
+            if value is not None and not isinstance(value, list):
+                raise ValueError(f"{name} must be a list of column names.")
+        if set(hash_columns or []) & set(categorical_columns or []):
+            raise ValueError("A column cannot be in both categorical_columns and hash_columns.")
+        if not isinstance(hash_features, (int, np.integer)) or hash_features < 1:
+            raise ValueError("hash_features must be a positive integer.")
+
+        self.missing_strategy: Optional[str] = missing_strategy
+        self.normalize_columns: List[str] = list(normalize_columns or [])
+        self.categorical_columns: List[str] = list(categorical_columns or [])
+        self.exclude_columns: List[str] = list(exclude_columns or [])
+        self.precision: str = precision
+        self.hash_columns: List[str] = list(hash_columns or [])
+        self.hash_features: int = int(hash_features)
+        self.fill_quantile: float = 0.5 if missing_strategy == "approx_median" else fill_quantile
+        self.sketch_error: float = sketch_error
+
+        self.fill_values_: Dict[str, float] = {}
+        self.min_: Dict[str, float] = {}
+        self.max_: Dict[str, float] = {}
+        self.categories_: Dict[str, List[Any]] = {}
+        self.feature_names_out_: List[str] = []
+        self.n_samples_seen_: int = 0
+        self._is_fitted: bool = False
+        self._partial_state: Optional[Dict[str, Any]] = None
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pré-processadores salvos antes das opções precision/hash_columns
+        state.setdefault("precision", "float64")
+        state.setdefault("hash_columns", [])
+        state.setdefault("hash_features", DEFAULT_HASH_FEATURES)
+        state.setdefault("fill_quantile", 0.5)
+        state.setdefault("sketch_error", DEFAULT_SKETCH_ERROR)
+        self.__dict__.update(state)
+
+    def __getattr__(self, name: str) -> Any:
+        # Só é chamado quando o atributo não existe: o estado parcial ainda não foi finalizado
+        if name in _FITTED_ATTRIBUTES and self.__dict__.get("_partial_state") is not None:
+            self._finalize_partial_state()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def get_params(self) -> Dict[str, Any]:
+        """Parâmetros de configuração (os do construtor), sem o estado ajustado."""
+        return {
+            "missing_strategy": self.missing_strategy,
+            "normalize_columns": list(self.normalize_columns),
+            "categorical_columns": list(self.categorical_columns),
+            "exclude_columns": list(self.exclude_columns),
+            "precision": self.precision,
+            "hash_columns": list(self.hash_columns),
+            "hash_features": self.hash_features,
+            "fill_quantile": self.fill_quantile,
+            "sketch_error": self.sketch_error,
+        }
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._is_fitted
+
+    def _validate_frame(self, dataframe: pd.DataFrame) -> None:
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame.")
+        if dataframe.empty:
+            raise ValueError("DataFrame cannot be empty.")
+        for col in self.normalize_columns + self.categorical_columns + self.hash_columns:
+            if col not in dataframe.columns:
+                raise ValueError(f"Column '{col}' not found in DataFrame.")
+        for col in self.normalize_columns:
+            if not pd.api.types.is_numeric_dtype(dataframe[col]):
+                raise TypeError(f"Column '{col}' is not numeric and cannot be normalized.")
+
+    def _impute_columns(self, dataframe: pd.DataFrame) -> List[str]:
+        skip = set(self.categorical_columns) | set(self.hash_columns) | set(self.exclude_columns)
+        numeric_cols = dataframe.select_dtypes(include=[np.number]).columns
+        return [c for c in numeric_cols if c not in skip]
+
+    def fit(self, dataframe: pd.DataFrame) -> "FittedPreprocessor":
+        """Aprende estatísticas e vocabulários a partir do DataFrame de treino."""
+        if self.missing_strategy in SKETCH_STRATEGIES:
+            # Mesmo caminho do streaming (um único chunk)
+            self._partial_state = None
+            return self.partial_fit(dataframe)
+        self._validate_frame(dataframe)
+
+        self.fill_values_ = {}
+        if self.missing_strategy is not None:
+            impute_cols = self._impute_columns(dataframe)
+            if len(impute_cols) == 0:
+                raise ValueError("No numeric columns available to fill missing values.")
+            block = dataframe[impute_cols]
+            stats = block.mean() if self.missing_strategy == "mean" else block.median()
+            self.fill_values_ = {col: float(v) for col, v in stats.items()}
+
+        # Após imputação por média/mediana, min/max equivalem aos dos valores observados
+        if self.normalize_columns:
+            block = dataframe[self.normalize_columns]
+            self.min_ = {col: float(v) for col, v in block.min().items()}
+            self.max_ = {col: float(v) for col, v in block.max().items()}
+
+        self.categories_ = {
+            col: _sorted_categories(pd.unique(dataframe[col].dropna()), dataframe[col].isna().any())
+            for col in self.categorical_columns
+        }
+
+        self.feature_names_out_ = self._passthrough(dataframe) + self._encoded_names()
+        self.n_samples_seen_ = len(dataframe)
+        self._partial_state = None
+        self._is_fitted = True
+        return self
+
+    def partial_fit(self, chunk: pd.DataFrame) -> "FittedPreprocessor":
+        """
+        Atualiza as estatísticas com mais um chunk (estilo partial_fit do sklearn).
+        Custo linear e memória limitada ao tamanho do chunk + acumuladores.
+        Os atributos ajustados (fill_values_, min_, ...) só são recalculados
+        no primeiro acesso após o último chunk (ou com finalize()).
+        A mediana exata não é incremental: use fit() no frame completo ou
+        missing_strategy='approx_median' (sketch de quantis).
+        """
+        if self.missing_strategy == "median":
+            raise ValueError(
+                "Strategy 'median' cannot be fitted incrementally. "
+                "Use fit() on the full DataFrame or strategy 'approx_median'."
+            )
+        self._validate_frame(chunk)
+
+        state = self._partial_state
+        if state is None:
+            impute_cols = self._impute_columns(chunk) if self.missing_strategy is not None else []
+            if self.missing_strategy is not None and len(impute_cols) == 0:
+                raise ValueError("No numeric columns available to fill missing values.")
+            state = {
+                "impute_columns": impute_cols,
+                "passthrough": self._passthrough(chunk),
+                "sum": np.zeros(len(impute_cols)),
+                "count": np.zeros(len(impute_cols), dtype=np.int64),
+                "sketches": {
+                    col: QuantileSketch(error=self.sketch_error, random_state=i)
+                    for i, col in enumerate(impute_cols)
+                }
+                if self.missing_strategy in SKETCH_STRATEGIES
+                else {},
+                "min": np.full(len(self.normalize_columns), np.nan),
+                "max": np.full(len(self.normalize_columns), np.nan),
+                "uniques": {col: set() for col in self.categorical_columns},
+                "has_nan": {col: False for col in self.categorical_columns},
+                "n_rows": 0,
+            }
+            self._partial_state = state
+
+        if state["impute_columns"]:
+            block = chunk[state["impute_columns"]].to_numpy(dtype=np.float64)
+            state["sum"] += np.nansum(block, axis=0)
+            state["count"] += np.count_nonzero(~np.isnan(block), axis=0)
+            for j, sketch in enumerate(state["sketches"].values()):
+                sketch.update(block[:, j])
+
+        if self.normalize_columns:
+            block = chunk[self.normalize_columns].to_numpy(dtype=np.float64)
+            # fmin/fmax ignoram NaN (coluna toda NaN no chunk não afeta o acumulado)
+            state["min"] = np.fmin(state["min"], np.nanmin(block, axis=0, initial=np.inf))
+            state["max"] = np.fmax(state["max"], np.nanmax(block, axis=0, initial=-np.inf))
+
+        for col in self.categorical_columns:
+            values = chunk[col]
+            state["uniques"][col].update(pd.unique(values.dropna()))
+            state["has_nan"][col] = state["has_nan"][col] or bool(values.isna().any())
+
+        state["n_rows"] += len(chunk)
+        self._invalidate_fitted_attributes()
+        return self
+
+    def _invalidate_fitted_attributes(self) -> None:
+        for name in _FITTED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        self._is_fitted = True
+
+    def finalize(self) -> "FittedPreprocessor":
+        """
+        Calcula os atributos ajustados a partir do estado parcial. Opcional:
+        transform, save e o acesso a qualquer atributo ajustado já o fazem.
+        """
+        if self._partial_state is not None and any(name not in self.__dict__ for name in _FITTED_ATTRIBUTES):
+            self._finalize_partial_state()
+        return self
+
+    def _finalize_partial_state(self) -> None:
+        state = self._partial_state
+        if state["sketches"]:
+            fills = [sketch.quantile(self.fill_quantile) for sketch in state["sketches"].values()]
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                fills = state["sum"] / state["count"]
+        self.fill_values_ = {col: float(v) for col, v in zip(state["impute_columns"], fills)}
+        # coluna sem nenhum valor observado fica com limites NaN (como no fit)
+        mins = np.where(np.isinf(state["min"]), np.nan, state["min"])
+        maxs = np.where(np.isinf(state["max"]), np.nan, state["max"])
+        self.min_ = {col: float(v) for col, v in zip(self.normalize_columns, mins)}
+        self.max_ = {col: float(v) for col, v in zip(self.normalize_columns, maxs)}
+        self.categories_ = {
+            col: _sorted_categories(state["uniques"][col], state["has_nan"][col])
+            for col in self.categorical_columns
+        }
+        self.feature_names_out_ = state["passthrough"] + self._encoded_names()
+        self.n_samples_seen_ = state["n_rows"]
+        self._is_fitted = True
+
+    def merge(self, other: "FittedPreprocessor") -> "FittedPreprocessor":
+        """
+        Combina o estado parcial de outro preprocessor (ex.: de um worker que
+        rodou partial_fit em outra parte dos dados) com este.
+        """
+        if not isinstance(other, FittedPreprocessor):
+            raise TypeError("other must be a FittedPreprocessor.")
+        if self._partial_state is None or other._partial_state is None:
+            raise RuntimeError("Both preprocessors must be fitted with partial_fit() before merge().")
+        for attr in (
+            "missing_strategy",
+            "normalize_columns",
+            "categorical_columns",
+            "hash_columns",
+            "hash_features",
+            "fill_quantile",
+            "sketch_error",
+            "precision",
+        ):
+            if getattr(self, attr) != getattr(other, attr):
+                raise ValueError(f"Cannot merge preprocessors with different {attr}.")
+
+        state, incoming = self._partial_state, other._partial_state
+        if state["impute_columns"] != incoming["impute_columns"]:
+            raise ValueError("Cannot merge preprocessors fitted on different columns.")
+        state["sum"] = state["sum"] + incoming["sum"]
+        state["count"] = state["count"] + incoming["count"]
+        for col, sketch in state["sketches"].items():
+            sketch.merge(incoming["sketches"][col])
+        state["min"] = np.fmin(state["min"], incoming["min"])
+        state["max"] = np.fmax(state["max"], incoming["max"])
+        for col in self.categorical_columns:
+            state["uniques"][col] |= incoming["uniques"][col]
+            state["has_nan"][col] = state["has_nan"][col] or incoming["has_nan"][col]
+        state["n_rows"] += incoming["n_rows"]
+        self._invalidate_fitted_attributes()
+        return self
+
+    def fit_chunks(self, chunks: Iterable[pd.DataFrame]) -> "FittedPreprocessor":
+        """Primeira passada: ajusta o estado sobre um iterador de chunks."""
+        self._partial_state = None
+        self._is_fitted = False
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        if not self._is_fitted:
+            raise ValueError("chunks cannot be empty.")
+        return self
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Segunda passada: aplica transform chunk a chunk (gerador)."""
+        if not self._is_fitted:
+            raise RuntimeError("FittedPreprocessor is not fitted. Call fit() first.")
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def _passthrough(self, dataframe: pd.DataFrame) -> List[str]:
+        encoded = set(self.categorical_columns) | set(self.hash_columns)
+        return [c for c in dataframe.columns if c not in encoded]
+
+    def _encoded_names(self) -> List[str]:
+        hashed = hashed_feature_names(self.hash_features) if self.hash_columns else []
+        return self._one_hot_names() + hashed
+
+    def _one_hot_names(self) -> List[str]:
+        return [
+            f"{col}_{category}"
+            for col in self.categorical_columns
+            for category in self.categories_[col]
+        ]
+
+    def _one_hot(self, values: pd.Series, categories: List[Any]) -> np.ndarray:
+        known = [c for c in categories if not pd.isna(c)]
+        codes = pd.Categorical(values, categories=known).codes.astype(np.intp)
+        if len(known) < len(categories):
+            # NaN aprendido no fit vira sua própria coluna (como no OneHotEncoder)
+            codes[values.isna().to_numpy()] = len(known)
+        encoded = np.zeros((len(values), len(categories)), dtype=indicator_dtype(self.precision))
+        rows = np.flatnonzero(codes >= 0)
+        encoded[rows, codes[rows]] = 1
+        return encoded
+
+    def transform(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica o estado aprendido a um novo lote (sem reajuste).
+        Categorias desconhecidas viram linhas de zeros (handle_unknown='ignore').
+        Retorna um novo DataFrame (não altera o original).
+        """
+        if not self._is_fitted:
+            raise RuntimeError("FittedPreprocessor is not fitted. Call fit() first.")
+        self._validate_frame(dataframe)
+
+        float_dtype = resolve_precision(self.precision)
+        processed_df = dataframe.drop(columns=self.categorical_columns + self.hash_columns)
+
+        fill = {c: v for c, v in self.fill_values_.items() if c in processed_df.columns}
+        if fill:
+            processed_df.fillna(value=fill, inplace=True)
+
+        if self.normalize_columns:
+            cols = self.normalize_columns
+            mins = np.array([self.min_[c] for c in cols])
+            ranges = np.array([self.max_[c] for c in cols]) - mins
+            # Mesma convenção do MinMaxScaler: range zero -> escala 1
+            ranges[ranges == 0.0] = 1.0
+            block = processed_df[cols].to_numpy(dtype=np.float64)
+            processed_df[cols] = ((block - mins) / ranges).astype(float_dtype, copy=False)
+
+        if float_dtype is not np.float64:
+            # Demais colunas float também seguem a precisão configurada
+            floats = [
+                c for c in processed_df.columns
+                if c not in self.exclude_columns and pd.api.types.is_float_dtype(processed_df[c].dtype)
+                and processed_df[c].dtype != float_dtype
+            ]
+            if floats:
+                processed_df = processed_df.astype({c: float_dtype for c in floats}, copy=False)
+
+        if self.categorical_columns:
+            encoded = np.hstack(
+                [self._one_hot(dataframe[col], self.categories_[col]) for col in self.categorical_columns]
+            )
+            encoded_df = pd.DataFrame(encoded, columns=self._one_hot_names(), index=dataframe.index)
+            processed_df = pd.concat([processed_df, encoded_df], axis=1, copy=False)
+
+        if self.hash_columns:
+            # Sem estado: o mesmo valor cai sempre no mesmo bucket, em qualquer chunk
+            hashed_df = hash_encode_frame(
+                dataframe,
+                self.hash_columns,
+                n_features=self.hash_features,
+                dtype=indicator_dtype(self.precision),
+            )
+            processed_df = pd.concat([processed_df, hashed_df], axis=1, copy=False)
+
+        return processed_df
+
+    def fit_transform(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(dataframe).transform(dataframe)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Serializa o estado ajustado com joblib. O estado parcial (acumuladores
+        e sketches do partial_fit) não é salvo: o arquivo guarda só o que o
+        transform usa.
+        """
+        if not self._is_fitted:
+            raise RuntimeError("FittedPreprocessor is not fitted and cannot be saved.")
+        fitted = copy.copy(self.finalize())
+        fitted._partial_state = None
+        atomic_joblib_dump(fitted, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "FittedPreprocessor":
+        """Carrega um FittedPreprocessor salvo com save()."""
+        path_str = os.fspath(path)
+        if not os.path.exists(path_str):
+            raise FileNotFoundError(f"Preprocessor file not found: {path_str}")
+        preprocessor = joblib.load(path_str)
+        if not isinstance(preprocessor, cls):
+            raise TypeError(f"File does not contain a {cls.__name__}: {path_str}")
+        return preprocessor
@@ -0,0 +1,321 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, TypeVar, Union
+
+try:  # resource não existe no Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+Event = Dict[str, Any]
+
+# Estado global: o wrapper só consulta _ENABLED quando desligado
+_ENABLED = False
+_TRACE_MEMORY = False
+_STARTED_TRACING = False
+_SINKS: List["Sink"] = []
+_LOCK = threading.Lock()
+
+
+class Sink(Protocol):
+    def emit(self, event: Event) -> None: ...
+
+
+class LogSink:
+    """Envia cada evento como JSON para um logger (padrão: nível INFO)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger("innovatenow.instrumentation")
+        self.level = level
+
+    def emit(self, event: Event) -> None:
+        self.logger.log(self.level, json.dumps(event, default=str))
+
+
+class JsonLinesSink:
+    """Acrescenta um evento por linha (JSON Lines) em um arquivo."""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def emit(self, event: Event) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+class MemorySink:
+    """Coleta os eventos em memória (testes, notebooks, relatórios)."""
+
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event: Event) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Agrega por evento: chamadas e tempos de parede/CPU somados."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            entry = totals.setdefault(event["event"], {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+            entry["calls"] += 1
+            entry["wall_seconds"] += event["wall_seconds"]
+            entry["cpu_seconds"] += event["cpu_seconds"]
+        return totals
+
+
+def enable(*sinks: Sink, trace_memory: bool = False) -> None:
+    """
+    Liga a instrumentação e registra os sinks.
+    - trace_memory: inicia o tracemalloc para medir o pico de bytes alocados
+      por chamada
+      (tem custo: deixe desligado quando só tempo importa)
+    """
+    global _ENABLED, _TRACE_MEMORY, _STARTED_TRACING
+    if not sinks:
+        raise ValueError("At least one sink is required.")
+    with _LOCK:
+        _SINKS[:] = list(sinks)
+        _TRACE_MEMORY = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _STARTED_TRACING = True
+        _ENABLED = True
+
+
+def disable() -> None:
+    """Desliga a instrumentação e remove os sinks."""
+    global _ENABLED, _TRACE_MEMORY, _STARTED_TRACING
+    with _LOCK:
+        _ENABLED = False
+        _TRACE_MEMORY = False
+        _SINKS.clear()
+        if _STARTED_TRACING and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _STARTED_TRACING = False
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+@contextmanager
+def collect(trace_memory: bool = False) -> Iterator[MemorySink]:
+    """Liga a instrumentação com um MemorySink dentro do bloco."""
+    sink = MemorySink()
+    enable(sink, trace_memory=trace_memory)
+    try:
+        yield sink
+    finally:
+        disable()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de RSS do processo (ru_maxrss: KiB no Linux, bytes no macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _count_rows(args: tuple, kwargs: Dict[str, Any], result: Any) -> Optional[int]:
+    # 1º argumento com shape (X, dataframe...) -> frame da instância -> resultado
+    for value in (*args, *kwargs.values()):
+        shape = getattr(value, "shape", None)
+        if shape:
+            return int(shape[0])
+    frame = getattr(args[0], "dataframe", None) if args else None
+    if frame is not None and hasattr(frame, "shape"):
+        return int(frame.shape[0])
+    shape = getattr(result, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+def _emit(event: Event) -> None:
+    for sink in list(_SINKS):
+        try:
+            sink.emit(event)
+        except Exception:  # um sink com falha não pode derrubar o pipeline
+            logging.getLogger(__name__).exception("Instrumentation sink failed.")
+
+
+def _make_event(
+    name: str,
+    status: str,
+    wall: float,
+    cpu: float,
+    rows: Optional[int],
+    bytes_allocated: Optional[int],
+) -> Event:
+    return {
+        "event": name,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "status": status,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "rows": rows,
+        "bytes_allocated": bytes_allocated,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "thread": threading.current_thread().name,
+    }
+
+
+class _MemoryWindow:
+    """Medição de memória em andamento: memória no início e maior pico visto desde então."""
+
+    __slots__ = ("baseline", "peak")
+
+    def __init__(self, baseline: int) -> None:
+        self.baseline = baseline
+        self.peak = baseline
+
+
+# O pico do tracemalloc é global: antes de cada reset_peak() o pico corrente é
+# repassado a todas as medições abertas, então chamadas aninhadas (ou um gerador
+# ainda vivo) não perdem o pico de antes da chamada interna
+_OPEN_WINDOWS: List[_MemoryWindow] = []
+_MEMORY_LOCK = threading.Lock()
+
+
+def _propagate_peak() -> int:
+    current, peak = tracemalloc.get_traced_memory()
+    for window in _OPEN_WINDOWS:
+        window.peak = max(window.peak, peak)
+    return current
+
+
+def _memory_start() -> Optional[_MemoryWindow]:
+    if not (_TRACE_MEMORY and tracemalloc.is_tracing()):
+        return None
+    with _MEMORY_LOCK:
+        current = _propagate_peak()
+        tracemalloc.reset_peak()
+        window = _MemoryWindow(current)
+        _OPEN_WINDOWS.append(window)
+    return window
+
+
+def _memory_stop(window: Optional[_MemoryWindow]) -> Optional[int]:
+    """Pico de memória acima do início da medição (um temporário já liberado também conta)."""
+    if window is None:
+        return None
+    with _MEMORY_LOCK:
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            _propagate_peak()
+        _OPEN_WINDOWS.remove(window)
+    return max(window.peak - window.baseline, 0) if tracing else None
+
+
+def _instrument_generator(fn: Callable[..., Iterator[Any]], event_name: str) -> Callable[..., Iterator[Any]]:
+    # Mede apenas o tempo gasto dentro do gerador (soma dos next()),
+    # não o tempo do consumidor entre um item e outro; emite ao final.
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+        if not _ENABLED:
+            return (yield from fn(*args, **kwargs))
+
+        memory = _memory_start()
+        generator = fn(*args, **kwargs)
+        wall = cpu = 0.0
+        items = 0
+        status = "ok"
+        try:
+            while True:
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    wall += time.perf_counter() - wall_start
+                    cpu += time.process_time() - cpu_start
+                items += 1
+                yield item
+        except BaseException as exc:
+            status = "closed" if isinstance(exc, GeneratorExit) else f"error:{type(exc).__name__}"
+            raise
+        finally:
+            event = _make_event(
+                event_name,
+                status,
+                wall,
+                cpu,
+                _count_rows(args, kwargs, None),
+                _memory_stop(memory),
+            )
+            event["items"] = items
+            _emit(event)
+
+    return wrapper
+
+
+def instrumented(func: Optional[F] = None, *, name: Optional[str] = None) -> Any:
+    """
+    Decorador que emite um evento por chamada com wall/CPU time, linhas
+    processadas, pico de bytes alocados durante a chamada (tracemalloc) e
+    pico de RSS.
+    Desligado, custa apenas a checagem de uma flag global.
+    Funções geradoras emitem um único evento quando o gerador termina.
+    """
+
+    def decorate(fn: F) -> F:
+        event_name = name or fn.__qualname__
+        if inspect.isgeneratorfunction(fn):
+            return _instrument_generator(fn, event_name)  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+
+            memory = _memory_start()
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            status = "ok"
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            except BaseException as exc:
+                status = f"error:{type(exc).__name__}"
+                raise
+            finally:
+                wall = time.perf_counter() - wall_start
+                cpu = time.process_time() - cpu_start
+                _emit(
+                    _make_event(
+                        event_name,
+                        status,
+                        wall,
+                        cpu,
+                        _count_rows(args, kwargs, result),
+                        _memory_stop(memory),
+                    )
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    if func is not None:
+        return decorate(func)
+    return decorate
@@ -0,0 +1,161 @@
+"""
+metrics.py
+
+Métricas de classificação calculadas a partir de contagens:
+- a matriz de confusão sai de um único np.bincount sobre os códigos de par
+  (classe_real * n_classes + classe_predita), o que permite acumular chunks
+- precision/recall/F1/acurácia são derivadas da matriz, vetorizadas sobre
+  qualquer número de matrizes (ex.: réplicas de bootstrap)
+- o bootstrap reamostra as contagens (multinomial sobre as células da
+  matriz), equivalente a reamostrar as linhas, sem repetir o predict
+- a ROC-AUC aproximada vem de histogramas de score por classe
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_SCORE_BINS = 1000
+
+
+def encode_labels(y: Any, classes: Sequence[Any]) -> np.ndarray:
+    """Converte rótulos em códigos 0..n_classes-1 segundo `classes`."""
+    classes_arr = np.asarray(classes)
+    values = np.asarray(y)
+    order = np.argsort(classes_arr, kind="stable")
+    positions = np.searchsorted(classes_arr[order], values)
+    positions = np.clip(positions, 0, len(classes_arr) - 1)
+    codes = order[positions]
+    unknown = classes_arr[codes] != values
+    if np.any(unknown):
+        raise ValueError(f"Unknown labels: {sorted(set(values[unknown].tolist()))[:10]}.")
+    return codes.astype(np.int64, copy=False)
+
+
+def confusion_from_codes(true_codes: np.ndarray, pred_codes: np.ndarray, n_classes: int) -> np.ndarray:
+    """Matriz de confusão (linhas = real, colunas = predito) via bincount."""
+    pairs = true_codes * n_classes + pred_codes
+    return np.bincount(pairs, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # zero_division=0, como no padrão do sklearn (sem warnings)
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape, dtype=np.float64),
+        where=denominator != 0,
+    )
+
+
+def scores_from_confusion(confusion: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Acurácia, precision, recall e F1 de uma ou mais matrizes (..., k, k).
+    Binário (k=2): métricas da classe positiva (índice 1); senão, média macro.
+    """
+    confusion = np.asarray(confusion, dtype=np.float64)
+    tp = np.diagonal(confusion, axis1=-2, axis2=-1)
+    predicted = confusion.sum(axis=-2)
+    actual = confusion.sum(axis=-1)
+    total = confusion.sum(axis=(-2, -1))
+
+    precision = _safe_divide(tp, predicted)
+    recall = _safe_divide(tp, actual)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+
+    if confusion.shape[-1] == 2:
+        reduce = lambda values: values[..., 1]  # noqa: E731
+    else:
+        reduce = lambda values: values.mean(axis=-1)  # noqa: E731
+
+    return {
+        "accuracy": _safe_divide(tp.sum(axis=-1), total),
+        "precision": reduce(precision),
+        "recall": reduce(recall),
+        "f1": reduce(f1),
+        "per_class_precision": precision,
+        "per_class_recall": recall,
+        "per_class_f1": f1,
+    }
+
+
+def bootstrap_confusions(
+    confusion: np.ndarray,
+    n_bootstrap: int,
+    random_state: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Réplicas de bootstrap da matriz de confusão, shape (n_bootstrap, k, k).
+    Reamostrar n linhas com reposição equivale a uma multinomial sobre as
+    células da matriz, então o custo independe do número de linhas.
+    """
+    counts = np.asarray(confusion, dtype=np.int64).ravel()
+    n = int(counts.sum())
+    if n == 0:
+        raise ValueError("confusion matrix is empty.")
+    rng = np.random.default_rng(random_state)
+    samples = rng.multinomial(n, counts / n, size=n_bootstrap)
+    return samples.reshape((n_bootstrap,) + np.shape(confusion))
+
+
+def confidence_interval(samples: np.ndarray, confidence: float = 0.95) -> Dict[str, float]:
+    """Intervalo percentil das réplicas."""
+    if not (0.0 < confidence < 1.0):
+        raise ValueError("confidence must be between 0.0 and 1.0 (exclusive).")
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(samples, [alpha, 1.0 - alpha])
+    return {"low": float(low), "high": float(high)}
+
+
+def score_histograms(true_codes: np.ndarray, probabilities: np.ndarray, n_bins: int = DEFAULT_SCORE_BINS) -> np.ndarray:
+    """
+    Histogramas de score por classe (one-vs-rest), shape (k, 2, n_bins):
+    [c, 0] = scores de proba[:, c] das linhas de outras classes, [c, 1] = da classe c.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n_classes = probabilities.shape[1]
+    bins = np.clip((probabilities * n_bins).astype(np.int64), 0, n_bins - 1)
+    histograms = np.empty((n_classes, 2, n_bins), dtype=np.int64)
+    for c in range(n_classes):
+        positive = true_codes == c
+        cells = positive.astype(np.int64) * n_bins + bins[:, c]
+        histograms[c] = np.bincount(cells, minlength=2 * n_bins).reshape(2, n_bins)
+    return histograms
+
+
+def auc_from_histograms(histograms: np.ndarray) -> np.ndarray:
+    """
+    ROC-AUC a partir de histogramas (..., 2, n_bins): P(score_pos > score_neg),
+    com empates no mesmo bin contando 1/2. NaN se faltar uma das classes.
+    """
+    histograms = np.asarray(histograms, dtype=np.float64)
+    negatives = histograms[..., 0, :]
+    positives = histograms[..., 1, :]
+    below = np.cumsum(negatives, axis=-1) - negatives
+    wins = (positives * (below + 0.5 * negatives)).sum(axis=-1)
+    pairs = positives.sum(axis=-1) * negatives.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(pairs > 0, wins / pairs, np.nan)
+
+
+def macro_auc_from_histograms(histograms: np.ndarray) -> Optional[float]:
+    """AUC binária (classe 1) ou macro one-vs-rest; None se indefinida."""
+    per_class = auc_from_histograms(histograms)
+    if per_class.shape[0] == 2:
+        value = per_class[1]
+    else:
+        defined = per_class[~np.isnan(per_class)]
+        value = defined.mean() if defined.size else np.nan
+    return None if np.isnan(value) else float(value)
+
+
+def bootstrap_binary_auc(
+    histogram: np.ndarray,
+    n_bootstrap: int,
+    random_state: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Réplicas de AUC binária reamostrando as células (classe, bin) do
+    histograma (2, n_bins) — mesma ideia de bootstrap_confusions.
+    """
+    return auc_from_histograms(bootstrap_confusions(histogram, n_bootstrap, random_state))
@@ -0,0 +1,19 @@
+from typing import Any, Dict
+
+import numpy as np
+
+# Tipos de ponto flutuante aceitos em todo o pipeline.
+# float32 reduz pela metade memória e banda; indicadores (one-hot) usam uint8.
+PRECISIONS: Dict[str, Any] = {"float64": np.float64, "float32": np.float32}
+
+
+def resolve_precision(precision: str) -> Any:
+    """Valida o nome da precisão e retorna o dtype numpy correspondente."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Invalid precision: {precision}. Choose from {sorted(PRECISIONS)}.")
+    return PRECISIONS[precision]
+
+
+def indicator_dtype(precision: str) -> Any:
+    """dtype das colunas indicadoras (one-hot): uint8 em float32, float64 caso contrário."""
+    return np.uint8 if resolve_precision(precision) is np.float32 else np.float64
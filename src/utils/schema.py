@@ -0,0 +1,326 @@
+"""
+schema.py
+
+Schema de entrada (colunas, tipos, nulos, faixas e categorias) inferido dos
+dados de treino ou declarado, e compilado uma única vez em checagens
+vetorizadas:
+- a checagem de tipo é O(1) por coluna (só olha o dtype)
+- nulos, faixas e categorias são contagens com NumPy/pandas sobre a coluna
+- o resultado lista cada violação com o número de linhas afetadas
+
+validate() retorna o relatório; enforce() levanta SchemaValidationError
+se houver violações e devolve o próprio DataFrame, para uso no carregamento
+(load_data) e no scoring (BatchPredictor).
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.serialization import atomic_write_json
+
+COLUMN_KINDS = {"integer", "float", "boolean", "datetime", "categorical"}
+_NUMERIC_KINDS = {"integer", "float"}
+
+Violation = Dict[str, Any]
+_Check = Callable[[pd.Series], List[Violation]]
+
+
+class SchemaValidationError(ValueError):
+    """Lote que não respeita o schema; o relatório completo fica em `report`."""
+
+    def __init__(self, report: Dict[str, Any]) -> None:
+        self.report = report
+        details = "; ".join(
+            f"{v['column']}: {v['check']} ({v['rows']} rows)" for v in report["violations"][:10]
+        )
+        super().__init__(f"Schema validation failed for {report['rows']} rows: {details}")
+
+
+def _kind_of(dtype: Any) -> str:
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "integer"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "categorical"
+
+
+def _kind_matches(expected: str, dtype: Any) -> bool:
+    actual = _kind_of(dtype)
+    if expected in _NUMERIC_KINDS:
+        # Inteiros com NaN chegam como float, e floats aceitam inteiros
+        return actual in _NUMERIC_KINDS
+    return actual == expected
+
+
+class ColumnSchema:
+    """Regras de uma coluna."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        nullable: bool = True,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        categories: Optional[Sequence[Any]] = None,
+    ) -> None:
+        if kind not in COLUMN_KINDS:
+            raise ValueError(f"Invalid kind: {kind}. Choose from {sorted(COLUMN_KINDS)}.")
+        if (min_value is not None or max_value is not None) and kind not in _NUMERIC_KINDS:
+            raise ValueError(f"min_value/max_value require a numeric kind (column '{name}').")
+        if categories is not None and kind != "categorical":
+            raise ValueError(f"categories require kind 'categorical' (column '{name}').")
+        self.name = name
+        self.kind = kind
+        self.nullable = nullable
+        self.min_value = None if min_value is None else float(min_value)
+        self.max_value = None if max_value is None else float(max_value)
+        self.categories: Optional[List[Any]] = None if categories is None else list(categories)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "nullable": self.nullable,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "categories": self.categories,
+        }
+
+    def compile(self) -> List[_Check]:
+        """Checagens vetorizadas da coluna (cada uma retorna as violações encontradas)."""
+        name, kind, nullable = self.name, self.kind, self.nullable
+        checks: List[_Check] = []
+
+        def check_kind(series: pd.Series) -> List[Violation]:
+            if _kind_matches(kind, series.dtype):
+                return []
+            # Um chunk só com nulos chega como float64 (ou object) seja qual for o tipo
+            if nullable and len(series) and bool(series.isna().all()):
+                return []
+            return [{"column": name, "check": "dtype", "rows": len(series), "detail": f"expected {kind}, got {series.dtype}"}]
+
+        checks.append(check_kind)
+
+        if kind == "categorical":
+            if not self.nullable or self.categories is not None:
+                checks.append(self._compile_categorical())
+            return checks
+
+        if not self.nullable:
+
+            def check_nulls(series: pd.Series) -> List[Violation]:
+                count = int(series.isna().sum())
+                return [{"column": name, "check": "nulls", "rows": count, "detail": "null values"}] if count else []
+
+            checks.append(check_nulls)
+
+        if self.min_value is not None or self.max_value is not None:
+            low = -np.inf if self.min_value is None else self.min_value
+            high = np.inf if self.max_value is None else self.max_value
+
+            def check_range(series: pd.Series) -> List[Violation]:
+                if not _kind_matches("float", series.dtype):
+                    return []  # já reportado pela checagem de tipo
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                # Comparações com NaN são falsas: nulos não contam como fora da faixa
+                count = int(np.count_nonzero(values < low) + np.count_nonzero(values > high))
+                if not count:
+                    return []
+                return [{"column": name, "check": "range", "rows": count, "detail": f"outside [{low}, {high}]"}]
+
+            checks.append(check_range)
+
+        return checks
+
+    def _compile_categorical(self) -> _Check:
+        # Nulos e categorias numa única checagem: em colunas object, isna/isin
+        # custam uma passada cada; os valores únicos (uma passada com hash)
+        # resolvem o caso comum, e a contagem por linha só roda se houver problema
+        name, nullable = self.name, self.nullable
+        allowed = None if self.categories is None else pd.Index(self.categories)
+
+        def check(series: pd.Series) -> List[Violation]:
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                uniques = series.cat.categories
+                has_nulls = bool((series.cat.codes.to_numpy() < 0).any())
+            else:
+                uniques = pd.Index(pd.unique(series))
+                has_nulls = bool(uniques.isna().any())
+                uniques = uniques[uniques.notna()]
+
+            violations = []
+            if not nullable and has_nulls:
+                violations.append({"column": name, "check": "nulls", "rows": int(series.isna().sum()), "detail": "null values"})
+            if allowed is not None:
+                unknown = uniques[~uniques.isin(allowed)]
+                if len(unknown):
+                    count = int(series.isin(unknown).sum())
+                    violations.append({"column": name, "check": "categories", "rows": count, "detail": "unknown categories"})
+            return violations
+
+        return check
+
+
+class DataSchema:
+    """
+    Schema de um DataFrame: inferido (infer) ou declarado (lista de ColumnSchema).
+    As checagens são compiladas no primeiro validate() e reutilizadas em todos
+    os lotes seguintes.
+    """
+
+    def __init__(self, columns: Sequence[ColumnSchema], allow_extra_columns: bool = True) -> None:
+        if not columns:
+            raise ValueError("columns must be a non-empty list of ColumnSchema.")
+        names = [column.name for column in columns]
+        if len(set(names)) != len(names):
+            raise ValueError("Column names in a schema must be unique.")
+        self.columns: List[ColumnSchema] = list(columns)
+        self.allow_extra_columns = allow_extra_columns
+        self._compiled: Optional[List[Tuple[str, List[_Check]]]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Closures compiladas não são picklable (ex.: pool de processos); recompila no destino
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        return state
+
+    @classmethod
+    def infer(
+        cls,
+        dataframe: pd.DataFrame,
+        exclude: Optional[List[str]] = None,
+        nullable: Optional[bool] = True,
+        range_margin: Optional[float] = None,
+        max_categories: Optional[int] = None,
+        allow_extra_columns: bool = True,
+    ) -> "DataSchema":
+        """
+        Infere o schema dos dados de treino.
+        - nullable: True (padrão) aceita nulos em todas as colunas; None usa o
+          observado (colunas sem nulos no treino passam a rejeitá-los)
+        - range_margin: fração da amplitude observada tolerada além do min/max
+          (None = sem checagem de faixa)
+        - max_categories: registra o vocabulário de colunas categóricas com até
+          esse número de níveis (None = sem checagem de categorias)
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame.")
+        if dataframe.empty:
+            raise ValueError("DataFrame cannot be empty.")
+        if range_margin is not None and range_margin < 0:
+            raise ValueError("range_margin must be >= 0.")
+
+        skip = set(exclude or [])
+        columns = []
+        for name in dataframe.columns:
+            if name in skip:
+                continue
+            series = dataframe[name]
+            kind = _kind_of(series.dtype)
+            min_value = max_value = None
+            categories = None
+            if range_margin is not None and kind in _NUMERIC_KINDS and series.notna().any():
+                low, high = float(series.min()), float(series.max())
+                margin = (high - low) * range_margin
+                min_value, max_value = low - margin, high + margin
+            if max_categories is not None and kind == "categorical":
+                uniques = pd.unique(series.dropna())
+                if len(uniques) <= max_categories:
+                    categories = uniques.tolist()
+            columns.append(
+                ColumnSchema(
+                    name,
+                    kind,
+                    nullable=bool(series.isna().any()) if nullable is None else nullable,
+                    min_value=min_value,
+                    max_value=max_value,
+                    categories=categories,
+                )
+            )
+        return cls(columns, allow_extra_columns=allow_extra_columns)
+
+    def compile(self) -> "DataSchema":
+        """Gera as checagens vetorizadas (feito uma vez por schema)."""
+        self._compiled = [(column.name, column.compile()) for column in self.columns]
+        return self
+
+    def validate(self, dataframe: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Aplica as checagens compiladas a um lote.
+
+        Returns
+        ----
+        dict
+            'rows', 'valid', 'violations' (coluna, checagem, linhas afetadas,
+            detalhe) e 'seconds'.
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame.")
+        if self._compiled is None:
+            self.compile()
+
+        start = time.perf_counter()
+        n_rows = len(dataframe)
+        violations: List[Violation] = []
+        present = set(dataframe.columns)
+        for name, checks in self._compiled:
+            if name not in present:
+                violations.append({"column": name, "check": "missing", "rows": n_rows, "detail": "column not found"})
+                continue
+            series = dataframe[name]
+            for check in checks:
+                violations.extend(check(series))
+
+        if not self.allow_extra_columns:
+            extra = sorted(str(c) for c in present - {column.name for column in self.columns})
+            if extra:
+                violations.append({"column": ", ".join(extra), "check": "extra_columns", "rows": n_rows, "detail": "unexpected columns"})
+
+        return {
+            "rows": n_rows,
+            "valid": not violations,
+            "violations": violations,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def enforce(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Valida e devolve o próprio lote; levanta SchemaValidationError se inválido."""
+        report = self.validate(dataframe)
+        if not report["valid"]:
+            raise SchemaValidationError(report)
+        return dataframe
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "allow_extra_columns": self.allow_extra_columns,
+            "columns": [column.to_dict() for column in self.columns],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DataSchema":
+        return cls(
+            [ColumnSchema(**column) for column in data["columns"]],
+            allow_extra_columns=data.get("allow_extra_columns", True),
+        )
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Grava o schema em JSON (escrita atômica)."""
+        atomic_write_json(self.to_dict(), path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "DataSchema":
+        path_str = os.fspath(path)
+        if not os.path.exists(path_str):
+            raise FileNotFoundError(f"Schema file not found: {path_str}")
+        with open(path_str, "r", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
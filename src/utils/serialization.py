@@ -0,0 +1,91 @@
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple, Union
+
+import joblib
+
+COMPRESSION_METHODS = {None, "zlib", "lz4"}
+_HASH_BLOCK_SIZE = 1 << 20
+
+# Lida uma vez na importação (os.umask só pode ser lida trocando-a)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def compression_arg(method: Optional[str], level: int = 3) -> Union[int, Tuple[str, int]]:
+    """
+    Traduz (método, nível) para o argumento `compress` do joblib.dump.
+    - None: sem compressão (permite carregar com mmap_mode)
+    - 'zlib': nível 1-9 (maior = arquivo menor, save mais lento)
+    - 'lz4': muito rápido para carregar; requer o pacote 'lz4'
+    """
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(f"Invalid compression: {method}. Choose from None, 'zlib' or 'lz4'.")
+    if method is None:
+        return 0
+    if not isinstance(level, int) or not (1 <= level <= 9):
+        raise ValueError("compression level must be an integer between 1 and 9.")
+    if method == "lz4" and importlib.util.find_spec("lz4") is None:
+        raise ImportError("compression='lz4' requires the 'lz4' package.")
+    return (method, level)
+
+
+def file_sha256(path: Union[str, os.PathLike]) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_file_mode(path: Union[str, os.PathLike]) -> None:
+    """
+    Aplica ao arquivo as permissões de um open() comum (0o666 sem a umask).
+    mkstemp cria com 0600 e os.replace mantém o modo: sem isso o arquivo
+    final ficaria legível só pelo dono.
+    """
+    os.chmod(path, 0o666 & ~_UMASK)
+
+
+def _atomic_target(path: Union[str, os.PathLike]) -> Tuple[str, str]:
+    path_str = os.fspath(path)
+    directory = os.path.dirname(path_str)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".part", dir=directory or None)
+    os.close(fd)
+    return path_str, tmp_path
+
+
+def atomic_joblib_dump(obj: Any, path: Union[str, os.PathLike], compress: Union[int, Tuple[str, int]] = 0) -> None:
+    """
+    joblib.dump em um arquivo temporário no mesmo diretório + os.replace:
+    leitores nunca veem um arquivo parcialmente escrito.
+    """
+    path_str, tmp_path = _atomic_target(path)
+    try:
+        joblib.dump(obj, tmp_path, compress=compress)
+        default_file_mode(tmp_path)
+        os.replace(tmp_path, path_str)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(data: Dict[str, Any], path: Union[str, os.PathLike]) -> None:
+    """Grava JSON de forma atômica (temporário + os.replace)."""
+    path_str, tmp_path = _atomic_target(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True, default=str)
+        default_file_mode(tmp_path)
+        os.replace(tmp_path, path_str)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,56 @@
+"""
+shared_frames.py
+
+Empacota DataFrames/Series em arrays numpy/CSR para serem gravados uma
+única vez com joblib e reabertos pelos workers com mmap_mode='r' (usado
+por ModelSweep e CrossValidator):
+- frames numéricos viram uma matriz contígua no dtype pedido
+- frames com colunas esparsas viram uma matriz CSR
+- frames com colunas não numéricas são guardados como estão
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.model_trainer import to_estimator_input
+
+
+def pack_frame(X: pd.DataFrame, dtype: Any = np.float64) -> Dict[str, Any]:
+    """
+    Converte X em arrays numpy/CSR (em `dtype`) que o joblib consegue mapear
+    em memória. Frames com colunas não numéricas (ex.: strings para um
+    Pipeline do sklearn) são guardados como estão, sem conversão.
+    """
+    if any(isinstance(col_dtype, pd.SparseDtype) for col_dtype in X.dtypes):
+        matrix = to_estimator_input(X, dtype=dtype)
+        return {"kind": "sparse", "matrix": matrix, "columns": list(X.columns), "index": X.index}
+    if not all(pd.api.types.is_numeric_dtype(col_dtype) for col_dtype in X.dtypes):
+        return {"kind": "frame", "frame": X}
+    return {
+        "kind": "dense",
+        "matrix": np.ascontiguousarray(X.to_numpy(dtype=dtype, na_value=np.nan)),
+        "columns": list(X.columns),
+        "index": X.index,
+    }
+
+
+def unpack_frame(packed: Dict[str, Any]) -> pd.DataFrame:
+    """Reconstrói o DataFrame de pack_frame (sem cópia para matrizes densas)."""
+    if packed["kind"] == "frame":
+        return packed["frame"]
+    if packed["kind"] == "sparse":
+        return pd.DataFrame.sparse.from_spmatrix(
+            packed["matrix"], index=packed["index"], columns=packed["columns"]
+        )
+    # copy=False: o DataFrame é apenas uma view sobre o memmap compartilhado
+    return pd.DataFrame(packed["matrix"], index=packed["index"], columns=packed["columns"], copy=False)
+
+
+def pack_series(y: pd.Series) -> Dict[str, Any]:
+    return {"values": y.to_numpy(), "index": y.index, "name": y.name}
+
+
+def unpack_series(packed: Dict[str, Any]) -> pd.Series:
+    return pd.Series(packed["values"], index=packed["index"], name=packed["name"], copy=False)
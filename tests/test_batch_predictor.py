@@ -0,0 +1,169 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.batch_predictor import BatchPredictor
+from src.model_trainer import ModelTrainer
+from src.utils.fitted_preprocessor import FittedPreprocessor
+
+
+@pytest.fixture
+def raw_data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 120
+    num = rng.normal(size=n)
+    cat = rng.choice(["A", "B", "C"], size=n)
+    return pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "num": num,
+            "cat": cat,
+            "target": ((num > 0) | (cat == "A")).astype(int),
+        }
+    )
+
+
+@pytest.fixture
+def model_path(tmp_path: Path, raw_data: pd.DataFrame) -> Path:
+    """
+    Treina e salva modelo + pré-processador, como no main.py.
+    """
+    preprocessor = FittedPreprocessor(
+        normalize_columns=["num"], categorical_columns=["cat"], exclude_columns=["id", "target"]
+    )
+    processed = preprocessor.fit_transform(raw_data)
+
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(processed.drop(columns=["id", "target"]), processed["target"])
+
+    path = tmp_path / "model.joblib"
+    trainer.save_model(path, preprocessor=preprocessor)
+    return path
+
+
+@pytest.fixture
+def input_csv(tmp_path: Path, raw_data: pd.DataFrame) -> Path:
+    path = tmp_path / "input.csv"
+    raw_data.drop(columns=["target"]).to_csv(path, index=False)
+    return path
+
+
+def _expected_predictions(model_path: Path, raw_data: pd.DataFrame) -> np.ndarray:
+    model = ModelTrainer.load_model(model_path)
+    preprocessor = ModelTrainer.load_preprocessor(model_path)
+    features = preprocessor.transform(raw_data.drop(columns=["target"]))
+    return model.predict(features[list(model.feature_names_in_)])
+
+
+@pytest.mark.parametrize("executor", [None, "thread", "process"])
+def test_predict_file_matches_in_memory_predictions(
+    tmp_path: Path, model_path: Path, input_csv: Path, raw_data: pd.DataFrame, executor
+) -> None:
+    predictor = BatchPredictor.from_model_path(model_path)
+    output = tmp_path / "out" / "predictions.csv"
+
+    stats = predictor.predict_file(
+        input_csv, output, chunksize=25, keep_columns=["id"], executor=executor, max_workers=2
+    )
+
+    result = pd.read_csv(output)
+    assert stats["rows"] == len(raw_data)
+    assert stats["chunks"] == 5
+    assert stats["rows_per_second"] > 0
+    np.testing.assert_array_equal(result["id"], raw_data["id"])
+    np.testing.assert_array_equal(result["prediction"], _expected_predictions(model_path, raw_data))
+
+
+def test_predict_frame_with_proba(model_path: Path, raw_data: pd.DataFrame) -> None:
+    predictor = BatchPredictor.from_model_path(model_path)
+    scored = predictor.predict_frame(raw_data.drop(columns=["target"]).iloc[:10], proba=True)
+
+    assert list(scored.columns) == ["prediction", "proba_0", "proba_1"]
+    np.testing.assert_allclose(scored[["proba_0", "proba_1"]].sum(axis=1), 1.0)
+
+
+def test_predict_file_invalid_arguments(tmp_path: Path, model_path: Path, input_csv: Path) -> None:
+    predictor = BatchPredictor.from_model_path(model_path)
+
+    with pytest.raises(ValueError):
+        predictor.predict_file(input_csv, tmp_path / "o.csv", executor="gpu")
+    with pytest.raises(FileNotFoundError):
+        predictor.predict_file(tmp_path / "missing.csv", tmp_path / "o.csv")
+    with pytest.raises(TypeError):
+        BatchPredictor(object())
+
+
+def test_schema_saved_with_model_is_enforced_per_chunk(
+    tmp_path: Path, model_path: Path, raw_data: pd.DataFrame
+) -> None:
+    from src.utils.schema import DataSchema, SchemaValidationError
+
+    trainer = ModelTrainer.from_trained_model(ModelTrainer.load_model(model_path))
+    schema = DataSchema.infer(raw_data, exclude=["target"])
+    metadata = trainer.save_model(model_path, preprocessor=ModelTrainer.load_preprocessor(model_path), schema=schema)
+    assert metadata["has_schema"]
+
+    predictor = BatchPredictor.from_model_path(model_path)
+    assert predictor.schema is not None
+    assert len(predictor.predict_frame(raw_data.drop(columns=["target"]))) == len(raw_data)
+
+    with pytest.raises(SchemaValidationError, match="num: dtype"):
+        predictor.predict_frame(raw_data.drop(columns=["target"]).assign(num="x"))
+
+
+def test_schema_accepts_chunk_where_nullable_column_is_all_null(
+    tmp_path: Path, model_path: Path, raw_data: pd.DataFrame
+) -> None:
+    from src.utils.schema import DataSchema
+
+    trainer = ModelTrainer.from_trained_model(ModelTrainer.load_model(model_path))
+    schema = DataSchema.infer(raw_data, exclude=["target"])
+    trainer.save_model(model_path, preprocessor=ModelTrainer.load_preprocessor(model_path), schema=schema)
+
+    data = raw_data.drop(columns=["target"])
+    data.loc[:1, "cat"] = np.nan  # o primeiro chunk lê "cat" como float64
+    input_csv = tmp_path / "nulls.csv"
+    data.to_csv(input_csv, index=False)
+
+    predictor = BatchPredictor.from_model_path(model_path)
+    stats = predictor.predict_file(input_csv, tmp_path / "out.csv", chunksize=2)
+    assert stats["rows"] == len(data)
+
+    strict = DataSchema.infer(raw_data, exclude=["target"], nullable=None)
+    report = strict.validate(data.iloc[:2].astype({"cat": np.float64}))
+    assert [v["check"] for v in report["violations"]] == ["dtype", "nulls"]
+
+
+def test_sidecars_follow_model_metadata(model_path: Path) -> None:
+    import os
+    import shutil
+
+    sidecar = Path(ModelTrainer.preprocessor_path(model_path))
+    backup = model_path.with_name("old.preprocessor.joblib")
+    shutil.copy(sidecar, backup)
+    trainer = ModelTrainer.from_trained_model(ModelTrainer.load_model(model_path))
+    trainer.save_model(model_path)
+    # Um sidecar que sobrou (ex.: copiado de volta) não pertence ao novo modelo
+    shutil.copy(backup, sidecar)
+
+    assert ModelTrainer.read_metadata(model_path)["has_preprocessor"] is False
+    assert BatchPredictor.from_model_path(model_path).preprocessor is None
+
+    # Sem metadados (modelos antigos), vale a existência do arquivo
+    os.remove(ModelTrainer.metadata_path(model_path))
+    assert BatchPredictor.from_model_path(model_path).preprocessor is not None
+
+
+def test_predict_file_output_gets_default_permissions(tmp_path: Path, model_path: Path, input_csv: Path) -> None:
+    import os
+    import stat
+
+    output = tmp_path / "out" / "predictions.csv"
+    BatchPredictor.from_model_path(model_path).predict_file(input_csv, output, chunksize=50)
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(output).st_mode) == 0o666 & ~umask
@@ -0,0 +1,104 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from src.benchmark import compare_to_baseline, main, make_synthetic_dataset, measure, parse_size, run_benchmarks
+
+STAGES = [
+    "load_data",
+    "validate_schema",
+    "handle_missing_values",
+    "normalize_features",
+    "encode_categorical",
+    "split",
+    "train",
+    "evaluate",
+    "save_model",
+    "load_model",
+]
+
+
+def test_parse_size_aliases_and_errors() -> None:
+    assert parse_size("10k") == 10_000
+    assert parse_size("1M") == 1_000_000
+    assert parse_size("2500") == 2500
+    with pytest.raises(ValueError):
+        parse_size("huge")
+
+
+def test_measure_leaves_an_outer_tracer_running() -> None:
+    tracemalloc.start()
+    try:
+        _, _, peak = measure(lambda: bytearray(1 << 20))
+        assert tracemalloc.is_tracing()
+        assert peak >= 1 << 20
+    finally:
+        tracemalloc.stop()
+
+    _, _, peak = measure(lambda: bytearray(1 << 20))
+    assert peak >= 1 << 20
+    assert not tracemalloc.is_tracing()
+
+
+def test_make_synthetic_dataset_shape() -> None:
+    df = make_synthetic_dataset(100, n_numeric=3, n_categorical=2, cardinality=5)
+    assert df.shape == (100, 6)
+    assert df["num_0"].isna().any()
+    assert set(df["target"].unique()) <= {0, 1}
+
+
+def test_run_benchmarks_reports_every_stage(tmp_path: Path) -> None:
+    report = run_benchmarks(sizes=[500], n_numeric=3, n_categorical=1, cardinality=4, workdir=str(tmp_path))
+
+    stages = report["results"]["500"]
+    assert list(stages) == STAGES
+    for metrics in stages.values():
+        assert metrics["seconds"] >= 0
+        assert metrics["peak_bytes"] > 0
+    assert 0.0 <= stages["evaluate"]["accuracy"] <= 1.0
+
+
+def test_compare_to_baseline_flags_regressions() -> None:
+    baseline = {"results": {"10k": {"train": {"seconds": 1.0, "peak_bytes": 1000}}}}
+    ok = {"results": {"10k": {"train": {"seconds": 1.1, "peak_bytes": 1100}}}}
+    slow = {"results": {"10k": {"train": {"seconds": 2.0, "peak_bytes": 5000}}}}
+
+    assert compare_to_baseline(ok, baseline, threshold=0.25) == []
+    regressions = compare_to_baseline(slow, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("10k/train")
+
+
+def test_main_fails_on_regression(tmp_path: Path) -> None:
+    baseline_path = tmp_path / "baseline.json"
+    args = ["--sizes", "300", "--numeric", "2", "--categorical", "1"]
+
+    assert main(args + ["--save-baseline", str(baseline_path)]) == 0
+
+    # baseline artificialmente enxuto -> toda etapa regride em memória
+    baseline = json.loads(baseline_path.read_text())
+    for metrics in baseline["results"]["300"].values():
+        metrics["peak_bytes"] = 1
+    baseline_path.write_text(json.dumps(baseline))
+
+    assert main(args + ["--baseline", str(baseline_path)]) == 1
+
+
+def test_run_benchmarks_reports_float32_accuracy_delta(tmp_path: Path) -> None:
+    report = run_benchmarks(
+        sizes=[400],
+        n_numeric=3,
+        n_categorical=1,
+        cardinality=4,
+        track_memory=False,
+        workdir=str(tmp_path),
+        precisions=["float64", "float32"],
+    )
+
+    assert set(report["results"]) == {"400", "400@float32"}
+    assert list(report["results"]["400@float32"]) == STAGES
+    delta = report["accuracy_deltas"]["400"]["float32"]
+    float32_accuracy = report["results"]["400@float32"]["evaluate"]["accuracy"]
+    assert delta == pytest.approx(float32_accuracy - report["results"]["400"]["evaluate"]["accuracy"])
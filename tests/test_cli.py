@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.cli import main
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    path = tmp_path / "train.csv"
+    pd.DataFrame(
+        {
+            "feature1": [1.0, 2.0, None, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0],
+            "feature2": ["A", "B", "A", "C", "B", "A", "C", "B", "A", "B", "C", "A"],
+            "target": [0, 1, 0, 1, 1, 0, 1, 0, 0, 1, 1, 0],
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_train_evaluate_predict_round_trip(csv_path: Path, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    model_path = tmp_path / "models" / "model.joblib"
+    output_path = tmp_path / "predictions.csv"
+
+    assert main(["train", "--data", str(csv_path), "--model-path", str(model_path), "--sample-predictions", "2"]) == 0
+    out = capsys.readouterr()
+    assert "Acurácia do modelo" in out.out
+    assert "Predições:" in out.out
+    assert "[train] cold start" in out.err
+    assert model_path.exists()
+
+    assert main(["evaluate", "--data", str(csv_path), "--model-path", str(model_path)]) == 0
+    assert "(12 amostras)" in capsys.readouterr().out
+
+    scoring = tmp_path / "score.csv"
+    pd.read_csv(csv_path).drop(columns=["target"]).to_csv(scoring, index=False)
+    args = ["predict", "--input", str(scoring), "--output", str(output_path), "--model-path", str(model_path)]
+    assert main(args + ["--proba"]) == 0
+    assert "[predict] cold start" in capsys.readouterr().err
+
+    scored = pd.read_csv(output_path)
+    assert list(scored.columns) == ["prediction", "proba_0", "proba_1"]
+    assert len(scored) == 12
+
+
+def test_unknown_arguments_are_rejected() -> None:
+    with pytest.raises(SystemExit):
+        main(["train", "--bogus"])
+
+
+def test_benchmark_forwards_arguments(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    args = ["benchmark", "--sizes", "200", "--numeric", "2", "--categorical", "1", "--no-memory"]
+    assert main(args + ["--output", str(output)]) == 0
+    assert output.exists()
+
+
+def test_importing_cli_does_not_load_heavy_modules() -> None:
+    code = (
+        "import sys, src.cli, main; "
+        "print(any(m in sys.modules for m in ('pandas', 'numpy', 'sklearn')))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.cross_validation import CrossValidator
+from src.utils.fitted_preprocessor import FittedPreprocessor
+
+
+@pytest.fixture
+def sample_frame():
+    """
+    Dataset sintético com NaN, coluna categórica e grupos.
+    """
+    rng = np.random.default_rng(0)
+    n = 240
+    df = pd.DataFrame(
+        {
+            "num_a": rng.normal(size=n),
+            "num_b": rng.normal(size=n),
+            "cat": rng.choice(["x", "y", "z"], size=n),
+            "group": np.repeat(np.arange(24), 10),
+        }
+    )
+    df["target"] = (df["num_a"] + (df["cat"] == "x") > 0.3).astype(int)
+    df.loc[::17, "num_b"] = np.nan
+    return df
+
+
+def _preprocessor():
+    return FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a", "num_b"],
+        categorical_columns=["cat"],
+    )
+
+
+def test_run_returns_per_fold_and_aggregate_scores(sample_frame):
+    with CrossValidator(_preprocessor(), n_splits=4, max_workers=1) as cv:
+        report = cv.run(LogisticRegression(max_iter=1000), sample_frame)
+
+    assert report["estimator"] == "LogisticRegression"
+    assert [fold["fold"] for fold in report["folds"]] == [0, 1, 2, 3]
+    assert sum(fold["test_rows"] for fold in report["folds"]) == len(sample_frame)
+    accuracies = [fold["accuracy"] for fold in report["folds"]]
+    assert report["aggregate"]["accuracy"]["mean"] == pytest.approx(np.mean(accuracies))
+    assert report["aggregate"]["roc_auc"]["mean"] > 0.8
+    assert report["reused_folds"] is False
+
+
+def test_preprocessor_is_fitted_on_training_rows_only(sample_frame):
+    cv = CrossValidator(_preprocessor(), n_splits=3, max_workers=1)
+    cv.prepare(sample_frame)
+
+    assert len(cv.fold_preprocessors_) == 3
+    for preprocessor in cv.fold_preprocessors_:
+        assert preprocessor.n_samples_seen_ == 160
+    # Cada fold aprende sua própria média
+    assert len({p.fill_values_["num_b"] for p in cv.fold_preprocessors_}) == 3
+    cv.clear_cache()
+
+
+def test_new_estimator_reuses_cached_folds(sample_frame, monkeypatch):
+    cv = CrossValidator(_preprocessor(), n_splits=3, max_workers=1)
+    first = cv.run(LogisticRegression(max_iter=1000), sample_frame)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pré-processamento não deveria ser refeito")
+
+    monkeypatch.setattr(FittedPreprocessor, "fit_transform", fail)
+    second = cv.run(DecisionTreeClassifier(max_depth=3, random_state=0), sample_frame)
+    third = cv.run(LogisticRegression(max_iter=1000))
+
+    assert first["reused_folds"] is False
+    assert second["reused_folds"] is True and third["reused_folds"] is True
+    assert [f["accuracy"] for f in third["folds"]] == [f["accuracy"] for f in first["folds"]]
+    cv.clear_cache()
+
+
+def test_parallel_matches_serial_and_reuses_fold_files(sample_frame, tmp_path):
+    serial = CrossValidator(_preprocessor(), n_splits=3, max_workers=1).run(
+        LogisticRegression(max_iter=1000), sample_frame
+    )
+    with CrossValidator(_preprocessor(), n_splits=3, max_workers=2, cache_dir=tmp_path) as cv:
+        parallel = cv.run(LogisticRegression(max_iter=1000), sample_frame)
+        files = sorted(p.name for p in next(tmp_path.iterdir()).iterdir())
+        cv.run(DecisionTreeClassifier(random_state=0))
+        assert sorted(p.name for p in next(tmp_path.iterdir()).iterdir()) == files
+
+    assert files == ["fold_0.joblib", "fold_1.joblib", "fold_2.joblib"]
+    assert [f["accuracy"] for f in parallel["folds"]] == [f["accuracy"] for f in serial["folds"]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_group_folds_keep_groups_apart(sample_frame):
+    cv = CrossValidator(_preprocessor(), n_splits=4, stratify=False, group_col="group", max_workers=1)
+    report = cv.run(LogisticRegression(max_iter=1000), sample_frame)
+    assert all(fold["test_rows"] % 10 == 0 for fold in report["folds"])
+    cv.clear_cache()
+
+
+def test_errors(sample_frame):
+    with pytest.raises(TypeError):
+        CrossValidator("not a preprocessor")
+    with pytest.raises(ValueError):
+        CrossValidator(_preprocessor(), max_workers=0)
+    cv = CrossValidator(_preprocessor(), max_workers=1)
+    with pytest.raises(RuntimeError):
+        cv.run(LogisticRegression())
+    with pytest.raises(ValueError):
+        cv.prepare(sample_frame.drop(columns=["target"]))
+    with pytest.raises(TypeError):
+        cv.run(object(), sample_frame)
+
+
+def test_fold_matrices_follow_preprocessor_precision(sample_frame):
+    preprocessor = FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a", "num_b"],
+        categorical_columns=["cat"],
+        precision="float32",
+    )
+    with CrossValidator(preprocessor, n_splits=3, max_workers=1) as cv:
+        report = cv.run(LogisticRegression(max_iter=1000), sample_frame.drop(columns=["group"]))
+        assert all(fold["X_train"]["matrix"].dtype == np.float32 for fold in cv._folds)
+
+    assert report["aggregate"]["roc_auc"]["mean"] > 0.8
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda cv: setattr(cv, "n_splits", 4),
+        lambda cv: setattr(cv, "random_state", 7),
+        lambda cv: setattr(cv, "stratify", False),
+        lambda cv: setattr(cv.preprocessor, "missing_strategy", "median"),
+    ],
+)
+def test_changed_configuration_invalidates_cached_folds(sample_frame, change):
+    with CrossValidator(_preprocessor(), n_splits=3, max_workers=1) as cv:
+        assert cv.prepare(sample_frame) is False
+        assert cv.prepare(sample_frame) is True
+        change(cv)
+        report = cv.run(LogisticRegression(max_iter=1000), sample_frame)
+
+    assert report["reused_folds"] is False
+    assert len(report["folds"]) == cv.n_splits
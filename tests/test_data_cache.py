@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_preprocessing import load_data
+from src.utils.data_cache import DataCache, load_frame, save_frame
+
+
+@pytest.fixture
+def csv_file(tmp_path: Path) -> Path:
+    df = pd.DataFrame(
+        {
+            "feature1": [10, 20, 15, 25, 30],
+            "feature2": ["A", "B", "A", "C", "B"],
+            "target": [0, 1, 0, 1, 0],
+        }
+    )
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_save_and_load_frame_roundtrip(tmp_path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "num": np.arange(5, dtype="float32"),
+            "txt": ["a", "b", None, "d", "e"],
+            "cat": pd.Categorical(["x", "y", "x", "z", "y"]),
+        },
+        index=pd.Index([10, 11, 12, 13, 14], name="row_id"),
+    )
+    save_frame(df, tmp_path / "entry")
+    loaded = load_frame(tmp_path / "entry")
+
+    pd.testing.assert_frame_equal(loaded, df)
+    assert loaded.index.name == "row_id"
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pd.RangeIndex(3, name="position"),
+        pd.MultiIndex.from_tuples([("a", 1), ("a", 2), ("b", 1)], names=["group", "step"]),
+    ],
+)
+def test_index_names_roundtrip(tmp_path: Path, index: pd.Index) -> None:
+    df = pd.DataFrame({"value": [1.0, 2.0, 3.0]}, index=index)
+    save_frame(df, tmp_path / "entry")
+    loaded = load_frame(tmp_path / "entry")
+
+    pd.testing.assert_frame_equal(loaded, df)
+    assert list(loaded.index.names) == list(index.names)
+
+
+def test_sparse_and_extension_columns_roundtrip(tmp_path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "onehot": pd.arrays.SparseArray(np.array([0, 1, 0, 0], dtype=np.uint8)),
+            "nan_fill": pd.arrays.SparseArray([np.nan, 2.5, np.nan, 1.0]),
+            "nullable_int": pd.array([1, None, 3, 4], dtype="Int64"),
+            "text": pd.array(["a", None, "c", "d"], dtype="string"),
+        }
+    )
+    save_frame(df, tmp_path / "entry")
+    loaded = load_frame(tmp_path / "entry")
+
+    pd.testing.assert_frame_equal(loaded, df)
+    # Só os valores não nulos são gravados
+    assert len(np.load(tmp_path / "entry" / "col_0.npy")) == 1
+
+
+def test_numeric_columns_are_memory_mapped(tmp_path: Path) -> None:
+    save_frame(pd.DataFrame({"num": np.arange(10)}), tmp_path / "entry")
+    loaded = load_frame(tmp_path / "entry", mmap_mode="r")
+
+    values = loaded["num"].to_numpy()
+    base = values
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert not values.flags.writeable
+
+
+def test_load_data_cache_miss_then_hit(csv_file: Path, tmp_path: Path) -> None:
+    cache = DataCache(tmp_path / "cache")
+
+    first = load_data(str(csv_file), cache=cache)
+    assert cache.last_status == "miss"
+
+    second = load_data(str(csv_file), cache=cache)
+    assert cache.last_status == "hit"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.last_load_seconds is not None
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_invalidates_when_source_changes(csv_file: Path, tmp_path: Path) -> None:
+    cache = DataCache(tmp_path / "cache")
+    load_data(str(csv_file), cache=cache)
+
+    with open(csv_file, "a", encoding="utf-8") as fh:
+        fh.write("99,Z,1\n")
+
+    df = load_data(str(csv_file), cache=cache)
+    assert cache.last_status == "miss"
+    assert len(df) == 6
+
+
+def test_cache_hits_when_only_mtime_changes(csv_file: Path, tmp_path: Path) -> None:
+    cache = DataCache(tmp_path / "cache")
+    load_data(str(csv_file), cache=cache)
+
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    load_data(str(csv_file), cache=cache)
+    assert cache.last_status == "hit"
+
+
+def test_cache_rejects_chunksize(csv_file: Path, tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="cache is not supported"):
+        load_data(str(csv_file), chunksize=2, cache=DataCache(tmp_path / "cache"))
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_preprocessing import iter_data_chunks, load_data
+
+
+@pytest.fixture
+def csv_file(tmp_path: Path) -> Path:
+    df = pd.DataFrame(
+        {
+            "feature1": range(10),
+            "feature2": ["A", "B", "C", "A", "B", "C", "A", "B", "C", "A"],
+            "target": [i % 2 for i in range(10)],
+        }
+    )
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_load_data_creates_dummy_file_when_missing(tmp_path: Path) -> None:
+    path = tmp_path / "missing.csv"
+    df = load_data(str(path))
+
+    assert path.exists()
+    assert list(df.columns) == ["feature1", "feature2", "target"]
+
+
+def test_load_data_chunksize_returns_iterator_of_chunks(csv_file: Path) -> None:
+    chunks = list(load_data(str(csv_file), chunksize=4))
+
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    full = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(full, pd.read_csv(csv_file))
+
+
+def test_load_data_applies_explicit_schema(csv_file: Path) -> None:
+    df = load_data(
+        str(csv_file),
+        dtype={"feature1": "float32"},
+        usecols=["feature1", "feature2"],
+        categorical=["feature2"],
+    )
+
+    assert list(df.columns) == ["feature1", "feature2"]
+    assert df["feature1"].dtype == "float32"
+    assert isinstance(df["feature2"].dtype, pd.CategoricalDtype)
+
+
+def test_chunks_share_fixed_categories(csv_file: Path) -> None:
+    chunks = list(
+        iter_data_chunks(
+            str(csv_file),
+            chunksize=3,
+            categorical={"feature2": ["A", "B", "C"]},
+            engine="c",
+        )
+    )
+
+    for chunk in chunks:
+        assert list(chunk["feature2"].cat.categories) == ["A", "B", "C"]
+    # categorias idênticas permitem concatenar sem voltar para object
+    assert isinstance(pd.concat(chunks)["feature2"].dtype, pd.CategoricalDtype)
+
+
+def test_iter_data_chunks_invalid_arguments_raise(csv_file: Path) -> None:
+    with pytest.raises(ValueError, match="chunksize must be a positive integer"):
+        iter_data_chunks(str(csv_file), chunksize=0)
+    with pytest.raises(ValueError, match="Invalid engine"):
+        iter_data_chunks(str(csv_file), chunksize=2, engine="fast")
+
+
+def test_load_data_enforces_schema(csv_file: Path) -> None:
+    from src.utils.schema import ColumnSchema, DataSchema, SchemaValidationError
+
+    ok = DataSchema([ColumnSchema("feature1", "integer", min_value=0, max_value=9)])
+    assert len(load_data(str(csv_file), schema=ok)) == 10
+    assert sum(len(chunk) for chunk in load_data(str(csv_file), chunksize=4, schema=ok)) == 10
+
+    strict = DataSchema([ColumnSchema("feature1", "integer", max_value=5)])
+    with pytest.raises(SchemaValidationError, match=r"feature1: range \(4 rows\)"):
+        load_data(str(csv_file), schema=strict)
+
+
+@pytest.mark.parametrize("chunksize", [None, 4])
+def test_pyarrow_engine_matches_c_engine(csv_file: Path, chunksize) -> None:
+    pytest.importorskip("pyarrow")
+    options = dict(
+        dtype={"feature1": "float32"},
+        usecols=["feature1", "feature2"],
+        categorical={"feature2": ["A", "B", "C"]},
+        chunksize=chunksize,
+    )
+    arrow = load_data(str(csv_file), engine="pyarrow", **options)
+    c = load_data(str(csv_file), engine="c", **options)
+    if chunksize is not None:
+        arrow = pd.concat(list(arrow), ignore_index=True)
+        c = pd.concat(list(c), ignore_index=True)
+
+    pd.testing.assert_frame_equal(arrow, c)
+    assert arrow["feature1"].dtype == "float32"
+
+
+def test_default_engine_uses_pyarrow_when_installed(csv_file: Path, monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    engines = []
+    read_csv = pd.read_csv
+
+    def spy(*args, **kwargs):
+        engines.append(kwargs.get("engine"))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", spy)
+    load_data(str(csv_file))
+
+    assert engines == ["pyarrow"]
@@ -199,4 +199,271 @@ def test_encode_categorical_values_correctness(df_clean: pd.DataFrame) -> None:
     # linha 0 tem cat_a = 'A'
     assert result.loc[0, "cat_a_A"] == 1.0
     assert result.loc[0, "cat_a_B"] == 0.0
-    assert result.loc[0, "cat_a_C"] == 0.0
\ No newline at end of file
+    assert result.loc[0, "cat_a_C"] == 0.0
+
+
+# ---------- pipeline encadeado / inplace ----------
+
+def test_init_copy_false_reuses_buffer(df_clean: pd.DataFrame) -> None:
+    processor = DataProcessor(df_clean, copy=False)
+    assert processor.dataframe is df_clean
+
+
+def test_inplace_updates_internal_buffer(df_with_missing: pd.DataFrame) -> None:
+    processor = DataProcessor(df_with_missing)
+    result = processor.handle_missing_values(strategy="mean", inplace=True)
+
+    assert result is processor.dataframe
+    assert processor.dataframe["num_a"].isna().sum() == 0
+    # o frame original do chamador não é alterado (cópia do construtor)
+    assert df_with_missing["num_a"].isna().sum() == 1
+
+
+def test_run_pipeline_matches_step_by_step(df_with_missing: pd.DataFrame) -> None:
+    expected = DataProcessor(df_with_missing).handle_missing_values(strategy="median")
+    expected = DataProcessor(expected).normalize_features(columns=["num_a", "num_b"])
+    expected = DataProcessor(expected).encode_categorical(columns=["cat_a"])
+
+    processor = DataProcessor(df_with_missing)
+    result = processor.run_pipeline(
+        [
+            ("handle_missing_values", {"strategy": "median"}),
+            ("normalize_features", {"columns": ["num_a", "num_b"]}),
+            ("encode_categorical", {"columns": ["cat_a"]}),
+        ],
+        track_memory=True,
+    )
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert processor.peak_memory_bytes is not None
+    assert processor.peak_memory_bytes > 0
+
+
+def test_run_pipeline_does_not_track_memory_by_default(df_with_missing: pd.DataFrame) -> None:
+    processor = DataProcessor(df_with_missing)
+    processor.run_pipeline([("handle_missing_values", {"strategy": "median"})])
+    assert processor.peak_memory_bytes is None
+
+
+def test_run_pipeline_keeps_peak_of_external_tracer(df_with_missing: pd.DataFrame) -> None:
+    import tracemalloc
+
+    size = 8 * 1024 * 1024
+    tracemalloc.start()
+    try:
+        temporary = np.ones(size // 8)
+        del temporary
+        processor = DataProcessor(df_with_missing)
+        processor.run_pipeline([("handle_missing_values", {"strategy": "median"})], track_memory=True)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= size
+    finally:
+        tracemalloc.stop()
+    assert processor.peak_memory_bytes is None
+
+
+def test_run_pipeline_invalid_step_raises(df_clean: pd.DataFrame) -> None:
+    processor = DataProcessor(df_clean)
+    with pytest.raises(ValueError, match="Invalid pipeline step"):
+        processor.run_pipeline([("dataframe", {})])
+
+
+# ---------- encode_categorical esparso / bucket de categorias raras ----------
+
+def test_encode_categorical_sparse_matches_dense(df_clean: pd.DataFrame) -> None:
+    dense = DataProcessor(df_clean).encode_categorical(columns=["cat_a", "cat_b"])
+    sparse = DataProcessor(df_clean).encode_categorical(columns=["cat_a", "cat_b"], sparse=True)
+
+    assert list(sparse.columns) == list(dense.columns)
+    assert isinstance(sparse["cat_a_A"].dtype, pd.SparseDtype)
+    # colunas não codificadas continuam densas
+    assert not isinstance(sparse["num_a"].dtype, pd.SparseDtype)
+    np.testing.assert_array_equal(sparse["cat_a_A"].sparse.to_dense(), dense["cat_a_A"])
+
+
+def test_encode_categorical_rare_categories_go_to_other(df_clean: pd.DataFrame) -> None:
+    processor = DataProcessor(df_clean)
+    # cat_a: A=2, B=2, C=1 -> C é rara
+    result = processor.encode_categorical(columns=["cat_a"], min_frequency=2)
+
+    assert "cat_a_C" not in result.columns
+    assert "cat_a_other" in result.columns
+    assert result.loc[3, "cat_a_other"] == 1.0
+
+
+def test_encode_categorical_max_categories_bounds_width(df_clean: pd.DataFrame) -> None:
+    result = DataProcessor(df_clean).encode_categorical(columns=["cat_b"], max_categories=2)
+    encoded = [c for c in result.columns if c.startswith("cat_b_")]
+    assert len(encoded) == 2
+
+
+# ---------- Otimização de memória ----------
+
+def test_optimize_memory_downcasts_without_changing_values() -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "small_int": rng.integers(0, 100, size=1000),
+            "negative_int": rng.integers(-1000, 1000, size=1000),
+            "half_float": rng.integers(0, 8, size=1000) / 2.0,
+            "precise_float": rng.normal(size=1000),
+            "city": rng.choice(["SP", "RJ", "BH"], size=1000).astype(object),
+            "uid": [f"id{i}" for i in range(1000)],
+        }
+    )
+    df.loc[::10, "half_float"] = np.nan
+
+    processor = DataProcessor(df)
+    result = processor.optimize_memory()
+
+    assert result["small_int"].dtype == np.uint8
+    assert result["negative_int"].dtype == np.int16
+    assert result["half_float"].dtype == np.float32
+    assert result["precise_float"].dtype == np.float64  # float32 perderia precisão
+    assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+    assert result["uid"].dtype == object  # alta cardinalidade
+    pd.testing.assert_frame_equal(result.astype(df.dtypes.to_dict()), df)
+
+    report = processor.memory_report
+    assert report["after_bytes"] < report["before_bytes"]
+    assert report["converted_columns"]["small_int"] == ("int64", "uint8")
+    assert processor.dataframe["small_int"].dtype == np.int64  # inplace=False
+
+
+def test_optimize_memory_in_pipeline_then_uint8_one_hot(df_with_missing: pd.DataFrame) -> None:
+    processor = DataProcessor(df_with_missing)
+    result = processor.run_pipeline(
+        [
+            ("optimize_memory", {}),
+            ("handle_missing_values", {"strategy": "mean"}),
+            ("encode_categorical", {"columns": ["cat_a"], "dtype": np.uint8}),
+        ]
+    )
+    encoded = [c for c in result.columns if c.startswith("cat_a_")]
+    assert all(result[c].dtype == np.uint8 for c in encoded)
+    assert result["num_a"].isna().sum() == 0
+    assert result[encoded].sum(axis=1).tolist() == [1, 1, 1, 1]
+
+
+def test_encode_categorical_sparse_uint8(df_clean: pd.DataFrame) -> None:
+    result = DataProcessor(df_clean).encode_categorical(columns=["cat_a"], sparse=True, dtype=np.uint8)
+    assert str(result["cat_a_A"].dtype) == "Sparse[uint8, 0]"
+
+
+def test_optimize_memory_invalid_threshold(df_clean: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        DataProcessor(df_clean).optimize_memory(category_threshold=2.0)
+
+
+def test_float32_precision_normalizes_to_float32_and_one_hot_uint8(df_clean: pd.DataFrame) -> None:
+    processor = DataProcessor(df_clean, precision="float32")
+    normalized = processor.normalize_features(columns=["num_a"])
+    encoded = processor.encode_categorical(columns=["cat_a"])
+
+    assert normalized["num_a"].dtype == np.float32
+    assert all(encoded[c].dtype == np.uint8 for c in encoded.columns if c.startswith("cat_a_"))
+    expected = DataProcessor(df_clean).normalize_features(columns=["num_a"])["num_a"]
+    np.testing.assert_allclose(normalized["num_a"], expected, rtol=1e-6)
+
+
+def test_invalid_precision_raises(df_clean: pd.DataFrame) -> None:
+    with pytest.raises(ValueError, match="Invalid precision"):
+        DataProcessor(df_clean, precision="float16")
+
+
+def test_encode_categorical_hash_features(df_clean: pd.DataFrame) -> None:
+    result = DataProcessor(df_clean).encode_categorical(columns=["cat_a", "cat_b"], hash_features=16)
+
+    hashed = [f"hash_{i}" for i in range(16)]
+    assert list(result.columns) == ["num_a", "num_b"] + hashed
+    assert all(isinstance(result[c].dtype, pd.SparseDtype) for c in hashed)
+    assert result[hashed].sparse.to_dense().sum(axis=1).tolist() == [2.0] * 5
+
+
+def test_encode_categorical_hash_rejects_vocabulary_options(df_clean: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        DataProcessor(df_clean).encode_categorical(columns=["cat_a"], hash_features=16, max_categories=2)
+
+
+@pytest.fixture
+def df_wide() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 40))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    df = pd.DataFrame(values, columns=[f"f{i}" for i in range(40)])
+    df["f0"] = df["f0"].astype(np.float32)
+    df["count"] = np.arange(50)
+    df["cat"] = ["A", "B"] * 25
+    return df
+
+
+@pytest.mark.parametrize("strategy", ["mean", "median"])
+def test_parallel_handle_missing_values_matches_serial(df_wide: pd.DataFrame, strategy: str) -> None:
+    expected = DataProcessor(df_wide).handle_missing_values(strategy=strategy)
+    result = DataProcessor(df_wide, max_workers=4, parallel_min_cells=1).handle_missing_values(strategy=strategy)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_normalize_features_matches_serial(df_wide: pd.DataFrame) -> None:
+    columns = [f"f{i}" for i in range(1, 40)]
+    filled = DataProcessor(df_wide).handle_missing_values()
+    expected = DataProcessor(filled).normalize_features(columns=columns)
+    result = DataProcessor(filled, max_workers=3, parallel_min_cells=1).normalize_features(columns=columns)
+
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-12)
+
+
+@pytest.mark.filterwarnings("ignore:All-NaN slice encountered:RuntimeWarning")
+@pytest.mark.parametrize("precision", ["float64", "float32"])
+def test_parallel_normalize_matches_min_max_scaler_on_degenerate_columns(precision: str) -> None:
+    n = 20
+    df = pd.DataFrame(
+        {
+            "regular": np.linspace(-3.0, 5.0, n),
+            "constant": np.full(n, 7.0),
+            "near_constant": np.where(np.arange(n) % 2 == 0, 1.0, 1.0 + 2e-16),
+            "all_nan": np.full(n, np.nan),
+            "count": np.arange(n),
+        }
+    )
+    columns = list(df.columns)
+    expected = DataProcessor(df, precision=precision).normalize_features(columns=columns)
+    result = DataProcessor(df, precision=precision, max_workers=2, parallel_min_cells=1).normalize_features(
+        columns=columns
+    )
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    assert result["all_nan"].isna().all()
+    assert (result["constant"] == 0.0).all()
+
+
+def test_parallel_falls_back_to_serial_below_threshold(df_wide: pd.DataFrame, monkeypatch) -> None:
+    processor = DataProcessor(df_wide, max_workers=4)
+    monkeypatch.setattr(
+        processor, "_fill_missing_parallel", lambda *args: pytest.fail("parallel path should not run")
+    )
+    assert processor.handle_missing_values()["f1"].isna().sum() == 0
+
+
+def test_invalid_max_workers_raises(df_clean: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        DataProcessor(df_clean, max_workers=0)
+
+
+def test_approx_median_matches_exact_median_on_small_frames(df_with_missing: pd.DataFrame) -> None:
+    expected = DataProcessor(df_with_missing).handle_missing_values(strategy="median")
+    result = DataProcessor(df_with_missing).handle_missing_values(strategy="approx_median")
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_approx_quantile_strategy(df_wide: pd.DataFrame) -> None:
+    result = DataProcessor(df_wide).handle_missing_values(strategy="approx_quantile", quantile=0.9)
+    parallel = DataProcessor(df_wide, max_workers=2, parallel_min_cells=1).handle_missing_values(
+        strategy="approx_quantile", quantile=0.9
+    )
+
+    filled = df_wide["f1"].isna()
+    assert result.loc[filled, "f1"].iloc[0] == pytest.approx(df_wide["f1"].quantile(0.9))
+    pd.testing.assert_frame_equal(parallel, result)
\ No newline at end of file
@@ -1,6 +1,8 @@
 # tests/test_data_splitter.py
+import numpy as np
 import pytest
 import pandas as pd
+from sklearn.model_selection import train_test_split
 from src.utils.data_splitter import DataSplitter # Caminho importante!
 
 @pytest.fixture
@@ -52,4 +54,62 @@ def test_invalid_test_size_raises_error(sample_dataframe):
 
 def test_non_dataframe_input_raises_type_error():
     with pytest.raises(TypeError, match="Input must be a pandas DataFrame."):
-        DataSplitter([1, 2, 3])
\ No newline at end of file
+        DataSplitter([1, 2, 3])
+
+def test_split_indices_match_split(sample_dataframe):
+    splitter = DataSplitter(sample_dataframe)
+    train_idx, test_idx = splitter.split_indices(test_size=0.3, random_state=7)
+    train_df, test_df = splitter.split(test_size=0.3, random_state=7)
+
+    assert isinstance(train_idx, np.ndarray)
+    pd.testing.assert_frame_equal(sample_dataframe.iloc[train_idx], train_df)
+    pd.testing.assert_frame_equal(sample_dataframe.iloc[test_idx], test_df)
+
+def test_split_matches_train_test_split(sample_dataframe):
+    expected_train, expected_test = train_test_split(
+        sample_dataframe, test_size=0.2, random_state=42, shuffle=True
+    )
+    train_df, test_df = DataSplitter(sample_dataframe).split(test_size=0.2, random_state=42)
+    pd.testing.assert_frame_equal(train_df, expected_train)
+    pd.testing.assert_frame_equal(test_df, expected_test)
+
+def test_copy_false_reuses_dataframe(sample_dataframe):
+    splitter = DataSplitter(sample_dataframe, copy=False)
+    assert splitter.dataframe is sample_dataframe
+
+def test_iter_folds_kfold_partitions_all_rows(sample_dataframe):
+    folds = list(DataSplitter(sample_dataframe).iter_folds(n_splits=4))
+    assert len(folds) == 4
+
+    all_test = np.concatenate([test for _, test in folds])
+    assert sorted(all_test.tolist()) == list(range(len(sample_dataframe)))
+    for train_idx, test_idx in folds:
+        assert len(np.intersect1d(train_idx, test_idx)) == 0
+
+def test_iter_folds_is_deterministic(sample_dataframe):
+    folds1 = list(DataSplitter(sample_dataframe).iter_folds(n_splits=3, random_state=1))
+    folds2 = list(DataSplitter(sample_dataframe).iter_folds(n_splits=3, random_state=1))
+    for (tr1, te1), (tr2, te2) in zip(folds1, folds2):
+        np.testing.assert_array_equal(tr1, tr2)
+        np.testing.assert_array_equal(te1, te2)
+
+def test_iter_folds_stratified_keeps_class_balance(sample_dataframe):
+    splitter = DataSplitter(sample_dataframe)
+    for _, test_idx in splitter.iter_folds(n_splits=5, stratify_col='col2'):
+        counts = sample_dataframe['col2'].iloc[test_idx].value_counts()
+        assert counts['val0'] == counts['val1']
+
+def test_iter_folds_groups_do_not_leak():
+    df = pd.DataFrame({'x': range(12), 'group': [i // 3 for i in range(12)]})
+    splitter = DataSplitter(df)
+    for train_idx, test_idx in splitter.iter_folds(n_splits=4, group_col='group'):
+        train_groups = set(df['group'].iloc[train_idx])
+        test_groups = set(df['group'].iloc[test_idx])
+        assert train_groups.isdisjoint(test_groups)
+
+def test_iter_folds_invalid_arguments_raise(sample_dataframe):
+    splitter = DataSplitter(sample_dataframe)
+    with pytest.raises(ValueError, match="n_splits must be an integer"):
+        next(splitter.iter_folds(n_splits=1))
+    with pytest.raises(ValueError, match="not found in DataFrame"):
+        next(splitter.iter_folds(stratify_col='missing'))
\ No newline at end of file
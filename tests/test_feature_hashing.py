@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.feature_hashing import hash_encode, hash_encode_frame, hashed_feature_names
+
+
+@pytest.fixture
+def df_ids() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "user_id": ["u1", "u2", "u1", None, "u3", "u2"],
+            "city": ["SP", "RJ", "SP", "BH", "SP", np.nan],
+        }
+    )
+
+
+def test_hash_encode_fixed_width_one_token_per_column(df_ids: pd.DataFrame) -> None:
+    matrix = hash_encode(df_ids, ["user_id", "city"], n_features=64)
+
+    assert matrix.shape == (6, 64)
+    assert (matrix.toarray() >= 0).all()
+    np.testing.assert_array_equal(np.asarray(matrix.sum(axis=1)).ravel(), np.full(6, 2.0))
+    # Mesmas linhas de entrada -> mesmas linhas de saída
+    np.testing.assert_array_equal(matrix[0].toarray(), matrix[2].toarray())
+
+
+def test_hash_encode_is_stateless_across_chunks(df_ids: pd.DataFrame) -> None:
+    full = hash_encode(df_ids, ["user_id", "city"], n_features=32).toarray()
+    chunks = [hash_encode(df_ids.iloc[i : i + 2], ["user_id", "city"], n_features=32).toarray() for i in (0, 2, 4)]
+
+    np.testing.assert_array_equal(np.vstack(chunks), full)
+
+
+def test_hash_encode_frame_sparse_columns(df_ids: pd.DataFrame) -> None:
+    result = hash_encode_frame(df_ids, ["user_id"], n_features=8, dtype=np.uint8)
+
+    assert list(result.columns) == hashed_feature_names(8)
+    assert str(result["hash_0"].dtype) == "Sparse[uint8, 0]"
+    assert result.index.equals(df_ids.index)
+
+
+def test_hash_encode_invalid_width(df_ids: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        hash_encode(df_ids, ["user_id"], n_features=0)
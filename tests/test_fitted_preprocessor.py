@@ -0,0 +1,255 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.data_processor import DataProcessor
+from src.utils.fitted_preprocessor import FittedPreprocessor
+
+
+@pytest.fixture
+def df_train() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "num_a": [10.0, 20.0, np.nan, 40.0, 50.0],
+            "num_b": [1.0, np.nan, 3.0, 4.0, 5.0],
+            "cat_a": ["A", "B", "A", "C", "B"],
+            "target": [0, 1, 0, 1, 0],
+        }
+    )
+
+
+@pytest.fixture
+def preprocessor() -> FittedPreprocessor:
+    return FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a", "num_b"],
+        categorical_columns=["cat_a"],
+        exclude_columns=["target"],
+    )
+
+
+def test_fit_transform_matches_data_processor_pipeline(
+    df_train: pd.DataFrame, preprocessor: FittedPreprocessor
+) -> None:
+    expected = DataProcessor(df_train).run_pipeline(
+        [
+            ("handle_missing_values", {"strategy": "mean"}),
+            ("normalize_features", {"columns": ["num_a", "num_b"]}),
+            ("encode_categorical", {"columns": ["cat_a"]}),
+        ]
+    )
+    result = preprocessor.fit_transform(df_train)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert preprocessor.feature_names_out_ == list(result.columns)
+
+
+def test_transform_reuses_fitted_state(df_train: pd.DataFrame, preprocessor: FittedPreprocessor) -> None:
+    preprocessor.fit(df_train)
+    batch = pd.DataFrame({"num_a": [np.nan, 30.0], "num_b": [5.0, 100.0], "cat_a": ["C", "Z"]})
+
+    result = preprocessor.transform(batch)
+
+    # NaN recebe a média do treino, e a escala usa min/max do treino
+    assert result.loc[0, "num_a"] == pytest.approx((30.0 - 10.0) / 40.0)
+    assert result.loc[1, "num_b"] == pytest.approx((100.0 - 1.0) / 4.0)
+    # categoria desconhecida -> linha de zeros
+    assert result.loc[1, ["cat_a_A", "cat_a_B", "cat_a_C"]].sum() == 0.0
+    assert result.loc[0, "cat_a_C"] == 1.0
+
+
+def test_nan_category_gets_its_own_column() -> None:
+    df = pd.DataFrame({"num": [1.0, 2.0, 3.0], "cat": ["X", np.nan, "Y"]})
+    result = FittedPreprocessor(categorical_columns=["cat"]).fit_transform(df)
+
+    assert list(result.columns) == ["num", "cat_X", "cat_Y", "cat_nan"]
+    assert result.loc[1, "cat_nan"] == 1.0
+
+
+def test_transform_before_fit_raises(df_train: pd.DataFrame, preprocessor: FittedPreprocessor) -> None:
+    with pytest.raises(RuntimeError, match="not fitted"):
+        preprocessor.transform(df_train)
+
+
+def test_invalid_strategy_raises() -> None:
+    with pytest.raises(ValueError, match="Invalid strategy"):
+        FittedPreprocessor(missing_strategy="drop")
+
+
+def test_save_and_load_roundtrip(
+    tmp_path: Path, df_train: pd.DataFrame, preprocessor: FittedPreprocessor
+) -> None:
+    preprocessor.fit(df_train)
+    path = tmp_path / "prep.joblib"
+    preprocessor.save(path)
+
+    loaded = FittedPreprocessor.load(path)
+    pd.testing.assert_frame_equal(loaded.transform(df_train), preprocessor.transform(df_train))
+
+
+# ---------- ajuste incremental (out-of-core) ----------
+
+def _chunks(df: pd.DataFrame, size: int):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+def test_fit_chunks_matches_full_fit(df_train: pd.DataFrame) -> None:
+    kwargs = dict(
+        missing_strategy="mean",
+        normalize_columns=["num_a", "num_b"],
+        categorical_columns=["cat_a"],
+        exclude_columns=["target"],
+    )
+    full = FittedPreprocessor(**kwargs).fit(df_train)
+    chunked = FittedPreprocessor(**kwargs).fit_chunks(_chunks(df_train, 2))
+
+    assert chunked.fill_values_ == pytest.approx(full.fill_values_)
+    assert chunked.min_ == full.min_
+    assert chunked.max_ == full.max_
+    assert chunked.categories_ == full.categories_
+    assert chunked.n_samples_seen_ == len(df_train)
+
+    result = pd.concat(list(chunked.transform_chunks(_chunks(df_train, 2))))
+    pd.testing.assert_frame_equal(result, full.transform(df_train))
+
+
+def test_partial_fit_rejects_median(df_train: pd.DataFrame) -> None:
+    preprocessor = FittedPreprocessor(missing_strategy="median")
+    with pytest.raises(ValueError, match="cannot be fitted incrementally"):
+        preprocessor.partial_fit(df_train)
+
+
+def test_fit_chunks_empty_iterator_raises() -> None:
+    with pytest.raises(ValueError, match="chunks cannot be empty"):
+        FittedPreprocessor().fit_chunks(iter([]))
+
+
+def test_float32_precision_output_dtypes(df_train: pd.DataFrame) -> None:
+    reference = FittedPreprocessor(
+        missing_strategy="mean", normalize_columns=["num_a", "num_b"], categorical_columns=["cat_a"]
+    )
+    preprocessor = FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a", "num_b"],
+        categorical_columns=["cat_a"],
+        exclude_columns=["target"],
+        precision="float32",
+    )
+    expected = reference.fit_transform(df_train.drop(columns=["target"]))
+    result = preprocessor.fit_transform(df_train)
+
+    assert result["num_a"].dtype == np.float32
+    assert result["num_b"].dtype == np.float32
+    assert all(result[c].dtype == np.uint8 for c in result.columns if c.startswith("cat_a_"))
+    assert result["target"].dtype == df_train["target"].dtype
+    np.testing.assert_allclose(result[expected.columns].to_numpy(np.float64), expected.to_numpy(), rtol=1e-6)
+
+
+def test_invalid_precision_raises() -> None:
+    with pytest.raises(ValueError, match="Invalid precision"):
+        FittedPreprocessor(precision="float16")
+
+
+def test_hash_columns_learn_no_state_and_match_across_chunks(df_train: pd.DataFrame) -> None:
+    preprocessor = FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a"],
+        hash_columns=["cat_a"],
+        exclude_columns=["target"],
+        hash_features=8,
+    )
+    full = preprocessor.fit_transform(df_train)
+
+    assert preprocessor.categories_ == {}
+    assert "cat_a" not in preprocessor.fill_values_
+    assert preprocessor.feature_names_out_ == list(full.columns)
+    assert full.columns[-8:].tolist() == [f"hash_{i}" for i in range(8)]
+
+    chunked = FittedPreprocessor(
+        missing_strategy="mean",
+        normalize_columns=["num_a"],
+        hash_columns=["cat_a"],
+        exclude_columns=["target"],
+        hash_features=8,
+    ).fit_chunks([df_train.iloc[:2], df_train.iloc[2:]])
+    streamed = pd.concat(chunked.transform_chunks([df_train.iloc[:3], df_train.iloc[3:]]))
+    pd.testing.assert_frame_equal(streamed, full)
+
+
+def test_hash_columns_cannot_overlap_categorical() -> None:
+    with pytest.raises(ValueError):
+        FittedPreprocessor(categorical_columns=["cat_a"], hash_columns=["cat_a"])
+
+
+def test_approx_median_partial_fit_and_merge(df_train: pd.DataFrame) -> None:
+    def make() -> FittedPreprocessor:
+        return FittedPreprocessor(
+            missing_strategy="approx_median",
+            normalize_columns=["num_a", "num_b"],
+            categorical_columns=["cat_a"],
+            exclude_columns=["target"],
+        )
+
+    full = make().fit(df_train)
+    worker_a = make().partial_fit(df_train.iloc[:2])
+    worker_b = make().partial_fit(df_train.iloc[2:])
+    merged = worker_a.merge(worker_b)
+
+    exact = df_train[["num_a", "num_b"]].median()
+    assert full.fill_values_["num_a"] == exact["num_a"]
+    assert merged.fill_values_ == full.fill_values_
+    assert merged.categories_ == full.categories_
+    assert merged.n_samples_seen_ == len(df_train)
+    pd.testing.assert_frame_equal(merged.transform(df_train), full.transform(df_train))
+
+
+def test_merge_requires_partial_state(df_train: pd.DataFrame, preprocessor: FittedPreprocessor) -> None:
+    preprocessor.fit(df_train)
+    with pytest.raises(RuntimeError):
+        preprocessor.merge(FittedPreprocessor().partial_fit(df_train))
+
+
+def test_partial_fit_finalizes_lazily(df_train: pd.DataFrame, monkeypatch: pytest.MonkeyPatch) -> None:
+    preprocessor = FittedPreprocessor(
+        missing_strategy="approx_median", normalize_columns=["num_a"], categorical_columns=["cat_a"]
+    )
+    calls = []
+    original = FittedPreprocessor._finalize_partial_state
+    monkeypatch.setattr(
+        FittedPreprocessor, "_finalize_partial_state", lambda self: calls.append(1) or original(self)
+    )
+
+    preprocessor.fit_chunks(_chunks(df_train, 1))
+    assert calls == []
+    preprocessor.transform(df_train)
+    assert preprocessor.fill_values_["num_a"] == df_train["num_a"].median()
+    assert preprocessor.n_samples_seen_ == len(df_train)
+    assert len(calls) == 1
+
+    preprocessor.partial_fit(df_train)
+    assert preprocessor.n_samples_seen_ == 2 * len(df_train)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("option", [{"sketch_error": 0.05}, {"precision": "float32"}])
+def test_merge_rejects_different_sketch_error_or_precision(df_train: pd.DataFrame, option: dict) -> None:
+    left = FittedPreprocessor(missing_strategy="approx_median").partial_fit(df_train)
+    right = FittedPreprocessor(missing_strategy="approx_median", **option).partial_fit(df_train)
+    with pytest.raises(ValueError, match=next(iter(option))):
+        left.merge(right)
+
+
+def test_save_drops_partial_state(tmp_path: Path, df_train: pd.DataFrame) -> None:
+    preprocessor = FittedPreprocessor(
+        missing_strategy="approx_median", categorical_columns=["cat_a"]
+    ).fit_chunks(_chunks(df_train, 2))
+    path = tmp_path / "preprocessor.joblib"
+    preprocessor.save(path)
+
+    loaded = FittedPreprocessor.load(path)
+    assert loaded._partial_state is None
+    assert preprocessor._partial_state is not None
+    pd.testing.assert_frame_equal(loaded.transform(df_train), preprocessor.transform(df_train))
@@ -0,0 +1,258 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.inference_client import InferenceClient, run_load_test
+from src.inference_server import InferenceServer, MicroBatcher
+from src.model_trainer import ModelTrainer
+from src.utils.fitted_preprocessor import FittedPreprocessor
+from src.utils.schema import DataSchema
+
+
+@pytest.fixture
+def raw_rows() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = 40
+    return pd.DataFrame({"num": rng.normal(size=n), "cat": rng.choice(["A", "B"], size=n)})
+
+
+@pytest.fixture
+def model_path(tmp_path: Path, raw_rows: pd.DataFrame) -> Path:
+    preprocessor = FittedPreprocessor(normalize_columns=["num"], categorical_columns=["cat"])
+    X = preprocessor.fit_transform(raw_rows)
+    y = pd.Series((raw_rows["num"] > 0).astype(int))
+
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X, y)
+    path = tmp_path / "model.joblib"
+    trainer.save_model(path, preprocessor=preprocessor)
+    return path
+
+
+def _expected(model_path: Path, raw_rows: pd.DataFrame) -> list:
+    model = ModelTrainer.load_model(model_path)
+    features = ModelTrainer.load_preprocessor(model_path).transform(raw_rows)
+    return model.predict(features).tolist()
+
+
+def test_concurrent_requests_are_micro_batched(model_path: Path, raw_rows: pd.DataFrame) -> None:
+    """
+    Requisições concorrentes de uma linha são agrupadas em lotes e cada
+    cliente recebe exatamente a sua predição.
+    """
+    records = raw_rows.to_dict(orient="records")
+
+    async def scenario():
+        server = InferenceServer(model_path, port=0, max_batch_size=16, max_wait_ms=50)
+        await server.start()
+        try:
+            clients = [InferenceClient(port=server.port) for _ in records]
+            results = await asyncio.gather(
+                *(client.predict([record]) for client, record in zip(clients, records))
+            )
+            for client in clients:
+                await client.close()
+            metrics_client = InferenceClient(port=server.port)
+            metrics = await metrics_client.metrics()
+            await metrics_client.close()
+            return results, metrics
+        finally:
+            await server.stop()
+
+    results, metrics = asyncio.run(scenario())
+
+    assert [r[0] for r in results] == _expected(model_path, raw_rows)
+    assert metrics["requests"] == len(records)
+    # houve agrupamento: menos lotes que requisições, nenhum acima do limite
+    assert metrics["batches"] < len(records)
+    assert max(int(size) for size in metrics["batch_size_histogram"]) <= 16
+    assert metrics["latency_p50_ms"] is not None
+    assert metrics["latency_p99_ms"] >= metrics["latency_p50_ms"]
+
+
+def test_load_generator_reports_throughput(model_path: Path, raw_rows: pd.DataFrame) -> None:
+    records = raw_rows.to_dict(orient="records")
+
+    async def scenario():
+        server = InferenceServer(model_path, port=0, max_batch_size=32, max_wait_ms=2)
+        await server.start()
+        try:
+            return await run_load_test(records, n_requests=60, concurrency=8, port=server.port)
+        finally:
+            await server.stop()
+
+    report = asyncio.run(scenario())
+
+    assert report["requests"] == 60
+    assert report["requests_per_second"] > 0
+    assert report["server"]["requests"] == 60
+
+
+def test_bad_requests_return_errors(model_path: Path) -> None:
+    async def scenario():
+        server = InferenceServer(model_path, port=0)
+        await server.start()
+        client = InferenceClient(port=server.port)
+        try:
+            with pytest.raises(RuntimeError, match="400"):
+                await client.request("POST", "/predict", {"rows": []})
+            with pytest.raises(RuntimeError, match="404"):
+                await client.request("GET", "/nope")
+            return await client.request("GET", "/health")
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(scenario()) == {"status": "ok"}
+
+
+class _EchoModel:
+    """Devolve a coluna 'x'; falha em lotes com x < 0 e registra a concorrência."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def predict(self, features: pd.DataFrame) -> np.ndarray:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if (features["x"] < 0).any():
+                raise ValueError("valor negativo")
+            return features["x"].to_numpy()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class _EchoPredictor:
+    def __init__(self, model: _EchoModel) -> None:
+        self.model = model
+
+    def features(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame[["x"]]
+
+
+def test_failing_batch_is_rescored_per_request() -> None:
+    async def scenario():
+        batcher = MicroBatcher(_EchoPredictor(_EchoModel()), max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        try:
+            results = await asyncio.gather(
+                *(batcher.submit(pd.DataFrame({"x": [x]})) for x in (1, -1, 2)), return_exceptions=True
+            )
+            return results, batcher.stats.snapshot()
+        finally:
+            await batcher.stop()
+
+    (first, bad, last), stats = asyncio.run(scenario())
+    assert first == [1] and last == [2]
+    assert isinstance(bad, ValueError)
+    # O lote que falhou não conta; só as duas requisições pontuadas isoladamente
+    assert stats["batch_size_histogram"] == {"1": 2}
+    assert stats["batches"] == 2
+
+
+def test_predict_workers_keeps_several_batches_in_flight() -> None:
+    model = _EchoModel(delay=0.1)
+
+    async def scenario():
+        batcher = MicroBatcher(_EchoPredictor(model), max_batch_size=1, max_wait_ms=0, predict_workers=2)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(pd.DataFrame({"x": [x]})) for x in range(4)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(scenario()) == [[0], [1], [2], [3]]
+    assert model.max_active == 2
+
+
+def test_stop_fails_requests_still_queued() -> None:
+    async def scenario():
+        batcher = MicroBatcher(_EchoPredictor(_EchoModel(delay=0.2)), max_batch_size=1, max_wait_ms=0)
+        batcher.start()
+        tasks = [asyncio.ensure_future(batcher.submit(pd.DataFrame({"x": [x]}))) for x in range(3)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=2)
+
+    results = asyncio.run(scenario())
+    assert results[0] == [0]
+    assert all(isinstance(r, RuntimeError) for r in results[1:])
+
+
+def test_invalid_instances_get_400_without_failing_the_batch(
+    model_path: Path, raw_rows: pd.DataFrame
+) -> None:
+    trainer = ModelTrainer.from_trained_model(ModelTrainer.load_model(model_path))
+    trainer.save_model(
+        model_path, preprocessor=ModelTrainer.load_preprocessor(model_path), schema=DataSchema.infer(raw_rows)
+    )
+    records = raw_rows.to_dict(orient="records")
+
+    async def scenario():
+        server = InferenceServer(model_path, port=0, max_batch_size=16, max_wait_ms=50)
+        await server.start()
+        clients = [InferenceClient(port=server.port) for _ in range(3)]
+        try:
+            return await asyncio.gather(
+                clients[0].predict(records[:2]),
+                clients[1].predict([{"num": "x", "cat": "A"}]),
+                clients[2].predict(records[2:4]),
+                return_exceptions=True,
+            )
+        finally:
+            for client in clients:
+                await client.close()
+            await server.stop()
+
+    first, bad, last = asyncio.run(scenario())
+    expected = _expected(model_path, raw_rows)
+    assert first == expected[:2] and last == expected[2:4]
+    assert isinstance(bad, RuntimeError) and "400" in str(bad)
+
+
+def test_malformed_content_length_returns_400(model_path: Path) -> None:
+    async def scenario():
+        server = InferenceServer(model_path, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            return status_line
+        finally:
+            await server.stop()
+
+    assert asyncio.run(scenario()).split()[1] == b"400"
+
+
+@pytest.mark.parametrize("length", [b"2048", b"-1"])
+def test_oversized_content_length_returns_413(model_path: Path, length: bytes) -> None:
+    async def scenario():
+        server = InferenceServer(model_path, port=0, max_body_bytes=1024)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"POST /predict HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            return status_line
+        finally:
+            await server.stop()
+
+    assert asyncio.run(scenario()).split()[1] == b"413"
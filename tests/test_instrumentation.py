@@ -0,0 +1,151 @@
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.model_trainer import ModelTrainer
+from src.utils import instrumentation
+from src.utils.data_processor import DataProcessor
+from src.utils.data_splitter import DataSplitter
+from src.utils.instrumentation import JsonLinesSink, LogSink, MemorySink, collect, instrumented
+
+
+@pytest.fixture(autouse=True)
+def _reset_instrumentation():
+    yield
+    instrumentation.disable()
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "num": rng.normal(size=60),
+            "cat": rng.choice(["a", "b"], size=60),
+            "target": rng.integers(0, 2, size=60),
+        }
+    )
+
+
+def test_disabled_emits_nothing(frame: pd.DataFrame) -> None:
+    sink = MemorySink()
+    instrumentation.enable(sink)
+    instrumentation.disable()
+    DataProcessor(frame).handle_missing_values()
+    assert not instrumentation.is_enabled()
+    assert sink.events == []
+
+
+def test_events_cover_processor_splitter_and_trainer(frame: pd.DataFrame, tmp_path: Path) -> None:
+    with collect(trace_memory=True) as sink:
+        processed = DataProcessor(frame).encode_categorical(columns=["cat"])
+        train_df, test_df = DataSplitter(processed).split(test_size=0.25)
+        trainer = ModelTrainer(LogisticRegression())
+        trainer.train(train_df.drop(columns=["target"]), train_df["target"])
+        trainer.evaluate(test_df.drop(columns=["target"]), test_df["target"])
+        trainer.save_model(tmp_path / "model.joblib")
+        ModelTrainer.load_model(tmp_path / "model.joblib", use_cache=False)
+
+    names = [event["event"] for event in sink.events]
+    for expected in (
+        "DataProcessor.encode_categorical",
+        "DataSplitter.split",
+        "DataSplitter.split_indices",
+        "ModelTrainer.train",
+        "ModelTrainer.evaluate",
+        "ModelTrainer.save_model",
+        "ModelTrainer.load_model",
+    ):
+        assert expected in names
+
+    by_name = {event["event"]: event for event in sink.events}
+    assert by_name["DataProcessor.encode_categorical"]["rows"] == 60
+    assert by_name["ModelTrainer.train"]["rows"] == 45
+    assert by_name["ModelTrainer.evaluate"]["rows"] == 15
+    for event in sink.events:
+        assert event["status"] == "ok"
+        assert event["wall_seconds"] >= 0
+        assert event["cpu_seconds"] >= 0
+        assert event["bytes_allocated"] is not None
+    assert by_name["ModelTrainer.train"]["peak_rss_bytes"] > 0
+    assert set(sink.summary()) == set(names)
+
+
+def test_error_status_is_recorded(frame: pd.DataFrame) -> None:
+    with collect() as sink:
+        with pytest.raises(ValueError):
+            DataProcessor(frame).handle_missing_values(strategy="invalid")
+    assert sink.events[0]["status"] == "error:ValueError"
+    assert sink.events[0]["bytes_allocated"] is None
+
+
+def test_generator_methods_emit_one_event_when_exhausted(frame: pd.DataFrame) -> None:
+    with collect() as sink:
+        folds = list(DataSplitter(frame).iter_folds(n_splits=3))
+    assert len(folds) == 3
+    events = [event for event in sink.events if event["event"] == "DataSplitter.iter_folds"]
+    assert len(events) == 1
+    assert events[0]["items"] == 3
+
+
+def test_json_lines_and_log_sinks(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    @instrumented(name="custom.step")
+    def step(values: np.ndarray) -> float:
+        return float(values.sum())
+
+    path = tmp_path / "events" / "run.jsonl"
+    instrumentation.enable(JsonLinesSink(path), LogSink())
+    with caplog.at_level(logging.INFO, logger="innovatenow.instrumentation"):
+        step(np.ones(5))
+        step(np.ones(7))
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["event"] for line in lines] == ["custom.step", "custom.step"]
+    assert [line["rows"] for line in lines] == [5, 7]
+    assert "custom.step" in caplog.text
+
+
+def test_failing_sink_does_not_break_call() -> None:
+    class BrokenSink:
+        def emit(self, event):
+            raise RuntimeError("boom")
+
+    @instrumented
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    instrumentation.enable(BrokenSink())
+    assert add(1, 2) == 3
+
+
+def test_enable_requires_a_sink() -> None:
+    with pytest.raises(ValueError):
+        instrumentation.enable()
+
+
+def test_bytes_allocated_reports_peak_of_temporaries() -> None:
+    size = 8 * 1024 * 1024
+
+    @instrumented(name="temporary")
+    def temporary() -> float:
+        return float(np.ones(size // 8).sum())  # 8 MiB liberados antes do retorno
+
+    @instrumented(name="outer")
+    def outer() -> None:
+        big = np.ones(2 * size // 8)  # pico do outer antes da chamada interna
+        del big
+        temporary()
+
+    with collect(trace_memory=True) as sink:
+        outer()
+
+    by_name = {event["event"]: event for event in sink.events}
+    assert by_name["temporary"]["bytes_allocated"] >= size
+    assert by_name["temporary"]["bytes_allocated"] < 2 * size
+    # O reset do pico na chamada interna não apaga o pico anterior do outer
+    assert by_name["outer"]["bytes_allocated"] >= 2 * size
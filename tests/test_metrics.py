@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from src.utils.metrics import (
+    auc_from_histograms,
+    bootstrap_confusions,
+    confidence_interval,
+    confusion_from_codes,
+    encode_labels,
+    score_histograms,
+    scores_from_confusion,
+)
+
+
+def test_encode_labels_follows_class_order_and_rejects_unknown():
+    assert encode_labels(["b", "a", "c", "a"], ["c", "a", "b"]).tolist() == [2, 1, 0, 1]
+    with pytest.raises(ValueError):
+        encode_labels([1, 5], [0, 1])
+
+
+def test_confusion_and_scores_are_vectorized_over_replicas():
+    confusion = confusion_from_codes(np.array([0, 0, 1, 1, 1]), np.array([0, 1, 1, 1, 0]), 2)
+    assert confusion.tolist() == [[1, 1], [1, 2]]
+
+    single = scores_from_confusion(confusion)
+    stacked = scores_from_confusion(np.stack([confusion, confusion]))
+    assert single["accuracy"] == pytest.approx(0.6)
+    assert single["precision"] == pytest.approx(2 / 3)
+    assert stacked["f1"].shape == (2,)
+    assert np.allclose(stacked["f1"], single["f1"])
+
+
+def test_bootstrap_confusions_preserve_sample_size():
+    confusion = np.array([[40, 10], [5, 45]])
+    replicas = bootstrap_confusions(confusion, 200, random_state=0)
+    assert replicas.shape == (200, 2, 2)
+    assert (replicas.sum(axis=(1, 2)) == 100).all()
+    interval = confidence_interval(scores_from_confusion(replicas)["accuracy"], 0.9)
+    assert interval["low"] <= 0.85 <= interval["high"]
+
+
+def test_histogram_auc_approximates_exact_auc():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, size=2000)
+    scores = np.clip(0.3 * y + rng.normal(0.35, 0.2, size=2000), 0, 1)
+    proba = np.column_stack([1 - scores, scores])
+
+    histograms = score_histograms(y, proba, n_bins=1000)
+    assert auc_from_histograms(histograms)[1] == pytest.approx(roc_auc_score(y, scores), abs=0.005)
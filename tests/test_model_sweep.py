@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.model_sweep import ModelSweep
+from src.model_trainer import ModelTrainer
+
+
+@pytest.fixture
+def sample_data():
+    """
+    Dataset sintético e determinístico para o sweep.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 4)), columns=["f1", "f2", "f3", "f4"])
+    y = pd.Series((X["f1"] + 0.5 * X["f2"] > 0).astype(int), name="target")
+    return X.iloc[:150], X.iloc[150:], y.iloc[:150], y.iloc[150:]
+
+
+def test_sweep_ranks_candidates_and_returns_best(sample_data, tmp_path):
+    """
+    O sweep expande a grade, ranqueia pelo score e devolve o melhor modelo treinado.
+    """
+    X_train, X_test, y_train, y_test = sample_data
+
+    sweep = ModelSweep(
+        [
+            (LogisticRegression(max_iter=1000), {"C": [0.01, 1.0]}),
+            (DecisionTreeClassifier(random_state=0), {"max_depth": [1, 3]}),
+        ],
+        max_workers=2,
+    )
+    results = sweep.run(X_train, y_train, X_test, y_test)
+
+    assert len(results) == 4
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    assert [r["rank"] for r in results] == [1, 2, 3, 4]
+
+    best = sweep.best_trainer
+    assert isinstance(best, ModelTrainer)
+    assert best.evaluate(X_test, y_test) == pytest.approx(results[0]["score"])
+
+    # pronto para persistir
+    best.save_model(tmp_path / "best.joblib")
+    assert (tmp_path / "best.joblib").exists()
+
+
+def test_sweep_serial_matches_parallel(sample_data):
+    """
+    max_workers=1 roda no próprio processo e produz o mesmo ranking.
+    """
+    X_train, X_test, y_train, y_test = sample_data
+    candidates = [(LogisticRegression(max_iter=1000), {"C": [0.01, 0.1, 1.0]})]
+
+    serial = ModelSweep(candidates, max_workers=1).run(X_train, y_train, X_test, y_test)
+    parallel = ModelSweep(candidates, max_workers=3).run(X_train, y_train, X_test, y_test)
+
+    assert [(r["params"], r["score"]) for r in serial] == [(r["params"], r["score"]) for r in parallel]
+
+
+def test_sweep_invalid_arguments_raise(sample_data):
+    X_train, X_test, y_train, y_test = sample_data
+
+    with pytest.raises(ValueError):
+        ModelSweep([])
+    with pytest.raises(ValueError):
+        ModelSweep([LogisticRegression()], max_workers=0)
+    with pytest.raises(TypeError):
+        ModelSweep([object()])
+    with pytest.raises(TypeError):
+        ModelSweep([LogisticRegression()], max_workers=1).run(X_train.values, y_train, X_test, y_test)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_passes_string_columns_to_pipelines(sample_data, max_workers):
+    """
+    Frames com colunas não numéricas seguem como estão (sem to_numpy(float)).
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    X_train, X_test, y_train, y_test = sample_data
+    X_train = X_train.assign(cat=np.where(X_train["f1"] > 0, "a", "b"))
+    X_test = X_test.assign(cat=np.where(X_test["f1"] > 0, "a", "b"))
+    pipeline = make_pipeline(
+        ColumnTransformer([("cat", OneHotEncoder(), ["cat"])], remainder="passthrough"),
+        LogisticRegression(max_iter=1000),
+    )
+
+    results = ModelSweep([pipeline], max_workers=max_workers).run(X_train, y_train, X_test, y_test)
+    assert results[0]["score"] > 0.8
+
+
+def test_sweep_float32_precision(sample_data):
+    from src.utils.shared_frames import pack_frame
+
+    X_train, X_test, y_train, y_test = sample_data
+    assert pack_frame(X_train, np.float32)["matrix"].dtype == np.float32
+
+    sweep = ModelSweep([LogisticRegression(max_iter=1000)], max_workers=1, precision="float32")
+    reference = ModelSweep([LogisticRegression(max_iter=1000)], max_workers=1).run(X_train, y_train, X_test, y_test)
+    results = sweep.run(X_train, y_train, X_test, y_test)
+
+    assert sweep.best_trainer.precision == "float32"
+    assert results[0]["score"] == pytest.approx(reference[0]["score"], abs=0.02)
+    with pytest.raises(ValueError, match="Invalid precision"):
+        ModelSweep([LogisticRegression()], precision="float16")
@@ -199,4 +199,491 @@ def test_load_model_raises_if_file_missing(tmp_path: Path):
     """
     missing = tmp_path / "does_not_exist.joblib"
     with pytest.raises(FileNotFoundError):
-        ModelTrainer.load_model(missing)
\ No newline at end of file
+        ModelTrainer.load_model(missing)
+
+
+def test_save_model_writes_preprocessor_next_to_model(tmp_path: Path, sample_data):
+    """
+    O pré-processador ajustado é salvo ao lado do modelo e recarregado
+    sem reajuste, produzindo o mesmo transform.
+    """
+    from src.utils.fitted_preprocessor import FittedPreprocessor
+
+    X_train, X_test, y_train, _ = sample_data
+    preprocessor = FittedPreprocessor(normalize_columns=["feature1", "feature2"])
+    X_train_t = preprocessor.fit_transform(X_train)
+
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X_train_t, y_train)
+
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path, preprocessor=preprocessor)
+
+    assert Path(ModelTrainer.preprocessor_path(model_path)) == tmp_path / "model.preprocessor.joblib"
+    loaded_prep = ModelTrainer.load_preprocessor(model_path)
+    loaded_model = ModelTrainer.load_model(model_path)
+
+    preds = loaded_model.predict(loaded_prep.transform(X_test))
+    assert (preds == trainer.model.predict(preprocessor.transform(X_test))).all()
+
+
+def test_save_model_without_sidecars_removes_stale_ones(tmp_path: Path, sample_data):
+    """
+    Salvar de novo sem preprocessor/schema apaga os sidecars do save anterior.
+    """
+    from src.utils.fitted_preprocessor import FittedPreprocessor
+    from src.utils.schema import DataSchema
+
+    X_train, _, y_train, _ = sample_data
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X_train, y_train)
+    model_path = tmp_path / "model.joblib"
+    preprocessor = FittedPreprocessor(normalize_columns=["feature1"]).fit(X_train)
+    trainer.save_model(model_path, preprocessor=preprocessor, schema=DataSchema.infer(X_train))
+
+    metadata = trainer.save_model(model_path)
+
+    assert not metadata["has_preprocessor"] and not metadata["has_schema"]
+    assert not Path(ModelTrainer.preprocessor_path(model_path)).exists()
+    assert not Path(ModelTrainer.schema_path(model_path)).exists()
+
+
+def test_save_model_rejects_invalid_preprocessor(tmp_path: Path, sample_data):
+    X_train, _, y_train, _ = sample_data
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X_train, y_train)
+
+    with pytest.raises(TypeError):
+        trainer.save_model(tmp_path / "model.joblib", preprocessor=object())  # type: ignore[arg-type]
+
+
+def test_to_estimator_input_keeps_sparse_and_column_order():
+    """
+    Frames com colunas esparsas viram CSR preservando a ordem das colunas.
+    """
+    import scipy.sparse as sp
+
+    from src.model_trainer import to_estimator_input
+
+    X = pd.DataFrame(
+        {
+            "s1": pd.arrays.SparseArray([1.0, 0.0, 0.0]),
+            "d1": [5.0, 6.0, 7.0],
+            "s2": pd.arrays.SparseArray([0.0, 0.0, 1.0]),
+        }
+    )
+    converted = to_estimator_input(X)
+
+    assert sp.issparse(converted)
+    expected = np.array([[1.0, 5.0, 0.0], [0.0, 6.0, 0.0], [0.0, 7.0, 1.0]])
+    np.testing.assert_array_equal(converted.toarray(), expected)
+
+
+def test_train_and_evaluate_with_sparse_one_hot():
+    """
+    Treino/avaliação aceitam a saída esparsa do encode_categorical sem densificar.
+    """
+    import warnings
+
+    from src.utils.data_processor import DataProcessor
+
+    df = pd.DataFrame(
+        {
+            "num": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "cat": ["A", "B", "A", "B", "A", "B"],
+            "target": [0, 1, 0, 1, 0, 1],
+        }
+    )
+    encoded = DataProcessor(df).encode_categorical(columns=["cat"], sparse=True)
+    X = encoded.drop(columns=["target"])
+    y = encoded["target"]
+
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        trainer.train(X, y)
+        score = trainer.evaluate(X, y)
+
+    assert 0.0 <= score <= 1.0
+
+
+def _batches(X: pd.DataFrame, y: pd.Series, size: int):
+    for start in range(0, len(X), size):
+        yield X.iloc[start:start + size], y.iloc[start:start + size]
+
+
+def test_train_incremental_with_partial_fit(sample_data):
+    """
+    train_incremental consome lotes via partial_fit e reporta throughput.
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    X_train, X_test, y_train, y_test = sample_data
+
+    trainer = ModelTrainer(SGDClassifier(random_state=42))
+    stats = trainer.train_incremental(_batches(X_train, y_train, 3), classes=[0, 1])
+
+    assert stats["rows"] == len(X_train)
+    assert stats["batches"] == 3
+    assert stats["rows_per_second"] > 0
+    assert trainer.training_stats == stats
+
+    score = trainer.evaluate(X_test, y_test)
+    assert 0.0 <= score <= 1.0
+
+
+def test_train_incremental_matches_multinomial_nb_full_fit(sample_data):
+    """
+    Para MultinomialNB, partial_fit em lotes equivale ao fit completo.
+    """
+    from sklearn.naive_bayes import MultinomialNB
+
+    X_train, X_test, y_train, _ = sample_data
+
+    incremental = ModelTrainer(MultinomialNB())
+    incremental.train_incremental(_batches(X_train, y_train, 2), classes=[0, 1])
+
+    full = ModelTrainer(MultinomialNB())
+    full.train(X_train, y_train)
+
+    np.testing.assert_allclose(
+        incremental.model.predict_proba(X_test), full.model.predict_proba(X_test)
+    )
+
+
+def test_train_incremental_errors(sample_data):
+    """
+    Erros esperados: modelo sem partial_fit, classes ausente, lotes vazios.
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    X_train, _, y_train, _ = sample_data
+
+    with pytest.raises(TypeError):
+        ModelTrainer(LogisticRegression()).train_incremental(_batches(X_train, y_train, 4), classes=[0, 1])
+
+    with pytest.raises(ValueError):
+        ModelTrainer(SGDClassifier()).train_incremental(_batches(X_train, y_train, 4))
+
+    with pytest.raises(ValueError):
+        ModelTrainer(SGDClassifier()).train_incremental(iter([]), classes=[0, 1])
+
+
+def _trained_trainer(sample_data) -> ModelTrainer:
+    X_train, _, y_train, _ = sample_data
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X_train, y_train)
+    return trainer
+
+
+def test_load_model_uses_lru_cache(tmp_path: Path, sample_data):
+    """
+    Cargas repetidas do mesmo arquivo são servidas pelo cache.
+    """
+    ModelTrainer.configure_cache(max_entries=4)
+    trainer = _trained_trainer(sample_data)
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path)
+
+    first = ModelTrainer.load_model(model_path)
+    second = ModelTrainer.load_model(model_path)
+
+    assert first is second
+    info = ModelTrainer.cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 1
+    assert info["entries"] == 1
+
+    # use_cache=False sempre desserializa novamente
+    assert ModelTrainer.load_model(model_path, use_cache=False) is not first
+
+
+def test_load_model_cache_invalidates_on_overwrite(tmp_path: Path, sample_data):
+    """
+    Sobrescrever o arquivo (novo mtime) força uma nova carga.
+    """
+    import os
+
+    ModelTrainer.configure_cache(max_entries=4)
+    trainer = _trained_trainer(sample_data)
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path)
+    first = ModelTrainer.load_model(model_path)
+
+    trainer.save_model(model_path)
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert ModelTrainer.load_model(model_path) is not first
+    assert ModelTrainer.cache_info()["entries"] == 1
+
+
+def test_load_model_cache_keeps_mmap_variants_of_same_file(tmp_path: Path, sample_data):
+    """
+    Carregar o mesmo arquivo com outro mmap_mode não descarta a outra variante.
+    """
+    ModelTrainer.configure_cache(max_entries=4)
+    trainer = _trained_trainer(sample_data)
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path)
+
+    in_memory = ModelTrainer.load_model(model_path)
+    mapped = ModelTrainer.load_model(model_path, mmap_mode="r")
+
+    assert ModelTrainer.load_model(model_path) is in_memory
+    assert ModelTrainer.load_model(model_path, mmap_mode="r") is mapped
+    assert ModelTrainer.cache_info()["entries"] == 2
+
+
+def test_load_model_cache_evicts_least_recently_used(tmp_path: Path, sample_data):
+    """
+    Com max_entries=2, o modelo menos usado recentemente é descartado.
+    """
+    ModelTrainer.configure_cache(max_entries=2)
+    trainer = _trained_trainer(sample_data)
+    paths = [tmp_path / f"model_{i}.joblib" for i in range(3)]
+    for path in paths:
+        trainer.save_model(path)
+
+    model_0 = ModelTrainer.load_model(paths[0])
+    ModelTrainer.load_model(paths[1])
+    ModelTrainer.load_model(paths[0])  # 0 passa a ser o mais recente
+    ModelTrainer.load_model(paths[2])  # descarta 1
+
+    info = ModelTrainer.cache_info()
+    assert info["evictions"] == 1
+    assert ModelTrainer.load_model(paths[0]) is model_0
+    ModelTrainer.configure_cache()
+
+
+def test_load_model_with_mmap_mode(tmp_path: Path, sample_data):
+    """
+    mmap_mode mapeia os arrays do modelo em memória.
+    """
+    trainer = _trained_trainer(sample_data)
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path)
+
+    loaded = ModelTrainer.load_model(model_path, mmap_mode="r", use_cache=False)
+    assert isinstance(loaded.coef_, np.memmap)
+
+
+def test_save_model_writes_metadata_sidecar(tmp_path: Path, sample_data):
+    """
+    save_model grava metadados legíveis sem desserializar o modelo.
+    """
+    import hashlib
+
+    import sklearn
+
+    trainer = _trained_trainer(sample_data)
+    model_path = tmp_path / "model.joblib"
+    returned = trainer.save_model(model_path, compression="zlib", compression_level=3)
+
+    metadata = ModelTrainer.read_metadata(model_path)
+    assert metadata == returned
+    assert Path(ModelTrainer.metadata_path(model_path)) == tmp_path / "model.meta.json"
+    assert metadata["feature_names"] == ["feature1", "feature2"]
+    assert metadata["feature_dtypes"] == {"feature1": "int64", "feature2": "int64"}
+    assert metadata["sklearn_version"] == sklearn.__version__
+    assert metadata["trained_at"] is not None
+    assert metadata["compression"] == "zlib"
+    assert metadata["sha256"] == hashlib.sha256(model_path.read_bytes()).hexdigest()
+
+    loaded = ModelTrainer.load_model(model_path, use_cache=False)
+    assert isinstance(loaded, LogisticRegression)
+
+
+def test_save_model_is_atomic_and_leaves_no_temp_files(tmp_path: Path, sample_data):
+    """
+    A escrita usa arquivo temporário + rename; nenhum resto fica no diretório.
+    """
+    trainer = _trained_trainer(sample_data)
+    trainer.save_model(tmp_path / "model.joblib")
+    trainer.save_model(tmp_path / "model.joblib")
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.joblib", "model.meta.json"]
+
+
+def test_save_model_files_get_default_permissions(tmp_path: Path, sample_data):
+    """
+    Modelo e metadados saem com o modo de um open() comum, não com o 0600 do mkstemp.
+    """
+    import os
+    import stat
+
+    X_train, _, y_train, _ = sample_data
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000, random_state=42))
+    trainer.train(X_train, y_train)
+    model_path = tmp_path / "model.joblib"
+    trainer.save_model(model_path)
+
+    umask = os.umask(0)
+    os.umask(umask)
+    for path in (model_path, Path(ModelTrainer.metadata_path(model_path))):
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_save_model_invalid_compression_raises(tmp_path: Path, sample_data):
+    trainer = _trained_trainer(sample_data)
+    with pytest.raises(ValueError):
+        trainer.save_model(tmp_path / "model.joblib", compression="bz9")
+    with pytest.raises(ValueError):
+        trainer.save_model(tmp_path / "model.joblib", compression="zlib", compression_level=0)
+
+
+def test_compare_compression_reports_tradeoffs(tmp_path: Path, sample_data):
+    trainer = _trained_trainer(sample_data)
+    table = trainer.compare_compression(tmp_path, options=[(None, 0), ("zlib", 9)], repeats=1)
+
+    assert [row["compression"] for row in table] == [None, "zlib"]
+    for row in table:
+        assert row["size_bytes"] > 0
+        assert row["load_seconds"] >= 0
+
+
+def _classification_split(n_classes: int = 2, n_rows: int = 400):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 3)), columns=["a", "b", "c"])
+    y = pd.Series(np.digitize(X["a"] + 0.5 * rng.normal(size=n_rows), np.linspace(-1, 1, n_classes - 1)))
+    return X.iloc[:300], X.iloc[300:], y.iloc[:300], y.iloc[300:]
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_evaluate_detailed_matches_sklearn(n_classes):
+    from sklearn.metrics import confusion_matrix, f1_score, precision_score, recall_score, roc_auc_score
+
+    X_train, X_test, y_train, y_test = _classification_split(n_classes)
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000))
+    trainer.train(X_train, y_train)
+
+    report = trainer.evaluate_detailed(X_test, y_test)
+    preds = trainer.model.predict(X_test)
+    proba = trainer.model.predict_proba(X_test)
+    average = "binary" if n_classes == 2 else "macro"
+
+    assert report["accuracy"] == pytest.approx(accuracy_score(y_test, preds))
+    assert report["precision"] == pytest.approx(precision_score(y_test, preds, average=average, zero_division=0))
+    assert report["recall"] == pytest.approx(recall_score(y_test, preds, average=average, zero_division=0))
+    assert report["f1"] == pytest.approx(f1_score(y_test, preds, average=average, zero_division=0))
+    assert report["confusion_matrix"] == confusion_matrix(y_test, preds).tolist()
+    expected_auc = roc_auc_score(y_test, proba[:, 1]) if n_classes == 2 else roc_auc_score(y_test, proba, multi_class="ovr")
+    assert report["roc_auc"] == pytest.approx(expected_auc)
+    assert "confidence_intervals" not in report
+
+
+def test_evaluate_detailed_bootstrap_intervals_without_extra_predict(monkeypatch):
+    X_train, X_test, y_train, y_test = _classification_split()
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000))
+    trainer.train(X_train, y_train)
+
+    calls = {"predict": 0}
+    original_predict = trainer.model.predict
+
+    def counting_predict(X):
+        calls["predict"] += 1
+        return original_predict(X)
+
+    monkeypatch.setattr(trainer.model, "predict", counting_predict)
+    report = trainer.evaluate_detailed(X_test, y_test, n_bootstrap=500, random_state=1)
+
+    assert calls["predict"] == 1
+    for name in ("accuracy", "precision", "recall", "f1", "roc_auc"):
+        interval = report["confidence_intervals"][name]
+        assert interval["low"] <= report[name] <= interval["high"]
+    again = trainer.evaluate_detailed(X_test, y_test, n_bootstrap=500, random_state=1)
+    assert again["confidence_intervals"] == report["confidence_intervals"]
+
+
+def test_evaluate_chunks_accumulates_confusion_counts():
+    X_train, X_test, y_train, y_test = _classification_split()
+    trainer = ModelTrainer(LogisticRegression(max_iter=1000))
+    trainer.train(X_train, y_train)
+
+    full = trainer.evaluate_detailed(X_test, y_test)
+    chunks = ((X_test.iloc[i:i + 30], y_test.iloc[i:i + 30]) for i in range(0, len(X_test), 30))
+    chunked = trainer.evaluate_chunks(chunks, n_bins=2000)
+
+    assert chunked["chunks"] == 4
+    assert chunked["confusion_matrix"] == full["confusion_matrix"]
+    assert chunked["f1"] == pytest.approx(full["f1"])
+    assert chunked["roc_auc_approximate"] is True
+    assert chunked["roc_auc"] == pytest.approx(full["roc_auc"], abs=0.01)
+
+
+def test_evaluate_chunks_errors(sample_data):
+    trainer = _trained_trainer(sample_data)
+    with pytest.raises(ValueError):
+        trainer.evaluate_chunks([])
+    _, X_test, _, _ = sample_data
+    with pytest.raises(ValueError):
+        trainer.evaluate_chunks([(X_test, pd.Series([7, 8], index=X_test.index))])
+    with pytest.raises(RuntimeError):
+        ModelTrainer(LogisticRegression()).evaluate_chunks([])
+
+
+def test_to_estimator_input_casts_dense_and_sparse_to_dtype():
+    from src.model_trainer import to_estimator_input
+
+    dense = pd.DataFrame({"a": np.array([1, 0], dtype=np.uint8), "b": [0.5, 1.5], "c": ["x", "y"]})
+    converted = to_estimator_input(dense, dtype=np.float32)
+    # Só as colunas float são convertidas
+    assert converted.dtypes.to_dict() == {"a": np.uint8, "b": np.float32, "c": object}
+    assert to_estimator_input(dense) is dense
+
+    dense = dense.drop(columns=["c"])
+
+    sparse = dense.assign(s=pd.arrays.SparseArray([0, 1], dtype=np.uint8))
+    assert to_estimator_input(sparse, dtype=np.float32).dtype == np.float32
+
+
+def test_float32_precision_feeds_model_and_matches_float64(sample_data, monkeypatch):
+    X_train, X_test, y_train, y_test = sample_data
+    X_train, X_test = X_train.astype(np.float64), X_test.astype(np.float64)
+    reference = ModelTrainer(LogisticRegression(random_state=42))
+    reference.train(X_train, y_train)
+
+    model = LogisticRegression(random_state=42)
+    seen_dtypes = []
+    original_fit = model.fit
+
+    def spy_fit(X, y):
+        seen_dtypes.extend(X.dtypes)
+        return original_fit(X, y)
+
+    monkeypatch.setattr(model, "fit", spy_fit)
+    trainer = ModelTrainer(model, precision="float32")
+    trainer.train(X_train, y_train)
+
+    assert set(seen_dtypes) == {np.dtype(np.float32)}
+    assert trainer.training_metadata["precision"] == "float32"
+    assert trainer.evaluate(X_test, y_test) == reference.evaluate(X_test, y_test)
+
+
+def test_invalid_precision_raises():
+    with pytest.raises(ValueError):
+        ModelTrainer(LogisticRegression(), precision="float16")
+
+
+@pytest.mark.parametrize("precision", ["float64", "float32"])
+def test_train_pipeline_with_string_column_is_passed_through(precision):
+    """
+    Colunas não numéricas chegam intactas a um Pipeline do sklearn (sem cast).
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    X = pd.DataFrame({"cat": ["x", "y", "x", "y", "x", "y"], "num": [1.0, 2.0, 1.5, 2.5, 0.5, 3.0]})
+    y = pd.Series([0, 1, 0, 1, 0, 1])
+    pipeline = Pipeline(
+        [
+            ("encode", ColumnTransformer([("onehot", OneHotEncoder(), ["cat"])], remainder="passthrough")),
+            ("model", LogisticRegression()),
+        ]
+    )
+    trainer = ModelTrainer(pipeline, precision=precision)
+    trainer.train(X, y)
+
+    assert trainer.evaluate(X, y) == 1.0
+    assert trainer.evaluate_detailed(X, y)["accuracy"] == 1.0
\ No newline at end of file
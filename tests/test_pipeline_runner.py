@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.pipeline_runner import PipelineRunner, StageCache, STAGES
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "num_a": rng.normal(size=200),
+            "num_b": rng.normal(size=200),
+            "cat": rng.choice(["x", "y", "z"], size=200),
+        }
+    )
+    df["target"] = (df["num_a"] > 0).astype(int)
+    df.loc[::9, "num_b"] = np.nan
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def _statuses(result):
+    return [stage["status"] for stage in result["stages"]]
+
+
+def test_first_run_computes_every_stage_and_rerun_hits(csv_path, tmp_path):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    first = runner.run(csv_path, LogisticRegression(max_iter=1000))
+    assert [stage["stage"] for stage in first["stages"]] == list(STAGES)
+    assert _statuses(first) == ["miss"] * len(STAGES)
+
+    second = runner.run(csv_path, LogisticRegression(max_iter=1000))
+    assert _statuses(second) == ["skipped"] * 4 + ["hit", "hit"]
+    pd.testing.assert_frame_equal(second["test_df"], first["test_df"])
+
+    X_test = second["test_df"].drop(columns=["target"])
+    y_test = second["test_df"]["target"]
+    assert second["trainer"].evaluate(X_test, y_test) == first["trainer"].evaluate(X_test, y_test)
+
+
+def test_changing_only_the_estimator_goes_straight_to_training(csv_path, tmp_path):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    estimator = LogisticRegression(max_iter=1000)
+    runner.run(csv_path, estimator)
+    assert not hasattr(estimator, "coef_")  # o estimador do chamador não é treinado
+
+    result = runner.run(csv_path, DecisionTreeClassifier(max_depth=2, random_state=0))
+    assert _statuses(result) == ["skipped"] * 4 + ["hit", "miss"]
+    assert isinstance(result["trainer"].model, DecisionTreeClassifier)
+
+
+def test_changing_a_parameter_invalidates_that_stage_and_downstream(csv_path, tmp_path):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    runner.run(csv_path, LogisticRegression(max_iter=1000))
+
+    result = runner.run(csv_path, LogisticRegression(max_iter=1000), encode_options={"dtype": np.uint8})
+    assert _statuses(result) == ["skipped", "skipped", "hit", "miss", "miss", "miss"]
+    assert result["train_df"]["cat_x"].dtype == np.uint8
+
+
+def test_changing_the_data_invalidates_everything(csv_path, tmp_path):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    runner.run(csv_path, LogisticRegression(max_iter=1000))
+
+    df = pd.read_csv(csv_path)
+    df.loc[0, "num_a"] = 99.0
+    df.to_csv(csv_path, index=False)
+    assert _statuses(runner.run(csv_path, LogisticRegression(max_iter=1000))) == ["miss"] * len(STAGES)
+
+
+def test_size_based_eviction_removes_least_recently_used(tmp_path):
+    cache = StageCache(tmp_path / "cache", max_bytes=None)
+    frame = pd.DataFrame({"a": np.arange(1000, dtype=np.float64)})
+    for key in ("k1", "k2", "k3"):
+        cache.store(key, "load", frame)
+    entry_size = cache.entries()[0]["size_bytes"]
+
+    cache.load("k1")  # k1 passa a ser o mais recente
+    cache.max_bytes = 2 * entry_size
+    removed = cache.evict()
+
+    assert removed == ["k2"]
+    assert cache.contains("k1") and cache.contains("k3")
+    assert cache.size_bytes() <= 2 * entry_size
+
+
+def test_errors(tmp_path):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        runner.run(tmp_path / "missing.csv", LogisticRegression())
+    with pytest.raises(ValueError):
+        StageCache(tmp_path, max_bytes=0)
+
+
+@pytest.mark.parametrize("encode_options", [{"sparse": True}, {"hash_features": 16}])
+def test_sparse_encoded_frames_roundtrip_through_the_cache(csv_path, tmp_path, encode_options):
+    runner = PipelineRunner(cache_dir=tmp_path / "cache")
+    first = runner.run(csv_path, LogisticRegression(max_iter=1000), encode_options=encode_options)
+    second = runner.run(csv_path, LogisticRegression(max_iter=1000), encode_options=encode_options)
+
+    assert _statuses(second) == ["skipped"] * 4 + ["hit", "hit"]
+    sparse_cols = [c for c, dtype in second["train_df"].dtypes.items() if isinstance(dtype, pd.SparseDtype)]
+    assert sparse_cols
+    pd.testing.assert_frame_equal(second["train_df"], first["train_df"])
+    pd.testing.assert_frame_equal(second["test_df"], first["test_df"])
+
+
+def test_unreadable_cached_frame_is_recomputed(csv_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    runner = PipelineRunner(cache_dir=cache_dir)
+    runner.run(csv_path, LogisticRegression(max_iter=1000))
+    for meta in runner.cache.entries():
+        if meta["stage"] == "split":
+            (cache_dir / meta["key"] / "train" / "meta.json").write_text("{}")
+
+    rerun = runner.run(csv_path, LogisticRegression(max_iter=1000))
+    statuses = {stage["stage"]: stage["status"] for stage in rerun["stages"]}
+    assert statuses["split"] == "miss"
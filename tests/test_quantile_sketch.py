@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.utils.quantile_sketch import QuantileSketch
+
+
+def _rank_error(sorted_values: np.ndarray, estimate: float, q: float) -> float:
+    return abs(np.searchsorted(sorted_values, estimate) / len(sorted_values) - q)
+
+
+def test_small_inputs_are_exact() -> None:
+    values = np.array([5.0, 1.0, np.nan, 3.0, 2.0, 4.0])
+    sketch = QuantileSketch().update(values)
+
+    assert sketch.count == 5
+    assert sketch.median() == 3.0
+    np.testing.assert_allclose(sketch.quantile([0.0, 0.25, 1.0]), np.quantile([1, 2, 3, 4, 5], [0.0, 0.25, 1.0]))
+
+
+def test_streaming_updates_stay_within_error_bound() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=200_000)
+    sketch = QuantileSketch(error=0.01, random_state=0)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+
+    sorted_values = np.sort(values)
+    assert sketch.count == len(values)
+    assert sketch.n_retained < 3 * sketch.k
+    for q in (0.1, 0.5, 0.9):
+        assert _rank_error(sorted_values, sketch.quantile(q), q) < 0.01
+    assert sketch.quantile(0.0) == values.min()
+    assert sketch.quantile(1.0) == values.max()
+
+
+def test_large_chunk_is_compacted_in_bulk() -> None:
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(size=1_000_003)  # grande o bastante para a pré-amostragem
+    sketch = QuantileSketch(error=0.01, random_state=0).update(values)
+
+    weights = sum(len(items) * 2**h for h, items in enumerate(sketch._levels))
+    assert weights == sketch.count == len(values)
+    assert sketch.n_retained < 3 * sketch.k
+    sorted_values = np.sort(values)
+    for q in (0.1, 0.5, 0.9):
+        assert _rank_error(sorted_values, sketch.quantile(q), q) < 0.01
+
+
+def test_merge_matches_single_stream_bound() -> None:
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=100_000)
+    parts = [QuantileSketch(random_state=i).update(part) for i, part in enumerate(np.array_split(values, 4))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert _rank_error(np.sort(values), merged.median(), 0.5) < 0.01
+
+
+def test_empty_sketch_and_invalid_arguments() -> None:
+    assert np.isnan(QuantileSketch().median())
+    with pytest.raises(ValueError):
+        QuantileSketch(error=0.0)
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(1.5)
+    with pytest.raises(ValueError):
+        QuantileSketch(error=0.01).merge(QuantileSketch(error=0.05))
@@ -0,0 +1,95 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.schema import ColumnSchema, DataSchema, SchemaValidationError
+
+
+@pytest.fixture
+def df_train() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "age": [20, 35, 50, 65],
+            "income": [1000.0, np.nan, 3000.0, 4000.0],
+            "city": ["SP", "RJ", "SP", "BH"],
+        }
+    )
+
+
+def _checks(report: dict) -> dict:
+    return {(v["column"], v["check"]): v["rows"] for v in report["violations"]}
+
+
+def test_inferred_schema_accepts_training_data(df_train: pd.DataFrame) -> None:
+    schema = DataSchema.infer(df_train, nullable=None, range_margin=0.0, max_categories=10)
+    report = schema.validate(df_train)
+
+    assert report["valid"]
+    assert report["rows"] == 4
+    kinds = {column.name: column.kind for column in schema.columns}
+    assert kinds == {"age": "integer", "income": "float", "city": "categorical"}
+
+
+def test_violations_are_reported_with_row_counts(df_train: pd.DataFrame) -> None:
+    schema = DataSchema.infer(df_train, nullable=None, range_margin=0.0, max_categories=10)
+    batch = pd.DataFrame(
+        {
+            "age": [np.nan, 200.0, 30.0],
+            "income": ["a", "b", "c"],
+            "city": ["SP", "POA", "POA"],
+        }
+    )
+    report = schema.validate(batch)
+
+    assert not report["valid"]
+    assert _checks(report) == {
+        ("age", "nulls"): 1,
+        ("age", "range"): 1,
+        ("income", "dtype"): 3,
+        ("city", "categories"): 2,
+    }
+
+
+def test_missing_and_extra_columns(df_train: pd.DataFrame) -> None:
+    schema = DataSchema.infer(df_train, allow_extra_columns=False)
+    report = schema.validate(df_train.drop(columns=["city"]).assign(other=1))
+
+    assert _checks(report) == {("city", "missing"): 4, ("other", "extra_columns"): 4}
+
+
+def test_categorical_dtype_checks_use_codes() -> None:
+    schema = DataSchema([ColumnSchema("city", "categorical", nullable=False, categories=["SP", "RJ"])])
+    batch = pd.DataFrame({"city": pd.Categorical(["SP", "BH", None, "BH"])})
+
+    assert _checks(schema.validate(batch)) == {("city", "nulls"): 1, ("city", "categories"): 2}
+
+
+def test_enforce_raises_and_returns_frame(df_train: pd.DataFrame) -> None:
+    schema = DataSchema.infer(df_train)
+    assert schema.enforce(df_train) is df_train
+
+    with pytest.raises(SchemaValidationError) as excinfo:
+        schema.enforce(df_train.drop(columns=["age"]))
+    assert excinfo.value.report["violations"][0]["check"] == "missing"
+
+
+def test_save_load_and_pickle_roundtrip(tmp_path: Path, df_train: pd.DataFrame) -> None:
+    schema = DataSchema.infer(df_train, nullable=None, range_margin=0.1, max_categories=10).compile()
+    path = tmp_path / "schema.json"
+    schema.save(path)
+    loaded = DataSchema.load(path)
+
+    assert loaded.to_dict() == schema.to_dict()
+    assert pickle.loads(pickle.dumps(schema)).validate(df_train)["valid"]
+
+
+def test_invalid_declarations() -> None:
+    with pytest.raises(ValueError):
+        ColumnSchema("a", "text")
+    with pytest.raises(ValueError):
+        ColumnSchema("a", "categorical", min_value=0)
+    with pytest.raises(ValueError):
+        DataSchema([ColumnSchema("a", "float"), ColumnSchema("a", "float")])